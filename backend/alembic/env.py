@@ -22,11 +22,48 @@ import sys
 from os.path import abspath, dirname
 sys.path.insert(0, dirname(dirname(abspath(__file__))))
 
+from app.config import get_settings
 from app.database import Base
-from app.models.project import User, Project, Chapter
+from app.models import User, Project, Chapter, ChapterRevision, UserSettings  # noqa: F401
+from app.models.types import CompressedText
+from app.repositories.search import FTS_TABLE, PG_SEARCH_TABLE
+from sqlalchemy import LargeBinary, Text
 
 target_metadata = Base.metadata
 
+
+# Postgres-only partial index created by its migration, not by the models
+MIGRATION_ONLY_INDEXES = ("ix_chapter_revisions_snapshots",)
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """
+    Leave objects the models don't declare to the migrations creating them:
+    the search index tables (created with raw SQL, including the FTS5
+    shadow tables) and database-specific indexes.
+    """
+    if reflected and compare_to is None:
+        if type_ == "table" and (name in (FTS_TABLE, PG_SEARCH_TABLE) or name.startswith(f"{FTS_TABLE}_")):
+            return False
+        if type_ == "index" and name in MIGRATION_ONLY_INDEXES:
+            return False
+    return True
+
+
+def compare_type(context, inspected_column, metadata_column, inspected_type, metadata_type):
+    """
+    Compare CompressedText columns by their storage type.
+
+    They are declared TEXT on SQLite and as the binary impl elsewhere;
+    other columns use alembic's default comparison.
+    """
+    if isinstance(metadata_type, CompressedText):
+        return not isinstance(inspected_type, (Text, LargeBinary))
+    return None
+
+# Use the same database URL as the application
+config.set_main_option("sqlalchemy.url", get_settings().database_url.replace("%", "%%"))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -49,6 +86,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
+        compare_type=compare_type,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -72,7 +111,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            compare_type=compare_type,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,36 @@
+"""add_chapter_search_index
+
+Revision ID: 3b1f9c2d7a41
+Revises: eefb10c3e4fb
+Create Date: 2026-10-19 09:12:40.118203
+
+Creates the FTS5 table used for chapter search on SQLite. The index is
+filled from application code (markup has to be stripped), so run
+``python -m app.cli reindex-search`` after upgrading an existing database.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b1f9c2d7a41'
+down_revision: Union[str, None] = 'eefb10c3e4fb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS chapters_fts USING fts5("
+        "title, content, tokenize = 'unicode61 remove_diacritics 2')"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    op.execute("DROP TABLE IF EXISTS chapters_fts")
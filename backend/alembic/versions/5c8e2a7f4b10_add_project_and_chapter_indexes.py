@@ -0,0 +1,27 @@
+"""add_project_and_chapter_indexes
+
+Revision ID: 5c8e2a7f4b10
+Revises: 3b1f9c2d7a41
+Create Date: 2026-10-19 10:41:03.552917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8e2a7f4b10'
+down_revision: Union[str, None] = '3b1f9c2d7a41'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_chapters_project_id_order', 'chapters', ['project_id', 'order'], unique=False)
+    op.create_index('ix_projects_user_id_updated_at', 'projects', ['user_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_user_id_updated_at', table_name='projects')
+    op.drop_index('ix_chapters_project_id_order', table_name='chapters')
@@ -0,0 +1,27 @@
+"""add_chapter_version
+
+Revision ID: 7d4a91e3c5b2
+Revises: 5c8e2a7f4b10
+Create Date: 2026-10-19 11:20:37.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d4a91e3c5b2'
+down_revision: Union[str, None] = '5c8e2a7f4b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('chapters', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('chapters') as batch_op:
+        batch_op.drop_column('version')
@@ -64,13 +64,22 @@ def upgrade() -> None:
     pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
     admin_password_hash = pwd_context.hash("admin123")
 
-    # Insert admin user
-    op.execute(
-        f"""
-        INSERT INTO users (email, username, full_name, hashed_password, is_approved)
-        VALUES ('admin@diksiai.com', 'admin', 'Administrator', '{admin_password_hash}', 1)
-        """
+    # Insert admin user (bulk_insert binds is_approved as a real boolean on Postgres)
+    users = sa.table(
+        'users',
+        sa.column('email', sa.String),
+        sa.column('username', sa.String),
+        sa.column('full_name', sa.String),
+        sa.column('hashed_password', sa.String),
+        sa.column('is_approved', sa.Boolean),
     )
+    op.bulk_insert(users, [{
+        'email': 'admin@diksiai.com',
+        'username': 'admin',
+        'full_name': 'Administrator',
+        'hashed_password': admin_password_hash,
+        'is_approved': True,
+    }])
 
 
 def downgrade() -> None:
@@ -0,0 +1,27 @@
+"""add_project_version
+
+Revision ID: a41c6e08d2f7
+Revises: 7d4a91e3c5b2
+Create Date: 2026-10-19 12:04:51.310284
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c6e08d2f7'
+down_revision: Union[str, None] = '7d4a91e3c5b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('projects', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('version')
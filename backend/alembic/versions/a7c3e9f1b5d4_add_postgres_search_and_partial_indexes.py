@@ -0,0 +1,58 @@
+"""add_postgres_search_and_partial_indexes
+
+Revision ID: a7c3e9f1b5d4
+Revises: f4b1d6e8c2a7
+Create Date: 2026-10-19 20:41:16.872450
+
+Postgres-only. Creates chapter_search, the Postgres counterpart of the
+SQLite chapters_fts table: the plain text of each chapter with a stored
+tsvector column (titles weighted above content) and a GIN index on it.
+Chapter content is stored compressed, so it can't be indexed in place.
+The index is filled from application code, so run
+``python -m app.cli reindex-search`` after upgrading an existing database.
+
+Also adds a partial index on revision snapshots, which the revision
+repository looks up to rebuild any revision's content.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e9f1b5d4'
+down_revision: Union[str, None] = 'f4b1d6e8c2a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # 'simple' must match PG_TEXT_SEARCH_CONFIG in app/repositories/search.py
+    op.execute(
+        "CREATE TABLE chapter_search ("
+        "chapter_id INTEGER PRIMARY KEY REFERENCES chapters (id) ON DELETE CASCADE, "
+        "title TEXT NOT NULL DEFAULT '', "
+        "content TEXT NOT NULL DEFAULT '', "
+        "document TSVECTOR GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', title), 'A') || "
+        "setweight(to_tsvector('simple', content), 'B')"
+        ") STORED)"
+    )
+    op.execute("CREATE INDEX ix_chapter_search_document ON chapter_search USING GIN (document)")
+    op.create_index(
+        'ix_chapter_revisions_snapshots',
+        'chapter_revisions',
+        ['chapter_id', 'revision'],
+        postgresql_where=sa.text('is_snapshot'),
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_chapter_revisions_snapshots', table_name='chapter_revisions')
+    op.execute("DROP TABLE IF EXISTS chapter_search")
@@ -0,0 +1,57 @@
+"""add_chapter_word_count
+
+Revision ID: b7e2d5a9c316
+Revises: a41c6e08d2f7
+Create Date: 2026-10-19 13:41:08.552917
+
+Adds the word count shown in project outlines and fills it for existing
+chapters. Counting has to strip markup, so the backfill runs in Python.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.text import count_words
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d5a9c316'
+down_revision: Union[str, None] = 'a41c6e08d2f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    op.add_column('chapters', sa.Column('word_count', sa.Integer(), server_default='0', nullable=False))
+
+    bind = op.get_bind()
+    chapters = sa.table(
+        'chapters',
+        sa.column('id', sa.Integer),
+        sa.column('content', sa.Text),
+        sa.column('word_count', sa.Integer),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(chapters.c.id, chapters.c.content)
+            .where(chapters.c.id > last_id)
+            .order_by(chapters.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            chapters.update().where(chapters.c.id == sa.bindparam('chapter_id')),
+            [{'chapter_id': row.id, 'word_count': count_words(row.content)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('chapters') as batch_op:
+        batch_op.drop_column('word_count')
@@ -0,0 +1,38 @@
+"""add_user_is_admin
+
+Revision ID: c6d2e8a4f1b7
+Revises: a7c3e9f1b5d4
+Create Date: 2026-10-19 22:05:37.184203
+
+Adds the admin flag guarding operational endpoints such as the profiler.
+The default admin account created by the initial migration gets it; grant
+it to others with ``python -m app.cli grant-admin USERNAME``.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d2e8a4f1b7'
+down_revision: Union[str, None] = 'a7c3e9f1b5d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('is_admin', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+    users = sa.table(
+        'users',
+        sa.column('username', sa.String),
+        sa.column('is_admin', sa.Boolean),
+    )
+    op.execute(users.update().where(users.c.username == 'admin').values(is_admin=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.drop_column('is_admin')
@@ -0,0 +1,75 @@
+"""compress_chapter_content
+
+Revision ID: c93f1d6b8e24
+Revises: b7e2d5a9c316
+Create Date: 2026-10-19 14:52:17.604381
+
+Chapter content becomes a compressed binary value (see
+app/utils/compression.py). On PostgreSQL the column is converted to
+BYTEA with existing rows tagged as raw UTF-8. SQLite stores BLOBs in the
+existing TEXT column, so its schema is unchanged and legacy rows are
+read as plain text.
+
+Existing rows are not compressed here; run
+``python -m app.cli recompress-chapters`` after upgrading.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.types import StoredBytes
+from app.utils.compression import decompress_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c93f1d6b8e24'
+down_revision: Union[str, None] = 'b7e2d5a9c316'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "ALTER TABLE chapters ALTER COLUMN content TYPE BYTEA "
+        "USING decode('00', 'hex') || convert_to(content, 'UTF8')"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.add_column('chapters', sa.Column('content_text', sa.Text(), nullable=True))
+        target = 'content_text'
+    else:
+        target = 'content'
+
+    chapters = sa.table('chapters', sa.column('id', sa.Integer), sa.column('content', StoredBytes))
+    if target != 'content':
+        chapters.append_column(sa.column(target, sa.Text))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(chapters.c.id, chapters.c.content)
+            .where(chapters.c.id > last_id)
+            .order_by(chapters.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.update(chapters)
+            .where(chapters.c.id == sa.bindparam('chapter_id'))
+            .values({target: sa.bindparam('text_value', type_=sa.Text)}),
+            [{'chapter_id': row.id, 'text_value': decompress_text(row.content)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    if bind.dialect.name == 'postgresql':
+        op.drop_column('chapters', 'content')
+        op.alter_column('chapters', 'content_text', new_column_name='content')
@@ -0,0 +1,45 @@
+"""add_chapter_revisions
+
+Revision ID: d5a8c2f71e09
+Revises: c93f1d6b8e24
+Create Date: 2026-10-19 16:03:44.271956
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8c2f71e09'
+down_revision: Union[str, None] = 'c93f1d6b8e24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'chapter_revisions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('chapter_id', sa.Integer(), nullable=False),
+        sa.Column('revision', sa.Integer(), nullable=False),
+        sa.Column('is_snapshot', sa.Boolean(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('content_length', sa.Integer(), nullable=False),
+        sa.Column('chapter_version', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['chapter_id'], ['chapters.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_chapter_revisions_id'), 'chapter_revisions', ['id'], unique=False)
+    op.create_index(
+        'ix_chapter_revisions_chapter_id_revision', 'chapter_revisions', ['chapter_id', 'revision'], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_chapter_revisions_chapter_id_revision', table_name='chapter_revisions')
+    op.drop_index(op.f('ix_chapter_revisions_id'), table_name='chapter_revisions')
+    op.drop_table('chapter_revisions')
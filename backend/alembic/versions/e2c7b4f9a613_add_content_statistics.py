@@ -0,0 +1,64 @@
+"""add_content_statistics
+
+Revision ID: e2c7b4f9a613
+Revises: d5a8c2f71e09
+Create Date: 2026-10-19 16:05:37.214408
+
+Adds character and paragraph counts to chapters, and chapter, word,
+character and paragraph totals to projects. Project chapter and word
+totals are filled from the existing rows here; the new chapter counts
+need the (compressed) content, so run `python -m app.cli backfill-stats`
+after upgrading to fill them and refresh the project totals.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2c7b4f9a613'
+down_revision: Union[str, None] = 'd5a8c2f71e09'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHAPTER_COLUMNS = ('character_count', 'paragraph_count')
+PROJECT_COLUMNS = ('chapter_count', 'word_count', 'character_count', 'paragraph_count')
+
+
+def upgrade() -> None:
+    for name in CHAPTER_COLUMNS:
+        op.add_column('chapters', sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+    for name in PROJECT_COLUMNS:
+        op.add_column('projects', sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+
+    projects = sa.table(
+        'projects',
+        sa.column('id', sa.Integer),
+        *(sa.column(name, sa.Integer) for name in PROJECT_COLUMNS),
+    )
+    chapters = sa.table(
+        'chapters',
+        sa.column('project_id', sa.Integer),
+        sa.column('word_count', sa.Integer),
+    )
+    op.execute(
+        projects.update().values(
+            chapter_count=sa.select(sa.func.count())
+            .where(chapters.c.project_id == projects.c.id)
+            .scalar_subquery(),
+            word_count=sa.select(sa.func.coalesce(sa.func.sum(chapters.c.word_count), 0))
+            .where(chapters.c.project_id == projects.c.id)
+            .scalar_subquery(),
+        )
+    )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('projects') as batch_op:
+        for name in PROJECT_COLUMNS:
+            batch_op.drop_column(name)
+    with op.batch_alter_table('chapters') as batch_op:
+        for name in CHAPTER_COLUMNS:
+            batch_op.drop_column(name)
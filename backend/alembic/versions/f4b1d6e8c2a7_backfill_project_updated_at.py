@@ -0,0 +1,40 @@
+"""backfill_project_updated_at
+
+Revision ID: f4b1d6e8c2a7
+Revises: e2c7b4f9a613
+Create Date: 2026-10-19 18:22:49.503117
+
+Projects are listed by (updated_at, id) with cursor pagination, and
+updated_at used to stay NULL until a project's first update. New
+projects now get it on insert; existing ones take their created_at.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b1d6e8c2a7'
+down_revision: Union[str, None] = 'e2c7b4f9a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    projects = sa.table(
+        'projects',
+        sa.column('created_at', sa.DateTime(timezone=True)),
+        sa.column('updated_at', sa.DateTime(timezone=True)),
+    )
+    op.execute(
+        projects.update()
+        .where(projects.c.updated_at.is_(None))
+        .values(updated_at=projects.c.created_at)
+    )
+
+
+def downgrade() -> None:
+    # The backfilled timestamps are harmless; nothing to undo
+    pass
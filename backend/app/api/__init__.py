@@ -2,6 +2,13 @@ from .projects import router as projects_router
 from .ai import router as ai_router
 from .auth import router as auth_router
 from .settings import router as settings_router
+from .search import router as search_router
+from .revisions import router as revisions_router
+from .export import router as export_router
+from .imports import router as import_router
+from .jobs import router as jobs_router
+from .admin import router as admin_router
 from .v1 import router as v1_router
 
-__all__ = ["projects_router", "ai_router", "auth_router", "settings_router", "v1_router"]
+__all__ = ["projects_router", "ai_router", "auth_router", "settings_router", "search_router", "revisions_router",
+           "export_router", "import_router", "jobs_router", "admin_router", "v1_router"]
@@ -0,0 +1,56 @@
+"""
+Administrator API endpoints.
+
+This module provides operational tools for administrators, currently
+on-demand profiling of the worker process that answers the request.
+"""
+
+import os
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+
+from ..config import get_settings
+from ..dependencies.auth import CurrentIdentity, get_current_admin_identity
+from ..utils.profiler import sampling_profiler
+from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
+
+settings = get_settings()
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+async def profile_process(
+    request: Request,
+    seconds: float = Query(10, gt=0, description="How long to sample"),
+    interval_ms: int = Query(10, ge=1, le=1000, description="Time between samples"),
+    current_user: CurrentIdentity = Depends(get_current_admin_identity),
+):
+    """
+    Sample the stacks of this worker process for a number of seconds.
+
+    Returns the stacks in collapsed format, ready for flamegraph.pl or
+    speedscope. The request stays open while sampling.
+    """
+    if not settings.profiler_enabled:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Profiles are limited to {settings.profiler_max_seconds} seconds",
+        )
+
+    profile = await run_in_threadpool(sampling_profiler.profile, seconds, interval_ms / 1000)
+    pid = os.getpid()
+    return PlainTextResponse(
+        profile.collapsed(),
+        headers={
+            "Content-Disposition": f'attachment; filename="profile-{pid}-{int(time.time())}.folded"',
+            "X-Profile-PID": str(pid),
+            "X-Profile-Samples": str(profile.samples),
+        },
+    )
@@ -6,26 +6,42 @@ title suggestions, and live review functionality.
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Request
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, Field, model_validator
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..services.llm import llm_service
-from ..database import get_db
-from ..models import User, UserSettings
-from ..dependencies.auth import get_current_approved_user
-from ..utils.rate_limiter import limiter, RATE_LIMIT_AI, RATE_LIMIT_DEFAULT
+from ..database import get_async_db
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
+from ..utils.profiler import profileable
+from ..utils.rate_limiter import (
+    limiter, ai_cost, estimate_tokens, CHARS_PER_TOKEN, RATE_LIMIT_AI, RATE_LIMIT_DEFAULT
+)
+from ..repositories import AsyncChapterRepository, AsyncUserSettingsRepository
 from ..utils.ai_endpoint import AIRequestContext, validate_model_availability, handle_ai_error
+from ..utils.text import context_before
+from ..utils.tracing import current_request_id, span
 from ..constants import (
     DEFAULT_MODEL, DEFAULT_WRITING_STYLE, DEFAULT_TITLE_STYLE,
     DEFAULT_TEMPERATURE, DEFAULT_MAX_TOKENS, DEFAULT_PARAGRAPH_COUNT,
-    DEFAULT_IMPROVEMENT_INSTRUCTION
+    DEFAULT_IMPROVEMENT_INSTRUCTION, DEFAULT_CONTEXT_LINES, MAX_CONTEXT_LINES,
+    MAX_CONTEXT_LENGTH, MIN_TEXT_LENGTH_FOR_CONTINUATION
 )
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
 
 class ContinuationRequest(BaseModel):
-    context: str
+    """
+    Either the context text itself, or the chapter to continue and the
+    cursor position there; the server then reads the saved chapter and
+    takes up to context_lines paragraphs before the cursor as context.
+    """
+    context: Optional[str] = None
+    project_id: Optional[int] = None
+    chapter_id: Optional[int] = None
+    cursor_offset: Optional[int] = Field(default=None, ge=0)  # In the chapter's plain text; None = end
+    context_lines: int = Field(default=DEFAULT_CONTEXT_LINES, ge=1, le=MAX_CONTEXT_LINES)
     max_tokens: int = DEFAULT_MAX_TOKENS
     temperature: float = DEFAULT_TEMPERATURE
     writing_style: str = DEFAULT_WRITING_STYLE
@@ -33,6 +49,15 @@ class ContinuationRequest(BaseModel):
     brief_idea: str = ""
     model: str = DEFAULT_MODEL
 
+    @model_validator(mode="after")
+    def check_context_source(self) -> "ContinuationRequest":
+        from_chapter = self.project_id is not None or self.chapter_id is not None
+        if from_chapter and (self.project_id is None or self.chapter_id is None):
+            raise ValueError("project_id and chapter_id must be sent together")
+        if from_chapter == (self.context is not None):
+            raise ValueError("Send either context or project_id and chapter_id")
+        return self
+
 
 class ContinuationResponse(BaseModel):
     continuation: str
@@ -85,30 +110,86 @@ class LiveReviewResponse(BaseModel):
     model: str
 
 
+# Rate limit costs, from the estimated prompt and output tokens of each call
+
+TOKENS_PER_PARAGRAPH = 200
+TITLE_OUTPUT_TOKENS = 100
+
+
+def continuation_cost(body: ContinuationRequest, **_) -> int:
+    output_tokens = min(body.max_tokens, body.paragraph_count * TOKENS_PER_PARAGRAPH)
+    # Context read from a chapter is at most MAX_CONTEXT_LENGTH characters
+    context_tokens = (
+        estimate_tokens(body.context) if body.context is not None
+        else MAX_CONTEXT_LENGTH // CHARS_PER_TOKEN
+    )
+    return ai_cost(context_tokens + estimate_tokens(body.brief_idea) + output_tokens)
+
+
+def improvement_cost(body: ImprovementRequest, **_) -> int:
+    # The improved text is about as long as the original
+    return ai_cost(2 * estimate_tokens(body.text) + estimate_tokens(body.instruction))
+
+
+def title_cost(body: TitleSuggestionRequest, **_) -> int:
+    return ai_cost(estimate_tokens(body.content) + TITLE_OUTPUT_TOKENS)
+
+
+def live_review_cost(body: LiveReviewRequest, **_) -> int:
+    # Issues quote and explain passages, so output grows with the content
+    return ai_cost(2 * estimate_tokens(body.content))
+
+
 # Helper function to get user's custom prompts
 
-def get_user_custom_prompts(db: Session, user_id: int) -> dict | None:
+async def get_user_custom_prompts(db: AsyncSession, user_id: int) -> dict | None:
     """Get user's custom prompts if available."""
-    user_settings = db.query(UserSettings).filter(UserSettings.user_id == user_id).first()
-    return user_settings.custom_prompts if user_settings else None
+    with span("settings"):
+        return await AsyncUserSettingsRepository(db).get_custom_prompts(user_id)
+
+
+async def get_chapter_context(db: AsyncSession, user_id: int, body: ContinuationRequest) -> str:
+    """
+    Assemble continuation context from the user's saved chapter.
+
+    Raises:
+        HTTPException: 404 if the chapter isn't the user's, 400 if there is
+            too little text before the cursor
+    """
+    with span("context"):
+        content = await AsyncChapterRepository(db).get_content(body.chapter_id, body.project_id, user_id)
+        if content is None:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        context = context_before(content, body.cursor_offset, body.context_lines, MAX_CONTEXT_LENGTH)
+    if len(context) < MIN_TEXT_LENGTH_FOR_CONTINUATION:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Write at least {MIN_TEXT_LENGTH_FOR_CONTINUATION} characters before the cursor to continue.",
+        )
+    return context
 
 
 # Endpoints
 
 @router.post("/continue", response_model=ContinuationResponse)
-@limiter.limit(RATE_LIMIT_AI)
+@limiter.limit(RATE_LIMIT_AI, cost=continuation_cost)
+@profileable
 async def generate_continuation(
     request: Request,
     body: ContinuationRequest,
-    current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Generate text continuation based on context."""
-    ctx = AIRequestContext(id(body), "continuation")
-    ctx.log_start(context_length=len(body.context), max_tokens=body.max_tokens, temperature=body.temperature)
-    ctx.log_debug(f"Context preview: {body.context[:100]}...")
+    """Generate text continuation based on context or a saved chapter."""
+    ctx = AIRequestContext(current_request_id(), "continuation")
+    if body.context is not None:
+        context = body.context
+    else:
+        context = await get_chapter_context(db, current_user.id, body)
+    ctx.log_start(context_length=len(context), max_tokens=body.max_tokens, temperature=body.temperature)
+    ctx.log_debug(f"Context preview: {context[:100]}...")
 
-    custom_prompts = get_user_custom_prompts(db, current_user.id)
+    custom_prompts = await get_user_custom_prompts(db, current_user.id)
 
     ctx.log_model_check(body.model)
     validate_model_availability(body.model, ctx.request_id)
@@ -117,7 +198,7 @@ async def generate_continuation(
     try:
         ctx.log_processing(body.model)
         continuation = await llm_service.generate_continuation(
-            context=body.context,
+            context=context,
             max_tokens=body.max_tokens,
             temperature=body.temperature,
             writing_style=body.writing_style,
@@ -140,19 +221,20 @@ async def generate_continuation(
 
 
 @router.post("/improve", response_model=ImprovementResponse)
-@limiter.limit(RATE_LIMIT_AI)
+@limiter.limit(RATE_LIMIT_AI, cost=improvement_cost)
+@profileable
 async def improve_text(
     request: Request,
     body: ImprovementRequest,
-    current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Improve selected text based on instruction."""
-    ctx = AIRequestContext(id(body), "improvement")
+    ctx = AIRequestContext(current_request_id(), "improvement")
     ctx.log_start(text_length=len(body.text), instruction=body.instruction[:50])
     ctx.log_debug(f"Text preview: {body.text[:100]}...")
 
-    custom_prompts = get_user_custom_prompts(db, current_user.id)
+    custom_prompts = await get_user_custom_prompts(db, current_user.id)
 
     ctx.log_model_check(body.model)
     validate_model_availability(body.model, ctx.request_id)
@@ -182,10 +264,10 @@ async def improve_text(
 
 
 @router.post("/suggest-title", response_model=TitleSuggestionResponse)
-@limiter.limit(RATE_LIMIT_AI)
+@limiter.limit(RATE_LIMIT_AI, cost=title_cost)
 async def suggest_title(request: Request, body: TitleSuggestionRequest):
     """Generate title suggestions based on content."""
-    ctx = AIRequestContext(id(body), "title suggestion")
+    ctx = AIRequestContext(current_request_id(), "title suggestion")
     ctx.log_start(content_length=len(body.content), title_style=body.title_style)
     ctx.log_debug(f"Content preview: {body.content[:100]}...")
 
@@ -215,15 +297,16 @@ async def suggest_title(request: Request, body: TitleSuggestionRequest):
 
 
 @router.post("/live-review", response_model=LiveReviewResponse)
-@limiter.limit(RATE_LIMIT_AI)
+@limiter.limit(RATE_LIMIT_AI, cost=live_review_cost)
+@profileable
 async def live_review(
     request: Request,
     body: LiveReviewRequest,
-    current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Analyze text and return issues with suggestions for improvement."""
-    ctx = AIRequestContext(id(body), "live review")
+    ctx = AIRequestContext(current_request_id(), "live review")
     ctx.log_start(content_length=len(body.content))
     ctx.log_debug(f"Content preview: {body.content[:100]}...")
 
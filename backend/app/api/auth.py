@@ -5,12 +5,12 @@ Provides endpoints for user registration, login, and logout.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
 from ..models import User
 from ..schemas.user import UserCreate, UserResponse, UserLogin, Token
-from ..services.auth_service import AuthService
+from ..services.auth_service import AsyncAuthService
 from ..dependencies.auth import get_current_approved_user
 from ..utils.rate_limiter import limiter, RATE_LIMIT_LOGIN, RATE_LIMIT_REGISTER, RATE_LIMIT_DEFAULT
 
@@ -19,22 +19,22 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 @limiter.limit(RATE_LIMIT_REGISTER)
-async def register(request: Request, user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(request: Request, user_data: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user (requires admin approval)
     """
-    auth_service = AuthService(db)
-    return auth_service.register_user(user_data)
+    auth_service = AsyncAuthService(db)
+    return await auth_service.register_user(user_data)
 
 
 @router.post("/login", response_model=Token)
 @limiter.limit(RATE_LIMIT_LOGIN)
-async def login(request: Request, login_data: UserLogin, db: Session = Depends(get_db)):
+async def login(request: Request, login_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """
     Login with email/username and password
     """
-    auth_service = AuthService(db)
-    user, access_token = auth_service.authenticate_user(login_data)
+    auth_service = AsyncAuthService(db)
+    user, access_token = await auth_service.authenticate_user(login_data)
 
     return {
         "access_token": access_token,
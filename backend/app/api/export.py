@@ -0,0 +1,124 @@
+"""
+Export API endpoints for downloading a whole manuscript.
+
+This module streams a project as Markdown, DOCX or EPUB, reading the
+chapters in batches while the response is sent, and can run the same
+export as a background job whose file is downloaded when it finishes.
+"""
+
+import logging
+from urllib.parse import quote
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..database import get_db, SessionLocal
+from ..schemas.job import JobStatus
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
+from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
+from ..utils.jobs import Job, JobStore, JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED
+from ..services.export import (
+    CHAPTER_BATCH_SIZE,
+    EXPORT_FORMATS,
+    ExportProject,
+    export_filename,
+    get_export_project,
+    stream_export,
+    write_export,
+)
+from .jobs import job_status
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/projects", tags=["export"])
+
+FORMAT_DESCRIPTION = "Export format: " + ", ".join(EXPORT_FORMATS)
+
+
+def _get_export_project(db: Session, project_id: int, user_id: int, export_format: str) -> ExportProject:
+    """Validate the format and load the project metadata, raising 400/404."""
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Unsupported export format: {export_format}")
+    project = get_export_project(db, project_id, user_id)
+    if project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project
+
+
+def _content_disposition(filename: str) -> str:
+    # Plain filename for old clients, RFC 5987 filename* for the real (UTF-8) one
+    fallback = filename.encode("ascii", "replace").decode("ascii").replace("?", "_")
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename)}"
+
+
+def _run_export_job(store: JobStore, job: Job, project: ExportProject, export_format: str) -> None:
+    """Write an export to the job's artifact file, recording progress."""
+    store.update(job, status=JOB_RUNNING)
+
+    def on_progress(done: int) -> None:
+        if done % CHAPTER_BATCH_SIZE == 0:
+            store.update(job, progress=done)
+
+    try:
+        size = write_export(store.artifact_path(job), export_format, project, SessionLocal, on_progress=on_progress)
+    except Exception:
+        logger.exception("Export job %s failed", job.id)
+        store.update(job, status=JOB_FAILED, error="Export failed")
+        return
+
+    store.update(
+        job,
+        status=JOB_SUCCEEDED,
+        progress=project.chapter_count,
+        artifact_name=export_filename(project, export_format),
+        media_type=EXPORT_FORMATS[export_format].media_type,
+        result={"format": export_format, "size": size},
+    )
+
+
+@router.get("/{project_id}/export")
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def export_project(
+    request: Request,
+    project_id: int,
+    format: str = Query(default="markdown", description=FORMAT_DESCRIPTION),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Download a project as a single file.
+
+    The file is encoded while it is sent, one batch of chapters at a
+    time, so memory use doesn't grow with the manuscript.
+    """
+    project = _get_export_project(db, project_id, current_user.id, format)
+    export_format = EXPORT_FORMATS[format]
+    return StreamingResponse(
+        stream_export(format, project, SessionLocal),
+        media_type=export_format.media_type,
+        headers={"Content-Disposition": _content_disposition(export_filename(project, format))},
+    )
+
+
+@router.post("/{project_id}/export/jobs", response_model=JobStatus, status_code=202)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def create_export_job(
+    request: Request,
+    project_id: int,
+    background_tasks: BackgroundTasks,
+    format: str = Query(default="markdown", description=FORMAT_DESCRIPTION),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Export a project in the background.
+
+    Poll the returned job, then fetch the file from its download_url.
+    """
+    project = _get_export_project(db, project_id, current_user.id, format)
+    store = JobStore()
+    store.prune()
+    job = store.create(current_user.id, "export", total=project.chapter_count)
+    background_tasks.add_task(_run_export_job, store, job, project, format)
+    return job_status(job)
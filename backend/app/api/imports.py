@@ -0,0 +1,142 @@
+"""
+Import API endpoints for adding chapters from a manuscript file.
+
+This module accepts .txt, .md and .docx uploads, splits them into
+chapters at headings and appends the chapters to a project, either
+within the request or as a background job reporting its progress.
+"""
+
+import logging
+import shutil
+import time
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Request, UploadFile
+from sqlalchemy.orm import Session
+
+from ..database import get_db, SessionLocal
+from ..schemas import ImportResult
+from ..schemas.job import JobStatus
+from ..config import get_settings
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
+from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
+from ..utils.jobs import Job, JobStore, JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED
+from ..repositories import ProjectRepository, ChapterRepository
+from ..services.importer import ManuscriptImportError, READERS, import_manuscript, supported_extension
+from .jobs import job_status
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/projects", tags=["import"])
+
+# Minimum interval between job progress writes
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+
+def _check_upload(db: Session, project_id: int, user_id: int, file: UploadFile) -> None:
+    """Check project ownership, file type and size, raising 404/400/413."""
+    ProjectRepository(db).get_or_404(project_id, user_id)
+    if supported_extension(file.filename) is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file type; use one of: {', '.join(READERS)}"
+        )
+
+    max_bytes = get_settings().import_max_upload_mb * 1024 * 1024
+    size = file.file.seek(0, 2)
+    file.file.seek(0)
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=413,
+            detail=f"File exceeds {get_settings().import_max_upload_mb} MB"
+        )
+
+
+def _run_import_job(store: JobStore, job: Job, project_id: int, filename: str) -> None:
+    """Import the job's uploaded file, recording progress in bytes parsed."""
+    store.update(job, status=JOB_RUNNING)
+    last_update = time.monotonic()
+    read = {"progress": 0, "total": None}
+
+    def on_progress(done: int, total: int) -> None:
+        nonlocal last_update
+        read.update(progress=done, total=total)
+        now = time.monotonic()
+        if now - last_update >= PROGRESS_INTERVAL_SECONDS:
+            store.update(job, **read)
+            last_update = now
+
+    db = SessionLocal()
+    try:
+        with open(store.input_path(job), "rb") as stream:
+            chapter_ids = import_manuscript(db, project_id, stream, filename, on_progress=on_progress)
+    except ManuscriptImportError as e:
+        store.update(job, status=JOB_FAILED, error=str(e))
+        return
+    except Exception:
+        logger.exception("Import job %s failed", job.id)
+        store.update(job, status=JOB_FAILED, error="Import failed")
+        return
+    finally:
+        db.close()
+        store.input_path(job).unlink(missing_ok=True)
+
+    store.update(
+        job,
+        status=JOB_SUCCEEDED,
+        **read,
+        result={"project_id": project_id, "chapter_ids": chapter_ids},
+    )
+
+
+@router.post("/{project_id}/import", response_model=ImportResult, status_code=201)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def import_chapters(
+    request: Request,
+    project_id: int,
+    file: UploadFile = File(..., description="A .txt, .md or .docx manuscript"),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Import a manuscript file as new chapters at the end of a project.
+
+    The file is split into chapters at headings (Markdown # and ##,
+    Word Title and Heading 1, and the configured heading patterns such
+    as "BAB 1"). All chapters are inserted in one transaction.
+    """
+    _check_upload(db, project_id, current_user.id, file)
+    try:
+        chapter_ids = import_manuscript(db, project_id, file.file, file.filename)
+    except ManuscriptImportError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    created = set(chapter_ids)
+    chapters = [c for c in ChapterRepository(db).list_outline(project_id) if c.id in created]
+    return ImportResult(project_id=project_id, chapters=chapters)
+
+
+@router.post("/{project_id}/import/jobs", response_model=JobStatus, status_code=202)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def create_import_job(
+    request: Request,
+    project_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="A .txt, .md or .docx manuscript"),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Import a manuscript file in the background.
+
+    For large files; poll the returned job for progress (bytes parsed)
+    and, once it succeeds, the IDs of the created chapters.
+    """
+    _check_upload(db, project_id, current_user.id, file)
+    store = JobStore()
+    store.prune()
+    job = store.create(current_user.id, "import")
+    # The upload is gone once the request ends, so the job reads a copy
+    with open(store.input_path(job), "wb") as target:
+        shutil.copyfileobj(file.file, target)
+    background_tasks.add_task(_run_import_job, store, job, project_id, file.filename)
+    return job_status(job)
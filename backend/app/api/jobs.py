@@ -0,0 +1,72 @@
+"""
+Background job API endpoints.
+
+This module reports the status of a user's background jobs and serves
+the artifact a finished job produced.
+"""
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import FileResponse
+
+from ..schemas.job import JobStatus
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
+from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
+from ..utils.jobs import Job, JobStore, JOB_SUCCEEDED
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def job_status(job: Job) -> JobStatus:
+    """Build the API representation of a job."""
+    return JobStatus(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        progress=job.progress,
+        total=job.total,
+        error=job.error,
+        result=job.result,
+        download_url=f"/api/v1/jobs/{job.id}/download" if job.status == JOB_SUCCEEDED and job.artifact_name else None,
+        created_at=datetime.fromtimestamp(job.created_at, timezone.utc),
+        updated_at=datetime.fromtimestamp(job.updated_at, timezone.utc),
+    )
+
+
+def _get_job(job_id: str, user_id: int) -> Job:
+    """Get a job owned by the user, raising 404 if not found."""
+    job = JobStore().get(job_id, user_id=user_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def get_job(
+    request: Request,
+    job_id: str,
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+):
+    """Get the status and progress of a background job."""
+    return job_status(_get_job(job_id, current_user.id))
+
+
+@router.get("/{job_id}/download")
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def download_job_artifact(
+    request: Request,
+    job_id: str,
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+):
+    """Download the file produced by a finished job."""
+    store = JobStore()
+    job = _get_job(job_id, current_user.id)
+    if job.status != JOB_SUCCEEDED or not job.artifact_name:
+        raise HTTPException(status_code=409, detail="Job has no artifact to download")
+
+    path = store.artifact_path(job)
+    if not path.is_file():
+        raise HTTPException(status_code=410, detail="Job artifact has expired")
+    return FileResponse(path, media_type=job.media_type, filename=job.artifact_name)
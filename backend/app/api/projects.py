@@ -5,53 +5,107 @@ This module provides CRUD endpoints for projects and chapters,
 using the repository pattern for database operations.
 """
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Optional
 
 from ..database import get_db
-from ..models import User
 from ..schemas import (
     Project as ProjectSchema,
     ProjectCreate,
     ProjectUpdate,
     ProjectList,
+    ProjectPage,
+    ProjectOutline,
     Chapter as ChapterSchema,
     ChapterCreate,
     ChapterUpdate,
+    ChapterPatch,
+    ChapterPatchResult,
+    ChapterOutline,
+    ChapterPage,
+    ChapterBatch,
+    ChapterBatchResult,
 )
-from ..dependencies.auth import get_current_approved_user
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
+from ..utils.profiler import profileable
 from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
 from ..utils.db_transactions import transaction
+from ..utils.etag import (
+    chapter_etag, project_etag, if_none_match, check_if_match, set_etag, not_modified
+)
+from ..utils.pagination import decode_cursor, encode_cursor, parse_fields, selected_columns
 from ..repositories import ProjectRepository, ChapterRepository
+from ..constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
+def _get_project_etag(
+    repo: ProjectRepository, project_id: int, user_id: int, representation: str = "project"
+) -> str:
+    """Compute a project's ETag from row versions, raising 404 if not found."""
+    versions = repo.get_version_vector(project_id, user_id)
+    if versions is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return project_etag(project_id, *versions, representation=representation)
+
+
+# Computed response fields and the columns they are derived from
+_DERIVED_FIELDS = {"reading_minutes": ("word_count",)}
+
+_FIELDS_DESCRIPTION = "Comma-separated fields to return for each item, e.g. id,title (default: all)"
+
+
+def _page_response(page_schema, item_schema, rows, has_more, limit, selected):
+    """
+    Build a listing page from rows, keeping only the selected fields.
+
+    Without a selection the page goes through the endpoint's response
+    model as usual; with one, items are built without validation from
+    the partial rows and only the selected fields are serialized.
+    """
+    next_cursor = encode_cursor(rows[-1].id) if has_more else None
+    if selected is None:
+        items = [item_schema.model_validate(row) for row in rows]
+        return page_schema(items=items, next_cursor=next_cursor, limit=limit)
+
+    items = [item_schema.model_construct(**row._mapping) for row in rows]
+    page = page_schema(items=items, next_cursor=next_cursor, limit=limit)
+    return ORJSONResponse(page.model_dump(
+        mode="json",
+        include={"items": {"__all__": selected}, "next_cursor": True, "limit": True},
+    ))
+
+
 # Project Endpoints
 
-@router.get("", response_model=List[ProjectList])
+@router.get("", response_model=ProjectPage)
 @limiter.limit(RATE_LIMIT_DEFAULT)
 def list_projects(
     request: Request,
-    current_user: User = Depends(get_current_approved_user),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(default=None, description=_FIELDS_DESCRIPTION),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
-    """List all projects for the current user."""
-    repo = ProjectRepository(db)
-    projects = repo.list_for_user(current_user.id)
-
-    return [
-        ProjectList(
-            id=p.id,
-            title=p.title,
-            description=p.description,
-            created_at=p.created_at,
-            updated_at=p.updated_at,
-            chapter_count=chapter_count,
-        )
-        for p, chapter_count in projects
-    ]
+    """
+    List the current user's projects, most recently updated first.
+
+    Returns a page of at most limit projects; pass next_cursor back as
+    cursor for the next page (it is null on the last page). Only the
+    columns behind the selected fields are read.
+    """
+    selected = parse_fields(fields, ProjectList)
+    rows, has_more = ProjectRepository(db).list_page_for_user(
+        current_user.id,
+        limit,
+        after_id=decode_cursor(cursor) if cursor else None,
+        columns=selected_columns(selected, ProjectList, _DERIVED_FIELDS),
+    )
+    return _page_response(ProjectPage, ProjectList, rows, has_more, limit, selected)
 
 
 @router.post("", response_model=ProjectSchema)
@@ -59,7 +113,7 @@ def list_projects(
 def create_project(
     request: Request,
     project: ProjectCreate,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
     """Create a new project for the current user."""
@@ -69,31 +123,84 @@ def create_project(
 
 @router.get("/{project_id}", response_model=ProjectSchema)
 @limiter.limit(RATE_LIMIT_DEFAULT)
+@profileable
 def get_project(
     request: Request,
+    response: Response,
     project_id: int,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
-    """Get a project by ID (only if it belongs to current user)."""
+    """
+    Get a project by ID (only if it belongs to current user).
+
+    Returns 304 without loading chapter content when If-None-Match
+    matches the current ETag.
+    """
     repo = ProjectRepository(db)
+    etag = _get_project_etag(repo, project_id, current_user.id)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
     return repo.get_or_404(project_id, current_user.id)
 
 
+@router.get("/{project_id}/outline", response_model=ProjectOutline)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+@profileable
+def get_project_outline(
+    request: Request,
+    response: Response,
+    project_id: int,
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Get a project with its chapter tree, without chapter content.
+
+    Chapter content is fetched per chapter via get_chapter.
+    """
+    repo = ProjectRepository(db)
+    etag = _get_project_etag(repo, project_id, current_user.id, representation="outline")
+    if if_none_match(request, etag):
+        return not_modified(etag)
+
+    project = repo.get_or_404(project_id, current_user.id)
+    chapters = ChapterRepository(db).list_outline(project_id)
+    set_etag(response, etag)
+    return ProjectOutline(
+        id=project.id,
+        title=project.title,
+        description=project.description,
+        created_at=project.created_at,
+        updated_at=project.updated_at,
+        chapter_count=project.chapter_count,
+        word_count=project.word_count,
+        character_count=project.character_count,
+        paragraph_count=project.paragraph_count,
+        chapters=chapters,
+    )
+
+
 @router.put("/{project_id}", response_model=ProjectSchema)
 @limiter.limit(RATE_LIMIT_DEFAULT)
 def update_project(
     request: Request,
+    response: Response,
     project_id: int,
     project: ProjectUpdate,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
-    """Update a project (only if it belongs to current user)."""
+    """Update a project (only if it belongs to current user and matches If-Match)."""
     with transaction(db):
         repo = ProjectRepository(db)
+        check_if_match(request, _get_project_etag(repo, project_id, current_user.id))
         db_project = repo.get_or_404(project_id, current_user.id)
-        return repo.update(db_project, auto_commit=False, **project.model_dump(exclude_unset=True))
+        db_project = repo.update(db_project, auto_commit=False, **project.model_dump(exclude_unset=True))
+        set_etag(response, _get_project_etag(repo, project_id, current_user.id))
+        return db_project
 
 
 @router.delete("/{project_id}")
@@ -101,12 +208,13 @@ def update_project(
 def delete_project(
     request: Request,
     project_id: int,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
-    """Delete a project (only if it belongs to current user)."""
+    """Delete a project (only if it belongs to current user and matches If-Match)."""
     with transaction(db):
         repo = ProjectRepository(db)
+        check_if_match(request, _get_project_etag(repo, project_id, current_user.id))
         db_project = repo.get_or_404(project_id, current_user.id)
         repo.delete(db_project, auto_commit=False)
     return {"message": "Project deleted successfully"}
@@ -114,13 +222,41 @@ def delete_project(
 
 # Chapter Endpoints
 
+@router.get("/{project_id}/chapters", response_model=ChapterPage)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def list_chapters(
+    request: Request,
+    project_id: int,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default=None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(default=None, description=_FIELDS_DESCRIPTION),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    List a project's chapters in order, without their content.
+
+    Paged like list_projects; use the outline endpoint to get every
+    chapter at once.
+    """
+    ProjectRepository(db).get_or_404(project_id, current_user.id)
+    selected = parse_fields(fields, ChapterOutline)
+    rows, has_more = ChapterRepository(db).list_page(
+        project_id,
+        limit,
+        after_id=decode_cursor(cursor) if cursor else None,
+        columns=selected_columns(selected, ChapterOutline, _DERIVED_FIELDS),
+    )
+    return _page_response(ChapterPage, ChapterOutline, rows, has_more, limit, selected)
+
+
 @router.post("/{project_id}/chapters", response_model=ChapterSchema)
 @limiter.limit(RATE_LIMIT_DEFAULT)
 def create_chapter(
     request: Request,
     project_id: int,
     chapter: ChapterCreate,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
     """Create a new chapter in a project (only if project belongs to current user)."""
@@ -132,35 +268,118 @@ def create_chapter(
         return chapter_repo.create(project_id, auto_commit=False, **chapter.model_dump())
 
 
+@router.post("/{project_id}/chapters/batch", response_model=ChapterBatchResult)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+@profileable
+def batch_update_chapters(
+    request: Request,
+    response: Response,
+    project_id: int,
+    batch: ChapterBatch,
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Reorder, rename and delete many chapters in one transaction.
+
+    Honors If-Match against the project outline ETag, and returns the
+    new outline with its ETag.
+    """
+    with transaction(db):
+        project_repo = ProjectRepository(db)
+        check_if_match(request, _get_project_etag(project_repo, project_id, current_user.id, "outline"))
+        chapter_repo = ChapterRepository(db)
+        updated, deleted = chapter_repo.apply_batch(
+            project_id, [mutation.model_dump() for mutation in batch.mutations], auto_commit=False
+        )
+
+    set_etag(response, _get_project_etag(project_repo, project_id, current_user.id, "outline"))
+    return ChapterBatchResult(
+        updated=updated,
+        deleted=deleted,
+        chapters=chapter_repo.list_outline(project_id),
+    )
+
+
 @router.get("/{project_id}/chapters/{chapter_id}", response_model=ChapterSchema)
 @limiter.limit(RATE_LIMIT_DEFAULT)
+@profileable
 def get_chapter(
     request: Request,
+    response: Response,
     project_id: int,
     chapter_id: int,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
-    """Get a chapter by ID (only if project belongs to current user)."""
+    """
+    Get a chapter by ID (only if project belongs to current user).
+
+    Returns 304 without loading content when If-None-Match matches the
+    current ETag.
+    """
     repo = ChapterRepository(db)
+    version = repo.get_version(chapter_id, project_id, current_user.id)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+    etag = chapter_etag(chapter_id, version)
+    if if_none_match(request, etag):
+        return not_modified(etag)
+
+    set_etag(response, etag)
     return repo.get_or_404(chapter_id, project_id, current_user.id)
 
 
 @router.put("/{project_id}/chapters/{chapter_id}", response_model=ChapterSchema)
 @limiter.limit(RATE_LIMIT_DEFAULT)
+@profileable
 def update_chapter(
     request: Request,
+    response: Response,
     project_id: int,
     chapter_id: int,
     chapter: ChapterUpdate,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
-    """Update a chapter (only if project belongs to current user)."""
+    """Update a chapter (only if project belongs to current user and matches If-Match)."""
     with transaction(db):
         repo = ChapterRepository(db)
         db_chapter = repo.get_or_404(chapter_id, project_id, current_user.id)
-        return repo.update(db_chapter, auto_commit=False, **chapter.model_dump(exclude_unset=True))
+        check_if_match(request, chapter_etag(db_chapter.id, db_chapter.version))
+        db_chapter = repo.update(db_chapter, auto_commit=False, **chapter.model_dump(exclude_unset=True))
+        set_etag(response, chapter_etag(db_chapter.id, db_chapter.version))
+        return db_chapter
+
+
+@router.patch("/{project_id}/chapters/{chapter_id}", response_model=ChapterPatchResult)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+@profileable
+def patch_chapter_content(
+    request: Request,
+    project_id: int,
+    chapter_id: int,
+    patch: ChapterPatch,
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Apply text edit operations to a chapter's content.
+
+    Returns only the new version instead of the whole chapter, so an
+    autosave costs the size of the edit rather than the chapter.
+    """
+    with transaction(db):
+        repo = ChapterRepository(db)
+        db_chapter = repo.get_or_404(chapter_id, project_id, current_user.id)
+        ops = [op.model_dump(exclude_none=True) for op in patch.ops]
+        db_chapter = repo.apply_patch(db_chapter, patch.base_version, ops, auto_commit=False)
+        return ChapterPatchResult(
+            id=db_chapter.id,
+            version=db_chapter.version,
+            content_length=len(db_chapter.content or ""),
+            updated_at=db_chapter.updated_at,
+        )
 
 
 @router.delete("/{project_id}/chapters/{chapter_id}")
@@ -169,12 +388,13 @@ def delete_chapter(
     request: Request,
     project_id: int,
     chapter_id: int,
-    current_user: User = Depends(get_current_approved_user),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
     db: Session = Depends(get_db)
 ):
-    """Delete a chapter (only if project belongs to current user)."""
+    """Delete a chapter (only if project belongs to current user and matches If-Match)."""
     with transaction(db):
         repo = ChapterRepository(db)
         db_chapter = repo.get_or_404(chapter_id, project_id, current_user.id)
+        check_if_match(request, chapter_etag(db_chapter.id, db_chapter.version))
         repo.delete(db_chapter, auto_commit=False)
     return {"message": "Chapter deleted successfully"}
@@ -0,0 +1,111 @@
+"""
+Revision API endpoints for chapter content history.
+
+This module lists a chapter's saved revisions, returns the content of
+any revision, and diffs two revisions as plain text.
+"""
+
+import difflib
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..database import get_db
+from ..schemas.revision import RevisionList, RevisionDetail, RevisionDiff
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
+from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
+from ..utils.text import html_to_text
+from ..repositories import ChapterRepository, RevisionRepository
+from ..constants import DEFAULT_REVISION_LIMIT, MAX_REVISION_LIMIT, REVISION_DIFF_CONTEXT_LINES
+
+router = APIRouter(prefix="/projects", tags=["revisions"])
+
+
+def _check_chapter(db: Session, chapter_id: int, project_id: int, user_id: int) -> None:
+    """Raise 404 unless the chapter exists in a project owned by the user."""
+    if ChapterRepository(db).get_version(chapter_id, project_id, user_id) is None:
+        raise HTTPException(status_code=404, detail="Chapter not found")
+
+
+@router.get("/{project_id}/chapters/{chapter_id}/revisions", response_model=RevisionList)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def list_revisions(
+    request: Request,
+    project_id: int,
+    chapter_id: int,
+    limit: int = Query(default=DEFAULT_REVISION_LIMIT, ge=1, le=MAX_REVISION_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """List a chapter's revisions, newest first."""
+    _check_chapter(db, chapter_id, project_id, current_user.id)
+    total, revisions = RevisionRepository(db).list_for_chapter(chapter_id, limit=limit, offset=offset)
+    return RevisionList(chapter_id=chapter_id, total=total, limit=limit, offset=offset, revisions=revisions)
+
+
+@router.get("/{project_id}/chapters/{chapter_id}/revisions/{revision}", response_model=RevisionDetail)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def get_revision(
+    request: Request,
+    project_id: int,
+    chapter_id: int,
+    revision: int,
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """Get a revision with its full content."""
+    _check_chapter(db, chapter_id, project_id, current_user.id)
+    repo = RevisionRepository(db)
+    found = repo.get_or_404(chapter_id, revision)
+    return RevisionDetail(
+        revision=found.revision,
+        is_snapshot=found.is_snapshot,
+        content_length=found.content_length,
+        chapter_version=found.chapter_version,
+        created_at=found.created_at,
+        updated_at=found.updated_at,
+        content=repo.get_text(chapter_id, revision),
+    )
+
+
+@router.get("/{project_id}/chapters/{chapter_id}/revisions/{revision}/diff", response_model=RevisionDiff)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+def diff_revisions(
+    request: Request,
+    project_id: int,
+    chapter_id: int,
+    revision: int,
+    against: Optional[int] = Query(default=None, description="Base revision (default: the previous one)"),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """
+    Diff a revision against another one as plain text.
+
+    Compares the text without markup, line by line, so formatting-only
+    changes don't show up.
+    """
+    _check_chapter(db, chapter_id, project_id, current_user.id)
+    repo = RevisionRepository(db)
+    repo.get_or_404(chapter_id, revision)
+    if against is None:
+        against = repo.get_previous_number(chapter_id, revision)
+
+    old_lines = html_to_text(repo.get_text(chapter_id, against)).splitlines() if against else []
+    new_lines = html_to_text(repo.get_text(chapter_id, revision)).splitlines()
+    diff = list(difflib.unified_diff(
+        old_lines, new_lines,
+        fromfile=f"revision {against or 0}", tofile=f"revision {revision}",
+        n=REVISION_DIFF_CONTEXT_LINES, lineterm="",
+    ))
+    changes = diff[2:]  # Skip the ---/+++ file headers
+    return RevisionDiff(
+        chapter_id=chapter_id,
+        from_revision=against or 0,
+        to_revision=revision,
+        added_lines=sum(1 for line in changes if line.startswith("+")),
+        removed_lines=sum(1 for line in changes if line.startswith("-")),
+        diff="\n".join(diff),
+    )
@@ -0,0 +1,40 @@
+"""
+Search API endpoints for finding text across a user's projects.
+
+This module provides full-text search over chapter titles and content,
+returning ranked snippets with highlight offsets.
+"""
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..database import get_db
+from ..schemas.search import SearchResponse
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
+from ..utils.profiler import profileable
+from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
+from ..repositories import SearchRepository
+from ..constants import MAX_SEARCH_QUERY_LENGTH, DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=SearchResponse)
+@limiter.limit(RATE_LIMIT_DEFAULT)
+@profileable
+def search_chapters(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=MAX_SEARCH_QUERY_LENGTH),
+    project_id: Optional[int] = None,
+    limit: int = Query(default=DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    offset: int = Query(default=0, ge=0),
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: Session = Depends(get_db)
+):
+    """Search chapter titles and content across the current user's projects."""
+    repo = SearchRepository(db)
+    total, results = repo.search(
+        current_user.id, q, project_id=project_id, limit=limit, offset=offset
+    )
+    return SearchResponse(query=q, total=total, limit=limit, offset=offset, results=results)
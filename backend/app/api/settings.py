@@ -6,46 +6,41 @@ including custom writing style prompts.
 """
 
 from fastapi import APIRouter, Depends, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..models import User, UserSettings
+from ..database import get_async_db
 from ..schemas.settings import UserSettingsResponse, UserSettingsUpdate
-from ..dependencies.auth import get_current_approved_user
+from ..dependencies.auth import CurrentIdentity, get_current_approved_identity
 from ..services.llm import WRITING_STYLES, TITLE_STYLES
 from ..utils.rate_limiter import limiter, RATE_LIMIT_DEFAULT
+from ..utils.responses import PrecomputedJSON
+from ..repositories import AsyncUserSettingsRepository
 
 router = APIRouter(prefix="/settings", tags=["settings"])
 
+DEFAULT_PROMPTS = PrecomputedJSON({
+    "writing_styles": WRITING_STYLES,
+    "title_styles": TITLE_STYLES
+})
+
 
 @router.get("/default-prompts")
 @limiter.limit(RATE_LIMIT_DEFAULT)
 async def get_default_prompts(request: Request):
-    """Get all default writing style prompts."""
-    return {
-        "writing_styles": WRITING_STYLES,
-        "title_styles": TITLE_STYLES
-    }
+    """Get all default writing style prompts (encoded once at startup)."""
+    return DEFAULT_PROMPTS.response(request)
 
 
 @router.get("/me", response_model=UserSettingsResponse)
 @limiter.limit(RATE_LIMIT_DEFAULT)
 async def get_my_settings(
     request: Request,
-    current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's settings"""
-    settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
-
-    if not settings:
-        # Create default settings if they don't exist
-        settings = UserSettings(user_id=current_user.id, custom_prompts={})
-        db.add(settings)
-        db.commit()
-        db.refresh(settings)
-
-    return settings
+    repo = AsyncUserSettingsRepository(db)
+    return await repo.get_or_create(current_user.id)
 
 
 @router.put("/me", response_model=UserSettingsResponse)
@@ -53,21 +48,9 @@ async def get_my_settings(
 async def update_my_settings(
     request: Request,
     settings_update: UserSettingsUpdate,
-    current_user: User = Depends(get_current_approved_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentIdentity = Depends(get_current_approved_identity),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update current user's settings"""
-    settings = db.query(UserSettings).filter(UserSettings.user_id == current_user.id).first()
-
-    if not settings:
-        # Create settings if they don't exist
-        settings = UserSettings(user_id=current_user.id)
-        db.add(settings)
-
-    # Update custom prompts
-    settings.custom_prompts = settings_update.custom_prompts
-
-    db.commit()
-    db.refresh(settings)
-
-    return settings
+    repo = AsyncUserSettingsRepository(db)
+    return await repo.update_custom_prompts(current_user.id, settings_update.custom_prompts)
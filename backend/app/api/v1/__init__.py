@@ -5,15 +5,28 @@ This module aggregates all v1 API routes under a single versioned prefix.
 """
 
 from fastapi import APIRouter
+from fastapi.responses import ORJSONResponse
 
 from ..projects import router as projects_router
 from ..ai import router as ai_router
 from ..auth import router as auth_router
 from ..settings import router as settings_router
+from ..search import router as search_router
+from ..revisions import router as revisions_router
+from ..export import router as export_router
+from ..imports import router as import_router
+from ..jobs import router as jobs_router
+from ..admin import router as admin_router
 
-router = APIRouter(prefix="/api/v1")
+router = APIRouter(prefix="/api/v1", default_response_class=ORJSONResponse)
 
 router.include_router(auth_router)
 router.include_router(projects_router)
 router.include_router(ai_router)
 router.include_router(settings_router)
+router.include_router(search_router)
+router.include_router(revisions_router)
+router.include_router(export_router)
+router.include_router(import_router)
+router.include_router(jobs_router)
+router.include_router(admin_router)
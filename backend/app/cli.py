@@ -0,0 +1,134 @@
+"""
+Maintenance commands for the backend.
+
+Run from the backend directory, e.g.:
+
+    python -m app.cli reindex-search
+"""
+
+import argparse
+import sys
+
+from .database import SessionLocal
+
+
+def reindex_search(args: argparse.Namespace) -> int:
+    """Rebuild the chapter full-text search index."""
+    from .repositories import SearchRepository
+
+    db = SessionLocal()
+    try:
+        indexed = SearchRepository(db).reindex(batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Indexed {indexed} chapters")
+    return 0
+
+
+def recompress_chapters(args: argparse.Namespace) -> int:
+    """Rewrite stored chapter content with the configured compression codec."""
+    from .repositories import ChapterRepository
+
+    db = SessionLocal()
+    try:
+        scanned, rewritten = ChapterRepository(db).recompress(batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Scanned {scanned} chapters, rewrote {rewritten}")
+    return 0
+
+
+def compact_revisions(args: argparse.Namespace) -> int:
+    """Thin out old chapter revisions according to the retention policy."""
+    from .repositories import RevisionRepository
+
+    db = SessionLocal()
+    try:
+        chapters, removed = RevisionRepository(db).compact(keep_all_days=args.keep_all_days)
+    finally:
+        db.close()
+    print(f"Removed {removed} revisions from {chapters} chapters")
+    return 0
+
+
+def backfill_stats(args: argparse.Namespace) -> int:
+    """Recompute chapter statistics from content and refresh project totals."""
+    from .repositories import ChapterRepository
+
+    db = SessionLocal()
+    try:
+        scanned, updated = ChapterRepository(db).backfill_stats(batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Scanned {scanned} chapters, updated {updated}")
+    return 0
+
+
+def prune_jobs(args: argparse.Namespace) -> int:
+    """Delete expired background jobs and their artifacts."""
+    from .utils.jobs import JobStore
+
+    deleted = JobStore().prune(ttl_hours=args.ttl_hours)
+    print(f"Deleted {deleted} jobs")
+    return 0
+
+
+def grant_admin(args: argparse.Namespace) -> int:
+    """Grant (or with --revoke, take away) administrator access."""
+    from .models import User
+
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.username == args.username).first()
+        if user is None:
+            print(f"No user named {args.username!r}", file=sys.stderr)
+            return 1
+        user.is_admin = not args.revoke
+        db.commit()
+    finally:
+        db.close()
+    print(f"{'Revoked' if args.revoke else 'Granted'} admin access for {args.username}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reindex = subparsers.add_parser("reindex-search", help=reindex_search.__doc__)
+    reindex.add_argument("--batch-size", type=int, default=200)
+    reindex.set_defaults(func=reindex_search)
+
+    recompress = subparsers.add_parser("recompress-chapters", help=recompress_chapters.__doc__)
+    recompress.add_argument("--batch-size", type=int, default=200)
+    recompress.set_defaults(func=recompress_chapters)
+
+    compact = subparsers.add_parser("compact-revisions", help=compact_revisions.__doc__)
+    compact.add_argument("--keep-all-days", type=int, default=None,
+                         help="Days of full history to keep (default: REVISION_KEEP_ALL_DAYS)")
+    compact.set_defaults(func=compact_revisions)
+
+    stats = subparsers.add_parser("backfill-stats", help=backfill_stats.__doc__)
+    stats.add_argument("--batch-size", type=int, default=200)
+    stats.set_defaults(func=backfill_stats)
+
+    prune = subparsers.add_parser("prune-jobs", help=prune_jobs.__doc__)
+    prune.add_argument("--ttl-hours", type=int, default=None,
+                       help="Age after which jobs are deleted (default: JOB_TTL_HOURS)")
+    prune.set_defaults(func=prune_jobs)
+
+    admin = subparsers.add_parser("grant-admin", help=grant_admin.__doc__)
+    admin.add_argument("username")
+    admin.add_argument("--revoke", action="store_true", help="Remove admin access instead")
+    admin.set_defaults(func=grant_admin)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
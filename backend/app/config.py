@@ -28,6 +28,83 @@ class Settings(BaseSettings):
 
     # Database
     database_url: str = "sqlite:///./diksiai.db"
+    database_echo: bool = False  # Log every SQL statement
+    # Log statements slower than this to "app.sql" (0 disables), and report
+    # a statement run this many times in one request as a likely N+1
+    db_slow_query_ms: int = 200
+    db_n_plus_one_threshold: int = 10
+
+    # SQLite storage profile ("production" or "default"), applied on connect
+    sqlite_profile: str = "production"
+    sqlite_mmap_size: int = 268435456  # 256 MB
+    sqlite_cache_size_kb: int = 65536  # 64 MB page cache per connection
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_wal_checkpoint_interval: int = 300  # Seconds, 0 disables
+
+    # Connection pool for Postgres, per process (so per uvicorn worker);
+    # keep workers * (pool_size + max_overflow) below max_connections
+    database_pool_size: int = 10
+    database_max_overflow: int = 10  # Extra connections opened under load
+    database_pool_timeout: int = 30  # Seconds to wait for a free connection
+    database_pool_recycle: int = 1800  # Seconds before a connection is replaced
+    database_statement_timeout_ms: int = 30000  # Postgres statement_timeout, 0 disables
+
+    # Chapter content compression at rest ("zlib", "zstd" or "none")
+    content_compression: str = "zlib"
+    content_compression_min_bytes: int = 256  # Smaller content is stored raw
+
+    # Chapter revision history
+    revision_window_seconds: int = 300  # Saves within this window share a revision
+    revision_snapshot_interval: int = 20  # Max deltas between full snapshots
+    revision_keep_all_days: int = 30  # Older revisions are thinned to one per day
+
+    # Response compression (gzip, or brotli when installed)
+    response_compression_min_size: int = 1024  # Bytes; smaller bodies are sent as-is
+    response_gzip_level: int = 5
+    response_brotli_quality: int = 5
+
+    # Background jobs (e.g. large exports) and their downloadable artifacts
+    job_dir: str = "./data/jobs"
+    job_ttl_hours: int = 24  # Finished jobs are pruned after this long
+
+    # Rate limit buckets, shared by all worker processes through this SQLite
+    # file; empty keeps them in memory per process
+    rate_limit_storage: str = "./data/rate_limits.sqlite3"
+
+    # Prometheus metrics at /metrics. Workers share them through snapshot
+    # files in metrics_dir (empty: serve only the answering process's).
+    # Without metrics_token only direct local requests may scrape.
+    metrics_enabled: bool = True
+    metrics_dir: str = "./data/metrics"
+    metrics_flush_interval: int = 5  # Seconds between snapshot writes
+    metrics_token: str = ""
+
+    # Per-request tracing: Server-Timing and X-Request-ID headers, a JSON
+    # trace record per request on the "app.trace" logger, and optional export
+    # to an OTLP/HTTP collector, e.g. http://localhost:4318/v1/traces
+    tracing_enabled: bool = True
+    tracing_log_records: bool = True
+    tracing_otlp_endpoint: str = ""
+
+    # On-demand profiling for admins: a sampling profile of the process at
+    # /api/v1/admin/profile, and cProfile for single calls of selected
+    # endpoints sent with an X-Profile header. Idle until requested.
+    profiler_enabled: bool = True
+    profiler_max_seconds: int = 60  # Longest sampling profile allowed
+
+    # When to build lazily loaded components (LLM clients, password hashing
+    # backend, ORM mappers, first DB connection): "background" while already
+    # serving, "wait" before accepting requests, or "off" (on first use)
+    startup_warmup: str = "background"
+
+    # Manuscript import
+    import_max_upload_mb: int = 20
+    # Regexes matched (case-insensitively) against short paragraphs to find
+    # chapter headings, in addition to Markdown #/## and Word Heading 1
+    import_heading_patterns: list[str] = [
+        r"^(bab|chapter|bagian|part)\s+([0-9]+|[ivxlcdm]+)\b",
+        r"^(prolog|prologue|epilog|epilogue)\b",
+    ]
 
     # Groq API (Cloud - Free)
     groq_api_key: str = ""
@@ -45,6 +122,15 @@ class Settings(BaseSettings):
     jwt_secret_key: str = "your-secret-key-change-this-in-production-min-32-chars"
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 10080  # 7 days
+    # Per-process cache of each user's id and approval state, so authenticated
+    # requests skip the users lookup; 0 disables it
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+    # bcrypt cost; existing hashes are rehashed to it when users log in
+    password_bcrypt_rounds: int = 12
+    # Password hashing runs on its own thread pool, per process
+    password_hash_workers: int = 2
+    password_hash_queue_limit: int = 32  # Hashes allowed to wait; more get 503
 
     def get_api_key_for_model(self, model: str) -> str:
         """
@@ -22,6 +22,25 @@ MAX_TITLE_LENGTH = 255  # Used for both projects and chapters
 MAX_DESCRIPTION_LENGTH = 2000
 MAX_CONTENT_LENGTH = 500000  # ~500KB for chapter content
 MAX_CHAPTER_ORDER = 10000
+MAX_PATCH_OPERATIONS = 1000  # Edit operations per chapter PATCH
+MAX_BATCH_MUTATIONS = 1000  # Chapter mutations per batch request
+
+# Manuscript statistics
+READING_WORDS_PER_MINUTE = 200  # Used for estimated reading time
+
+# Search
+MAX_SEARCH_QUERY_LENGTH = 200
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+
+# Listings (project and chapter pages)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Revision history
+DEFAULT_REVISION_LIMIT = 50
+MAX_REVISION_LIMIT = 200
+REVISION_DIFF_CONTEXT_LINES = 3
 
 # Settings validation
 MAX_PROMPT_KEY_LENGTH = 50
@@ -39,7 +58,9 @@ DEFAULT_PARAGRAPH_COUNT = 1
 MIN_TEXT_LENGTH_FOR_CONTINUATION = 50
 MIN_TEXT_LENGTH_FOR_REVIEW = 50
 MIN_TEXT_LENGTH_FOR_TITLE = 100
-MAX_CONTEXT_LENGTH = 5000
+MAX_CONTEXT_LENGTH = 5000  # Characters of chapter text the server sends as continuation context
+DEFAULT_CONTEXT_LINES = 20  # Paragraphs before the cursor used as continuation context
+MAX_CONTEXT_LINES = 200
 
 # Default improvement instruction
 DEFAULT_IMPROVEMENT_INSTRUCTION = (
@@ -1,17 +1,163 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from .config import get_settings
+from .config import get_settings, Settings
+from .utils.metrics import install_query_metrics
 
 settings = get_settings()
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    echo=settings.debug
+# SQLite PRAGMA profiles applied to every new connection.
+# "production" switches to WAL so readers never block the writer and the
+# uvicorn workers sharing one database file don't serialize on the
+# rollback journal; "default" leaves SQLite's built-in settings alone.
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def get_sqlite_pragmas(config: Settings) -> dict:
+    """
+    Build the PRAGMA statements for the configured SQLite profile.
+
+    Args:
+        config: Application settings
+
+    Returns:
+        Mapping of pragma name to value, in the order they should be applied
+    """
+    if config.sqlite_profile not in SQLITE_PROFILES:
+        raise ValueError(f"Unknown SQLite profile: {config.sqlite_profile}")
+
+    pragmas = {"busy_timeout": config.sqlite_busy_timeout_ms}
+    if config.sqlite_profile == "default":
+        return pragmas
+
+    pragmas.update(SQLITE_PROFILES[config.sqlite_profile])
+    pragmas["mmap_size"] = config.sqlite_mmap_size
+    # Negative cache_size is in KiB rather than pages
+    pragmas["cache_size"] = -config.sqlite_cache_size_kb
+    return pragmas
+
+
+def get_pool_options(database_url: str, config: Settings, async_driver: bool = False) -> dict:
+    """
+    Build the connection pool options for a database backend.
+
+    SQLite keeps SQLAlchemy's defaults. Postgres gets an explicitly sized
+    pool that recycles connections before server or proxy idle timeouts
+    drop them, and a statement_timeout so one runaway query can't hold a
+    connection (and its locks) indefinitely.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        config: Application settings
+        async_driver: Build connect_args for asyncpg rather than psycopg2
+
+    Returns:
+        Keyword arguments for create_engine / create_async_engine
+    """
+    backend = make_url(database_url).get_backend_name()
+    if backend == "sqlite":
+        return {}
+
+    options = {
+        "pool_size": config.database_pool_size,
+        "max_overflow": config.database_max_overflow,
+        "pool_timeout": config.database_pool_timeout,
+        "pool_recycle": config.database_pool_recycle,
+    }
+    timeout_ms = config.database_statement_timeout_ms
+    if backend == "postgresql" and timeout_ms > 0:
+        if async_driver:
+            options["connect_args"] = {"server_settings": {"statement_timeout": str(timeout_ms)}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout_ms}"}
+    return options
+
+
+def create_database_engine(database_url: str, config: Settings) -> Engine:
+    """
+    Create a database engine configured for the given backend.
+
+    For SQLite URLs the storage profile pragmas are applied on connect;
+    for Postgres the pool options from get_pool_options are used.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        config: Application settings
+
+    Returns:
+        The configured Engine
+    """
+    db_engine = create_engine(
+        database_url,
+        pool_pre_ping=True,
+        echo=config.database_echo,
+        **get_pool_options(database_url, config),
+    )
+    _install_sqlite_pragmas(db_engine, config)
+    return db_engine
+
+
+def _install_sqlite_pragmas(db_engine: Engine, config: Settings) -> None:
+    """Apply the SQLite storage profile to each new connection of an engine."""
+    if db_engine.dialect.name != "sqlite":
+        return
+
+    pragmas = get_sqlite_pragmas(config)
+
+    @event.listens_for(db_engine, "connect")
+    def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+# Async drivers used for each sync backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Derive the async driver URL for a sync database URL.
+
+    Args:
+        database_url: SQLAlchemy database URL (e.g. "sqlite:///./diksiai.db")
+
+    Returns:
+        The same database with an async driver (e.g. "sqlite+aiosqlite:///./diksiai.db")
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend: {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+# Statement timing feeds metrics, request tracing and the slow-query log
+TIME_STATEMENTS = (
+    settings.metrics_enabled or settings.tracing_enabled
+    or settings.db_slow_query_ms > 0 or settings.db_n_plus_one_threshold > 0
 )
 
+# Create database engine
+engine = create_database_engine(settings.database_url, settings)
+if TIME_STATEMENTS:
+    install_query_metrics(engine)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -19,6 +165,18 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def warm_up_database() -> None:
+    """Configure the ORM mappers and open the first pooled connection."""
+    from sqlalchemy import text
+    from sqlalchemy.orm import configure_mappers
+
+    from . import models  # noqa: F401  (registers the mappers)
+
+    configure_mappers()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
 def get_db():
     """Dependency for getting database session"""
     db = SessionLocal()
@@ -26,3 +184,44 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async engine and session factory, created on first use so the sync
+# path doesn't pay for them until endpoints are migrated.
+_async_engine: AsyncEngine | None = None
+_async_session_factory: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the shared async database engine, creating it on first use."""
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            get_async_database_url(settings.database_url),
+            pool_pre_ping=True,
+            echo=settings.database_echo,
+            **get_pool_options(settings.database_url, settings, async_driver=True),
+        )
+        _install_sqlite_pragmas(_async_engine.sync_engine, settings)
+        if TIME_STATEMENTS:
+            install_query_metrics(_async_engine.sync_engine)
+        _async_session_factory = async_sessionmaker(
+            _async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the async engine's connections if it was ever created."""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    get_async_engine()
+    async with _async_session_factory() as db:
+        yield db
@@ -2,6 +2,10 @@
 Authentication dependencies for FastAPI endpoints.
 
 Provides dependency injection for user authentication and authorization.
+Endpoints that only need the caller's id should depend on
+get_current_approved_identity, which is served from the identity cache
+and skips loading the User row; get_current_user / get_current_approved_user
+load the full ORM User.
 """
 
 from fastapi import Depends, HTTPException, status
@@ -12,39 +16,60 @@ from typing import Optional
 from ..database import get_db
 from ..models import User
 from ..utils.auth import verify_token
+from ..utils.auth_cache import CurrentIdentity, identity_cache
+from ..utils.metrics import record_cache
+from ..utils.tracing import span
 from ..services.auth_service import AuthService
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """
-    Get the current authenticated user from JWT token
-    """
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    token = credentials.credentials
-    payload = verify_token(token)
 
+def _not_approved_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail="User account is not approved. Please wait for admin approval."
+    )
+
+
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """Return the user id carried by a valid bearer token, or raise 401."""
+    with span("jwt"):
+        payload = verify_token(credentials.credentials)
     if payload is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    user_id: Optional[int] = payload.get("sub")
+    user_id: Optional[str] = payload.get("sub")
     if user_id is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
-    auth_service = AuthService(db)
-    user = auth_service.get_user_by_id(int(user_id))
+    try:
+        return int(user_id)
+    except (TypeError, ValueError):
+        raise _credentials_exception()
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """
+    Get the current authenticated user from JWT token
+    """
+    user_id = _token_user_id(credentials)
+    with span("user_lookup"):
+        user = AuthService(db).get_user_by_id(user_id)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
 
+    identity_cache.put(CurrentIdentity.from_user(user))
     return user
 
 
@@ -55,8 +80,56 @@ def get_current_approved_user(
     Get the current user and verify they are approved
     """
     if not current_user.is_approved:
+        raise _not_approved_exception()
+    return current_user
+
+
+def get_current_identity(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> CurrentIdentity:
+    """
+    Get the id, approval and admin state of the authenticated user.
+
+    Served from the identity cache when possible; the session from get_db
+    only opens a connection on a cache miss.
+    """
+    user_id = _token_user_id(credentials)
+    identity = identity_cache.get(user_id)
+    record_cache("auth_identity", identity is not None)
+    if identity is not None:
+        return identity
+
+    with span("user_lookup"):
+        row = db.query(User.id, User.is_approved, User.is_admin).filter(User.id == user_id).first()
+    if row is None:
+        raise _credentials_exception()
+
+    identity = CurrentIdentity(id=row.id, is_approved=bool(row.is_approved), is_admin=bool(row.is_admin))
+    identity_cache.put(identity)
+    return identity
+
+
+def get_current_approved_identity(
+    identity: CurrentIdentity = Depends(get_current_identity)
+) -> CurrentIdentity:
+    """
+    Get the current user's identity and verify they are approved
+    """
+    if not identity.is_approved:
+        raise _not_approved_exception()
+    return identity
+
+
+def get_current_admin_identity(
+    identity: CurrentIdentity = Depends(get_current_approved_identity)
+) -> CurrentIdentity:
+    """
+    Get the current user's identity and verify they are an administrator
+    """
+    if not identity.is_admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="User account is not approved. Please wait for admin approval."
+            detail="Administrator access required"
         )
-    return current_user
+    return identity
@@ -1,16 +1,28 @@
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
+from sqlalchemy.orm.exc import StaleDataError
+from contextlib import asynccontextmanager, suppress
+import anyio
+import asyncio
+import hmac
 import os
 from pathlib import Path
 
 from .api import v1_router
-from .database import engine, Base
+from .database import engine, Base, dispose_async_engine, warm_up_database
 from .config import get_settings
-from .utils.rate_limiter import limiter
+from .services.llm import llm_service
+from .utils import startup
+from .utils.auth import load_password_backend
+from .utils.rate_limiter import RateLimitHeadersMiddleware
+from .utils import db_maintenance
+from .utils.password_hashing import password_pool
+from .utils import metrics
+from .utils.tracing import OTLPExporter, TracingMiddleware
+from .utils.query_stats import QueryStatsMiddleware
+from .utils.response_compression import CompressionMiddleware
 
 settings = get_settings()
 
@@ -18,17 +30,60 @@ settings = get_settings()
 # NOTE: Using Alembic for migrations now
 # Base.metadata.create_all(bind=engine)
 
+
+# Components built lazily and warmed up by the startup phase
+startup.register_warmup("database", warm_up_database)
+startup.register_warmup("password_hashing", load_password_backend)
+startup.register_warmup("llm_clients", llm_service.warm_up)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up, start background maintenance on startup and clean up on shutdown."""
+    tasks = []
+    warmup = await startup.start(settings.startup_warmup)
+    if warmup is not None:
+        tasks.append(warmup)
+    if engine.dialect.name == "sqlite" and settings.sqlite_wal_checkpoint_interval > 0:
+        tasks.append(asyncio.create_task(
+            db_maintenance.run_periodic_checkpoint(engine, settings.sqlite_wal_checkpoint_interval)
+        ))
+    if settings.metrics_enabled:
+        tasks.append(asyncio.create_task(metrics.monitor_event_loop_lag()))
+        tasks.append(asyncio.create_task(
+            metrics.exporter.run_periodic_flush(settings.metrics_flush_interval)
+        ))
+
+    yield
+
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    metrics.exporter.remove()
+    await dispose_async_engine()
+    password_pool.shutdown()
+    db_maintenance.shutdown(engine)
+
+
 # Create FastAPI app
 app = FastAPI(
     title="DiksiAI API",
     description="AI-powered writing assistant for Indonesian language",
     version="0.1.0",
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
-# Add rate limiter state and exception handler
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# A versioned row (e.g. a chapter) was changed by another request between
+# being read and written
+@app.exception_handler(StaleDataError)
+async def stale_data_handler(request: Request, exc: StaleDataError):
+    return JSONResponse(
+        status_code=409,
+        content={"detail": "The resource was modified by another request. Reload and try again."},
+    )
 
 # CORS middleware for development
 app.add_middleware(
@@ -37,8 +92,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "ETag", "Retry-After", "X-RateLimit-Limit", "X-RateLimit-Remaining", "X-RateLimit-Reset",
+        "Server-Timing", "X-Request-ID",
+    ],
 )
 
+# X-RateLimit-* headers for rate limited endpoints
+app.add_middleware(RateLimitHeadersMiddleware)
+
+# Compress large responses (added after CORS so it wraps it)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.response_compression_min_size,
+    gzip_level=settings.response_gzip_level,
+    brotli_quality=settings.response_brotli_quality,
+)
+
+# Statements per request and likely N+1 queries
+app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=settings.db_n_plus_one_threshold)
+
+# Time every request for /metrics (wraps compression and CORS)
+if settings.metrics_enabled:
+    app.add_middleware(metrics.MetricsMiddleware)
+    metrics.register_queue(
+        "threadpool", lambda: int(anyio.to_thread.current_default_thread_limiter().borrowed_tokens)
+    )
+
+# Request ids, Server-Timing headers and trace records (outermost, so
+# the total covers every other middleware)
+if settings.tracing_enabled:
+    app.add_middleware(
+        TracingMiddleware,
+        exporter=OTLPExporter(settings.tracing_otlp_endpoint) if settings.tracing_otlp_endpoint else None,
+        log_records=settings.tracing_log_records,
+    )
+
 # Include API routers
 app.include_router(v1_router)
 
@@ -49,6 +138,28 @@ def health_check():
     return {"status": "healthy", "version": "0.1.0"}
 
 
+def _metrics_allowed(request: Request) -> bool:
+    """Allow scrapes carrying metrics_token, or direct ones from this host."""
+    if settings.metrics_token:
+        authorization = request.headers.get("Authorization", "")
+        return hmac.compare_digest(authorization, f"Bearer {settings.metrics_token}")
+    # Requests through the reverse proxy come from localhost too, but carry X-Forwarded-For
+    client_host = request.client.host if request.client else ""
+    return client_host in ("127.0.0.1", "::1") and "x-forwarded-for" not in request.headers
+
+
+# Prometheus metrics, merged across workers (unversioned, like the health check)
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint(request: Request):
+        # Async so queue depth callbacks can read the event loop's threadpool
+        if not _metrics_allowed(request):
+            return JSONResponse(status_code=403, content={"detail": "Forbidden"})
+        return PlainTextResponse(
+            metrics.exporter.render(), media_type="text/plain; version=0.0.4"
+        )
+
+
 # Legacy redirect support (optional - remove after frontend migration)
 # Uncomment if you need backward compatibility during migration
 # from fastapi.responses import RedirectResponse
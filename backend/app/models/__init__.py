@@ -7,6 +7,7 @@ This module exports all database models for easy importing.
 from .user import User
 from .project_model import Project
 from .chapter import Chapter
+from .chapter_revision import ChapterRevision
 from .user_settings import UserSettings
 
-__all__ = ["User", "Project", "Chapter", "UserSettings"]
+__all__ = ["User", "Project", "Chapter", "ChapterRevision", "UserSettings"]
@@ -2,24 +2,38 @@
 Chapter model for individual chapters within projects.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
+from .types import CompressedText
 
 
 class Chapter(Base):
     """Chapter model for individual chapters within a project."""
 
     __tablename__ = "chapters"
+    __table_args__ = (
+        # Serves both project_id lookups and chapter lists ordered by "order"
+        Index("ix_chapters_project_id_order", "project_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=True, default="")
+    # Compressed at rest; reads and writes see plain str
+    content = Column(CompressedText, nullable=True, default="")
     order = Column(Integer, nullable=False, default=0)
+    # Derived from content by ChapterRepository so outlines never read content
+    word_count = Column(Integer, nullable=False, default=0, server_default="0")
+    character_count = Column(Integer, nullable=False, default=0, server_default="0")
+    paragraph_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Incremented on every update; stale writes fail with StaleDataError
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
     project = relationship("Project", back_populates="chapters")
+
+    __mapper_args__ = {"version_id_col": version}
@@ -0,0 +1,36 @@
+"""
+Chapter revision model for content history.
+"""
+
+from sqlalchemy import Column, Integer, Boolean, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from ..database import Base
+from .types import CompressedText
+
+
+class ChapterRevision(Base):
+    """
+    A saved state of a chapter's content.
+
+    Revisions form a chain per chapter: a snapshot stores the full
+    content, and each following delta stores the edit operations (JSON)
+    from the previous revision. Content is rebuilt from the nearest
+    snapshot at or before the requested revision.
+    """
+
+    __tablename__ = "chapter_revisions"
+    __table_args__ = (
+        Index("ix_chapter_revisions_chapter_id_revision", "chapter_id", "revision", unique=True),
+        # On Postgres, migration a7c3e9f1b5d4 adds ix_chapter_revisions_snapshots,
+        # a partial index on (chapter_id, revision) WHERE is_snapshot
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    chapter_id = Column(Integer, ForeignKey("chapters.id", ondelete="CASCADE"), nullable=False)
+    revision = Column(Integer, nullable=False)  # Increasing per chapter; gaps after compaction
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    data = Column(CompressedText, nullable=False)
+    content_length = Column(Integer, nullable=False, default=0)
+    chapter_version = Column(Integer, nullable=True)  # Null for history captured before tracking
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -2,7 +2,7 @@
 Project model for writing manuscripts.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database import Base
@@ -12,14 +12,34 @@ class Project(Base):
     """Project/Manuscript model for organizing writing work."""
 
     __tablename__ = "projects"
+    __table_args__ = (
+        # Serves ownership checks and the per-user list ordered by updated_at
+        Index("ix_projects_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
+    # Totals over the project's chapters, adjusted by ChapterRepository on
+    # every chapter write so project lists never aggregate chapters
+    chapter_count = Column(Integer, nullable=False, default=0, server_default="0")
+    word_count = Column(Integer, nullable=False, default=0, server_default="0")
+    character_count = Column(Integer, nullable=False, default=0, server_default="0")
+    paragraph_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # Incremented on every update; used with chapter versions for ETags
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Set on insert too, so the list ordering and its cursors never see NULL
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="projects")
-    chapters = relationship("Chapter", back_populates="project", cascade="all, delete-orphan")
+    chapters = relationship(
+        "Chapter",
+        back_populates="project",
+        cascade="all, delete-orphan",
+        order_by="Chapter.order",
+    )
+
+    __mapper_args__ = {"version_id_col": version}
@@ -0,0 +1,57 @@
+"""
+Custom column types shared by the models.
+"""
+
+from functools import lru_cache
+
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from ..config import get_settings
+from ..utils.compression import compress_text, decompress_text, resolve_codec
+
+
+@lru_cache()
+def get_content_codec() -> tuple[int, int]:
+    """Get the configured (codec, min_size) for writing compressed text."""
+    settings = get_settings()
+    return resolve_codec(settings.content_compression), settings.content_compression_min_bytes
+
+
+class CompressedText(TypeDecorator):
+    """
+    Text stored compressed, behaving like a str column in Python.
+
+    Values are written with the configured codec and decompressed when a
+    row is loaded; see app.utils.compression for the stored format. On
+    SQLite the column keeps its TEXT declaration, since SQLite stores
+    BLOBs in TEXT columns as-is and legacy string rows keep working.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        codec, min_size = get_content_codec()
+        return compress_text(value, codec, min_size)
+
+    def process_result_value(self, value, dialect):
+        return decompress_text(value)
+
+
+class StoredBytes(TypeDecorator):
+    """
+    Raw access to a CompressedText column's stored value, without decoding.
+
+    Used for maintenance such as re-compression; legacy rows come back as str.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, (memoryview, bytearray)):
+            return bytes(value)
+        return value
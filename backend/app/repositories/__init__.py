@@ -1,4 +1,18 @@
 from .project import ProjectRepository
 from .chapter import ChapterRepository
+from .search import SearchRepository
+from .revision import RevisionRepository
+from .user_settings import UserSettingsRepository, AsyncUserSettingsRepository
+from .async_project import AsyncProjectRepository
+from .async_chapter import AsyncChapterRepository
 
-__all__ = ["ProjectRepository", "ChapterRepository"]
+__all__ = [
+    "ProjectRepository",
+    "ChapterRepository",
+    "SearchRepository",
+    "RevisionRepository",
+    "UserSettingsRepository",
+    "AsyncUserSettingsRepository",
+    "AsyncProjectRepository",
+    "AsyncChapterRepository",
+]
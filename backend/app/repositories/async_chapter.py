@@ -0,0 +1,95 @@
+"""
+Async chapter repository for database operations.
+
+This module provides the chapter reads of ChapterRepository for
+endpoints that run on the event loop with an AsyncSession. Writes go
+through ChapterRepository, which also maintains chapter statistics,
+project totals and revision history.
+"""
+
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+from ..models import Project, Chapter
+
+
+class AsyncChapterRepository:
+    """Async repository for Chapter database operations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(
+        self, chapter_id: int, project_id: int, user_id: int
+    ) -> Optional[Chapter]:
+        """
+        Get a chapter by ID with project ownership check.
+
+        Args:
+            chapter_id: The chapter ID
+            project_id: The project ID
+            user_id: The user ID (for ownership check)
+
+        Returns:
+            The Chapter or None if not found
+        """
+        result = await self.db.execute(
+            select(Chapter)
+            .join(Project)
+            .where(
+                Chapter.id == chapter_id,
+                Chapter.project_id == project_id,
+                Project.user_id == user_id
+            )
+        )
+        return result.scalars().first()
+
+    async def get_or_404(
+        self, chapter_id: int, project_id: int, user_id: int
+    ) -> Chapter:
+        """
+        Get a chapter by ID, raising 404 if not found.
+
+        Args:
+            chapter_id: The chapter ID
+            project_id: The project ID
+            user_id: The user ID (for ownership check)
+
+        Returns:
+            The Chapter
+
+        Raises:
+            HTTPException: 404 if chapter not found
+        """
+        chapter = await self.get_by_id(chapter_id, project_id, user_id)
+        if not chapter:
+            raise HTTPException(status_code=404, detail="Chapter not found")
+        return chapter
+
+    async def get_content(
+        self, chapter_id: int, project_id: int, user_id: int
+    ) -> Optional[str]:
+        """
+        Get a chapter's content with project ownership check, in one query.
+
+        Args:
+            chapter_id: The chapter ID
+            project_id: The project ID
+            user_id: The user ID (for ownership check)
+
+        Returns:
+            The chapter content ("" if empty), or None if not found
+        """
+        result = await self.db.execute(
+            select(Chapter.content)
+            .join(Project)
+            .where(
+                Chapter.id == chapter_id,
+                Chapter.project_id == project_id,
+                Project.user_id == user_id
+            )
+        )
+        row = result.first()
+        return None if row is None else (row.content or "")
@@ -0,0 +1,133 @@
+"""
+Async project repository for database operations.
+
+This module mirrors ProjectRepository for endpoints that run on the
+event loop with an AsyncSession. Relationships used in responses are
+eager-loaded because lazy loading is not available in async sessions.
+"""
+
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from fastapi import HTTPException
+
+from ..models import Project
+
+
+class AsyncProjectRepository:
+    """Async repository for Project database operations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_by_id(self, project_id: int, user_id: int) -> Optional[Project]:
+        """
+        Get a project by ID for a specific user, with its chapters loaded.
+
+        Args:
+            project_id: The project ID
+            user_id: The user ID (for ownership check)
+
+        Returns:
+            The Project or None if not found
+        """
+        result = await self.db.execute(
+            select(Project)
+            .options(selectinload(Project.chapters))
+            .where(Project.id == project_id, Project.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def get_or_404(self, project_id: int, user_id: int) -> Project:
+        """
+        Get a project by ID for a specific user, raising 404 if not found.
+
+        Args:
+            project_id: The project ID
+            user_id: The user ID (for ownership check)
+
+        Returns:
+            The Project
+
+        Raises:
+            HTTPException: 404 if project not found
+        """
+        project = await self.get_by_id(project_id, user_id)
+        if not project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return project
+
+    async def list_for_user(self, user_id: int) -> list[Project]:
+        """
+        List all projects for a user.
+
+        Chapter counts and other totals are stored on the project, so
+        no chapter rows are read.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            List of Projects, most recently updated first
+        """
+        result = await self.db.execute(
+            select(Project)
+            .where(Project.user_id == user_id)
+            .order_by(Project.updated_at.desc())
+        )
+        return list(result.scalars().all())
+
+    async def create(self, user_id: int, auto_commit: bool = True, **data) -> Project:
+        """
+        Create a new project.
+
+        Args:
+            user_id: The user ID
+            auto_commit: Whether to commit immediately (default: True)
+            **data: Project data (title, description, etc.)
+
+        Returns:
+            The created Project
+        """
+        project = Project(user_id=user_id, chapters=[], **data)
+        self.db.add(project)
+        if auto_commit:
+            await self.db.commit()
+            await self.db.refresh(project, ["chapters"])
+        else:
+            await self.db.flush()  # Get ID without committing
+        return project
+
+    async def update(self, project: Project, auto_commit: bool = True, **data) -> Project:
+        """
+        Update a project.
+
+        Args:
+            project: The project to update
+            auto_commit: Whether to commit immediately (default: True)
+            **data: Fields to update
+
+        Returns:
+            The updated Project
+        """
+        for key, value in data.items():
+            setattr(project, key, value)
+        if auto_commit:
+            await self.db.commit()
+            await self.db.refresh(project)
+        else:
+            await self.db.flush()
+        return project
+
+    async def delete(self, project: Project, auto_commit: bool = True) -> None:
+        """
+        Delete a project.
+
+        Args:
+            project: The project to delete
+            auto_commit: Whether to commit immediately (default: True)
+        """
+        await self.db.delete(project)
+        if auto_commit:
+            await self.db.commit()
@@ -5,11 +5,44 @@ This module provides a repository class for managing Chapter entities,
 encapsulating all database queries related to chapters.
 """
 
-from typing import Optional
-from sqlalchemy.orm import Session
+from itertools import islice
+from typing import Iterable, Optional, Sequence
+from sqlalchemy import and_, bindparam, or_, delete, func, insert, select, type_coerce, update
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session, load_only
 from fastapi import HTTPException
 
 from ..models import Project, Chapter
+from ..models.types import StoredBytes, get_content_codec
+from ..constants import MAX_CONTENT_LENGTH
+from ..utils.compression import compress_text, decompress_text
+from ..utils.text import content_stats
+from ..utils.text_ops import apply_text_ops, TextOpsError
+from .project import ProjectRepository
+from .revision import RevisionRepository
+from .search import SearchRepository
+
+BULK_INSERT_BATCH_SIZE = 50
+STATS_COLUMNS = ("word_count", "character_count", "paragraph_count")
+_NO_STATS = dict.fromkeys(STATS_COLUMNS, 0)
+
+
+def _stats_columns(content: Optional[str]) -> dict:
+    """Chapter statistics columns for the given content."""
+    return dict(zip(STATS_COLUMNS, content_stats(content)))
+
+
+def _stats_delta(
+    project_repo: ProjectRepository, project_id: int, old: dict, new: dict, chapters: int = 0
+) -> None:
+    """Apply the change from old to new chapter statistics to the project totals."""
+    project_repo.adjust_stats(
+        project_id,
+        chapters=chapters,
+        words=new["word_count"] - old["word_count"],
+        characters=new["character_count"] - old["character_count"],
+        paragraphs=new["paragraph_count"] - old["paragraph_count"],
+    )
 
 
 class ChapterRepository:
@@ -65,6 +98,95 @@ class ChapterRepository:
             raise HTTPException(status_code=404, detail="Chapter not found")
         return chapter
 
+    def get_version(self, chapter_id: int, project_id: int, user_id: int) -> Optional[int]:
+        """
+        Get a chapter's version with project ownership check, without loading content.
+
+        Args:
+            chapter_id: The chapter ID
+            project_id: The project ID
+            user_id: The user ID (for ownership check)
+
+        Returns:
+            The chapter version or None if not found
+        """
+        return self.db.execute(
+            select(Chapter.version)
+            .join(Project)
+            .where(
+                Chapter.id == chapter_id,
+                Chapter.project_id == project_id,
+                Project.user_id == user_id
+            )
+        ).scalar_one_or_none()
+
+    def list_outline(self, project_id: int) -> list[Chapter]:
+        """
+        List a project's chapters in order, without loading their content.
+
+        The caller is responsible for checking project ownership.
+
+        Args:
+            project_id: The project ID
+
+        Returns:
+            List of Chapters with only outline columns loaded
+        """
+        return list(
+            self.db.execute(
+                select(Chapter)
+                .options(load_only(
+                    Chapter.id, Chapter.project_id, Chapter.title, Chapter.order,
+                    Chapter.word_count, Chapter.character_count, Chapter.paragraph_count,
+                    Chapter.version, Chapter.updated_at,
+                    raiseload=True,
+                ))
+                .where(Chapter.project_id == project_id)
+                .order_by(Chapter.order, Chapter.id)
+            ).scalars()
+        )
+
+    def list_page(
+        self,
+        project_id: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        columns: Sequence[str] = ("id", "title", "order"),
+    ) -> tuple[list[Row], bool]:
+        """
+        List one page of a project's chapters in order, keyed on (order, id).
+
+        The caller is responsible for checking project ownership. If the
+        after_id chapter has since been deleted, the page is empty.
+
+        Args:
+            project_id: The project ID
+            limit: Maximum number of chapters to return
+            after_id: ID of the last chapter of the previous page, if any
+            columns: Chapter columns to load (never content)
+
+        Returns:
+            (rows with the requested columns, whether more chapters follow)
+        """
+        query = (
+            select(*(getattr(Chapter, name) for name in columns))
+            .where(Chapter.project_id == project_id)
+            .order_by(Chapter.order, Chapter.id)
+            .limit(limit + 1)
+        )
+        if after_id is not None:
+            anchor = (
+                select(Chapter.order)
+                .where(Chapter.id == after_id, Chapter.project_id == project_id)
+                .scalar_subquery()
+            )
+            query = query.where(or_(
+                Chapter.order > anchor,
+                and_(Chapter.order == anchor, Chapter.id > after_id),
+            ))
+        rows = list(self.db.execute(query).all())
+        return rows[:limit], len(rows) > limit
+
     def create(self, project_id: int, auto_commit: bool = True, **data) -> Chapter:
         """
         Create a new chapter.
@@ -77,19 +199,170 @@ class ChapterRepository:
         Returns:
             The created Chapter
         """
-        chapter = Chapter(project_id=project_id, **data)
+        stats = _stats_columns(data.get("content"))
+        chapter = Chapter(project_id=project_id, **stats, **data)
         self.db.add(chapter)
+        self.db.flush()  # Get ID for the first revision
+        _stats_delta(ProjectRepository(self.db), project_id, _NO_STATS, stats, chapters=1)
+        if chapter.content:
+            RevisionRepository(self.db).record(chapter)
         if auto_commit:
             self.db.commit()
             self.db.refresh(chapter)
-        else:
-            self.db.flush()  # Get ID without committing
         return chapter
 
+    def bulk_create(
+        self,
+        project_id: int,
+        chapters: Iterable[dict],
+        batch_size: int = BULK_INSERT_BATCH_SIZE,
+        auto_commit: bool = True,
+    ) -> list[int]:
+        """
+        Append many chapters to a project using batched INSERT statements.
+
+        Chapters are consumed lazily and inserted batch_size at a time in
+        one transaction, instead of one ORM flush per chapter. Bulk
+        inserts bypass the ORM hooks, so statistics, project totals, the
+        search index and first revisions are written here.
+
+        Args:
+            project_id: The project ID (ownership must already be checked)
+            chapters: Dicts with the title and content of each chapter, in order
+            batch_size: Number of chapters per INSERT
+            auto_commit: Whether to commit once all chapters are inserted (default: True)
+
+        Returns:
+            IDs of the created chapters, in order
+        """
+        next_order = self.db.execute(
+            select(func.coalesce(func.max(Chapter.order) + 1, 0)).where(Chapter.project_id == project_id)
+        ).scalar_one()
+        statement = insert(Chapter).returning(Chapter.id, sort_by_parameter_order=True)
+
+        chapter_ids: list[int] = []
+        chapters = iter(chapters)
+        while batch := list(islice(chapters, batch_size)):
+            rows = [
+                {
+                    "project_id": project_id,
+                    "title": chapter["title"],
+                    "content": chapter.get("content") or "",
+                    "order": next_order + index,
+                    "version": 1,
+                    **_stats_columns(chapter.get("content")),
+                }
+                for index, chapter in enumerate(batch)
+            ]
+            ids = list(self.db.scalars(statement, rows))
+            for row, chapter_id in zip(rows, ids):
+                row["id"] = chapter_id
+            SearchRepository(self.db).index_chapters(rows)
+            RevisionRepository(self.db).record_initial([(row["id"], row["content"]) for row in rows])
+            totals = {column: sum(row[column] for row in rows) for column in STATS_COLUMNS}
+            _stats_delta(ProjectRepository(self.db), project_id, _NO_STATS, totals, chapters=len(rows))
+            chapter_ids.extend(ids)
+            next_order += len(batch)
+
+        if auto_commit:
+            self.db.commit()
+        return chapter_ids
+
+    def apply_batch(
+        self, project_id: int, mutations: list[dict], auto_commit: bool = True
+    ) -> tuple[int, int]:
+        """
+        Apply order/title changes and deletions to many chapters of a project.
+
+        Chapters are checked with one query, which locks their rows until
+        the transaction ends so no other write can land between the
+        version check and the changes (SQLite serializes writers anyway),
+        then changed with one executemany UPDATE per combination of
+        changed fields and one DELETE. Updated chapters get a new version. Bulk statements
+        bypass the ORM hooks, so the search index, revision history and
+        project totals are maintained here.
+
+        Args:
+            project_id: The project ID (ownership must already be checked)
+            mutations: Dicts with the chapter id and any of order, title,
+                delete (bool) and version (expected current version)
+            auto_commit: Whether to commit immediately (default: True)
+
+        Returns:
+            (chapters updated, chapters deleted)
+
+        Raises:
+            HTTPException: 422 if a chapter appears twice, 404 if a chapter
+                is not in the project, 409 if a chapter's version differs
+                from the expected one
+        """
+        chapter_ids = [mutation["id"] for mutation in mutations]
+        if len(set(chapter_ids)) != len(chapter_ids):
+            raise HTTPException(status_code=422, detail="Each chapter may only appear once per batch")
+
+        found = {
+            row.id: row for row in self.db.execute(
+                select(Chapter.id, Chapter.version, *(getattr(Chapter, column) for column in STATS_COLUMNS))
+                .where(Chapter.project_id == project_id, Chapter.id.in_(chapter_ids))
+                .order_by(Chapter.id)
+                .with_for_update()
+            )
+        }
+        versions = {chapter_id: row.version for chapter_id, row in found.items()}
+        missing = [chapter_id for chapter_id in chapter_ids if chapter_id not in versions]
+        if missing:
+            raise HTTPException(status_code=404, detail=f"Chapters not found: {missing}")
+        stale = [
+            mutation["id"] for mutation in mutations
+            if mutation.get("version") is not None and mutation["version"] != versions[mutation["id"]]
+        ]
+        if stale:
+            raise HTTPException(status_code=409, detail=f"Chapters have changed: {stale}")
+
+        table = Chapter.__table__
+        deleted = [mutation["id"] for mutation in mutations if mutation.get("delete")]
+        updates: dict[tuple[str, ...], list[dict]] = {}
+        for mutation in mutations:
+            fields = tuple(field for field in ("order", "title") if mutation.get(field) is not None)
+            if fields and not mutation.get("delete"):
+                params = {"chapter_id": mutation["id"]}
+                params.update({f"new_{field}": mutation[field] for field in fields})
+                updates.setdefault(fields, []).append(params)
+
+        for fields, params in updates.items():
+            self.db.execute(
+                update(table)
+                .where(table.c.id == bindparam("chapter_id"))
+                .values(
+                    version=table.c.version + 1,
+                    updated_at=func.now(),
+                    **{field: bindparam(f"new_{field}") for field in fields},
+                ),
+                params,
+            )
+            if "title" in fields:
+                SearchRepository(self.db).update_titles(
+                    [{"id": p["chapter_id"], "title": p["new_title"]} for p in params]
+                )
+
+        if deleted:
+            RevisionRepository(self.db).delete_for_chapters(deleted)
+            SearchRepository(self.db).unindex_chapters(deleted)
+            self.db.execute(delete(table).where(table.c.id.in_(deleted)))
+            removed = {column: sum(getattr(found[i], column) for i in deleted) for column in STATS_COLUMNS}
+            _stats_delta(ProjectRepository(self.db), project_id, removed, _NO_STATS, chapters=-len(deleted))
+
+        if auto_commit:
+            self.db.commit()
+        return sum(len(params) for params in updates.values()), len(deleted)
+
     def update(self, chapter: Chapter, auto_commit: bool = True, **data) -> Chapter:
         """
         Update a chapter.
 
+        Content changes are recorded in the chapter's revision history,
+        and the chapter's statistics and its project's totals updated.
+
         Args:
             chapter: The chapter to update
             auto_commit: Whether to commit immediately (default: True)
@@ -98,15 +371,65 @@ class ChapterRepository:
         Returns:
             The updated Chapter
         """
+        content_changed = "content" in data
+        if content_changed:
+            # Content is deferred and compressed; only load it when replacing it
+            previous_content = chapter.content
+            previous_saved_at = chapter.updated_at or chapter.created_at
         for key, value in data.items():
             setattr(chapter, key, value)
+        if content_changed:
+            old_stats = {column: getattr(chapter, column) for column in STATS_COLUMNS}
+            new_stats = _stats_columns(data["content"])
+            for column, value in new_stats.items():
+                setattr(chapter, column, value)
+            _stats_delta(ProjectRepository(self.db), chapter.project_id, old_stats, new_stats)
+        self.db.flush()
+        if content_changed and chapter.content != previous_content:
+            RevisionRepository(self.db).record(chapter, previous_content, previous_saved_at)
         if auto_commit:
             self.db.commit()
             self.db.refresh(chapter)
-        else:
-            self.db.flush()
         return chapter
 
+    def apply_patch(
+        self, chapter: Chapter, base_version: int, ops: list[dict], auto_commit: bool = True
+    ) -> Chapter:
+        """
+        Apply text edit operations to a chapter's content.
+
+        Args:
+            chapter: The chapter to update
+            base_version: The version the operations were computed against
+            ops: List of retain/insert/delete operations
+            auto_commit: Whether to commit immediately (default: True)
+
+        Returns:
+            The updated Chapter, with its version incremented
+
+        Raises:
+            HTTPException: 409 if base_version is not the current version,
+                422 if the operations don't apply to the current content
+        """
+        if chapter.version != base_version:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Chapter has changed (current version {chapter.version})"
+            )
+
+        try:
+            content = apply_text_ops(chapter.content or "", ops)
+        except TextOpsError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        if len(content) > MAX_CONTENT_LENGTH:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Chapter content exceeds {MAX_CONTENT_LENGTH} characters"
+            )
+
+        return self.update(chapter, auto_commit=auto_commit, content=content)
+
     def delete(self, chapter: Chapter, auto_commit: bool = True) -> None:
         """
         Delete a chapter.
@@ -115,6 +438,109 @@ class ChapterRepository:
             chapter: The chapter to delete
             auto_commit: Whether to commit immediately (default: True)
         """
+        old_stats = {column: getattr(chapter, column) for column in STATS_COLUMNS}
+        _stats_delta(ProjectRepository(self.db), chapter.project_id, old_stats, _NO_STATS, chapters=-1)
         self.db.delete(chapter)
         if auto_commit:
             self.db.commit()
+
+    def recompress(self, batch_size: int = 200) -> tuple[int, int]:
+        """
+        Rewrite stored chapter content with the configured codec.
+
+        Works in batches committed separately, so it can run alongside the
+        application. Content and versions are unchanged; only rows whose
+        stored encoding differs are written.
+
+        Args:
+            batch_size: Number of chapters read per batch
+
+        Returns:
+            (chapters scanned, chapters rewritten)
+        """
+        codec, min_size = get_content_codec()
+        table = Chapter.__table__
+        stored = type_coerce(table.c.content, StoredBytes).label("content")
+        rewrite = (
+            update(table)
+            .where(table.c.id == bindparam("chapter_id"))
+            .values(content=bindparam("data", type_=StoredBytes))
+        )
+
+        scanned = rewritten = 0
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                select(table.c.id, stored)
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            changes = []
+            for chapter_id, raw in rows:
+                if raw is None:
+                    continue
+                data = compress_text(decompress_text(raw), codec, min_size)
+                if data != raw:
+                    changes.append({"chapter_id": chapter_id, "data": data})
+            if changes:
+                self.db.execute(rewrite, changes)
+            self.db.commit()
+
+            scanned += len(rows)
+            rewritten += len(changes)
+            last_id = rows[-1][0]
+
+        return scanned, rewritten
+
+    def backfill_stats(self, batch_size: int = 200) -> tuple[int, int]:
+        """
+        Recompute stored chapter statistics from content, then project totals.
+
+        Works in batches committed separately, like recompress(). Only
+        chapters whose statistics changed are written; versions are
+        unchanged.
+
+        Args:
+            batch_size: Number of chapters read per batch
+
+        Returns:
+            (chapters scanned, chapters updated)
+        """
+        table = Chapter.__table__
+        rewrite = (
+            update(table)
+            .where(table.c.id == bindparam("chapter_id"))
+            .values({column: bindparam(f"new_{column}") for column in STATS_COLUMNS})
+        )
+
+        scanned = updated = 0
+        last_id = 0
+        while True:
+            rows = self.db.execute(
+                select(table.c.id, table.c.content, *(table.c[column] for column in STATS_COLUMNS))
+                .where(table.c.id > last_id)
+                .order_by(table.c.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+
+            changes = []
+            for row in rows:
+                stats = _stats_columns(row.content)
+                if any(stats[column] != getattr(row, column) for column in STATS_COLUMNS):
+                    changes.append({"chapter_id": row.id, **{f"new_{c}": v for c, v in stats.items()}})
+            if changes:
+                self.db.execute(rewrite, changes)
+            self.db.commit()
+
+            scanned += len(rows)
+            updated += len(changes)
+            last_id = rows[-1].id
+
+        ProjectRepository(self.db).refresh_stats()
+        return scanned, updated
@@ -5,12 +5,15 @@ This module provides a repository class for managing Project entities,
 encapsulating all database queries related to projects.
 """
 
-from typing import Optional
+from typing import Optional, Sequence
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, delete, func, or_, select, update
 from fastapi import HTTPException
 
 from ..models import Project, Chapter
+from .revision import RevisionRepository
+from .search import SearchRepository
 
 
 class ProjectRepository:
@@ -54,36 +57,156 @@ class ProjectRepository:
             raise HTTPException(status_code=404, detail="Project not found")
         return project
 
-    def list_for_user(self, user_id: int) -> list[tuple[Project, int]]:
+    def get_version_vector(
+        self, project_id: int, user_id: int
+    ) -> Optional[tuple[int, list[tuple[int, int]]]]:
         """
-        List all projects for a user with chapter counts.
+        Get a project's version and its chapters' versions, without content.
 
         Args:
-            user_id: The user ID
+            project_id: The project ID
+            user_id: The user ID (for ownership check)
 
         Returns:
-            List of (Project, chapter_count) tuples
+            (project_version, [(chapter_id, chapter_version), ...]),
+            or None if the project is not found
         """
-        chapter_count_subquery = (
-            self.db.query(
-                Chapter.project_id,
-                func.count(Chapter.id).label("chapter_count")
-            )
-            .group_by(Chapter.project_id)
-            .subquery()
-        )
+        rows = self.db.execute(
+            select(Project.version, Chapter.id, Chapter.version)
+            .outerjoin(Chapter, Chapter.project_id == Project.id)
+            .where(Project.id == project_id, Project.user_id == user_id)
+        ).all()
+        if not rows:
+            return None
+        return rows[0][0], [(chapter_id, version) for _, chapter_id, version in rows if chapter_id is not None]
+
+    def list_for_user(self, user_id: int) -> list[Project]:
+        """
+        List all projects for a user.
+
+        Chapter counts and other totals are stored on the project, so
+        no chapter rows are read.
+
+        Args:
+            user_id: The user ID
 
+        Returns:
+            List of Projects, most recently updated first
+        """
         return (
-            self.db.query(
-                Project,
-                func.coalesce(chapter_count_subquery.c.chapter_count, 0).label("chapter_count")
-            )
-            .outerjoin(chapter_count_subquery, Project.id == chapter_count_subquery.c.project_id)
+            self.db.query(Project)
             .filter(Project.user_id == user_id)
             .order_by(Project.updated_at.desc())
             .all()
         )
 
+    def list_page_for_user(
+        self,
+        user_id: int,
+        limit: int,
+        after_id: Optional[int] = None,
+        columns: Sequence[str] = ("id", "title"),
+    ) -> tuple[list[Row], bool]:
+        """
+        List one page of a user's projects, most recently updated first.
+
+        Pages are keyed on (updated_at, id) rather than an offset, so each
+        page costs the same however deep it is. The position is taken from
+        the stored values of the after_id project; if that project has
+        since been deleted, the page is empty.
+
+        Args:
+            user_id: The user ID
+            limit: Maximum number of projects to return
+            after_id: ID of the last project of the previous page, if any
+            columns: Project columns to load
+
+        Returns:
+            (rows with the requested columns, whether more projects follow)
+        """
+        query = (
+            select(*(getattr(Project, name) for name in columns))
+            .where(Project.user_id == user_id)
+            .order_by(Project.updated_at.desc(), Project.id.desc())
+            .limit(limit + 1)
+        )
+        if after_id is not None:
+            anchor = (
+                select(Project.updated_at)
+                .where(Project.id == after_id, Project.user_id == user_id)
+                .scalar_subquery()
+            )
+            query = query.where(or_(
+                Project.updated_at < anchor,
+                and_(Project.updated_at == anchor, Project.id < after_id),
+            ))
+        rows = list(self.db.execute(query).all())
+        return rows[:limit], len(rows) > limit
+
+    def adjust_stats(
+        self,
+        project_id: int,
+        chapters: int = 0,
+        words: int = 0,
+        characters: int = 0,
+        paragraphs: int = 0,
+    ) -> None:
+        """
+        Add deltas to a project's chapter totals.
+
+        Applied as an in-place UPDATE, so concurrent chapter writes don't
+        overwrite each other's changes and the project's version is not
+        bumped.
+
+        Args:
+            project_id: The project ID
+            chapters: Change in the number of chapters
+            words: Change in the word count
+            characters: Change in the character count
+            paragraphs: Change in the paragraph count
+        """
+        if not (chapters or words or characters or paragraphs):
+            return
+        table = Project.__table__
+        self.db.execute(
+            update(table)
+            .where(table.c.id == project_id)
+            .values(
+                chapter_count=table.c.chapter_count + chapters,
+                word_count=table.c.word_count + words,
+                character_count=table.c.character_count + characters,
+                paragraph_count=table.c.paragraph_count + paragraphs,
+            )
+        )
+
+    def refresh_stats(self, auto_commit: bool = True) -> None:
+        """
+        Recompute every project's totals from its chapters' stored statistics.
+
+        Args:
+            auto_commit: Whether to commit immediately (default: True)
+        """
+        table = Project.__table__
+        chapters = Chapter.__table__
+
+        def total(column):
+            return (
+                select(func.coalesce(func.sum(column), 0))
+                .where(chapters.c.project_id == table.c.id)
+                .scalar_subquery()
+            )
+
+        self.db.execute(
+            update(table).values(
+                chapter_count=select(func.count()).where(chapters.c.project_id == table.c.id).scalar_subquery(),
+                word_count=total(chapters.c.word_count),
+                character_count=total(chapters.c.character_count),
+                paragraph_count=total(chapters.c.paragraph_count),
+            )
+        )
+        if auto_commit:
+            self.db.commit()
+
     def create(self, user_id: int, auto_commit: bool = True, **data) -> Project:
         """
         Create a new project.
@@ -130,10 +253,21 @@ class ProjectRepository:
         """
         Delete a project.
 
+        The chapters, their revision history and search index entries are
+        removed with one statement each rather than through the ORM
+        cascade, which deletes them one chapter at a time.
+
         Args:
             project: The project to delete
             auto_commit: Whether to commit immediately (default: True)
         """
+        chapter_ids = list(self.db.scalars(select(Chapter.id).where(Chapter.project_id == project.id)))
+        if chapter_ids:
+            RevisionRepository(self.db).delete_for_chapters(chapter_ids)
+            SearchRepository(self.db).unindex_chapters(chapter_ids)
+            self.db.execute(delete(Chapter).where(Chapter.project_id == project.id))
+        # Nothing left for the cascade to delete
+        self.db.expire(project, ["chapters"])
         self.db.delete(project)
         if auto_commit:
             self.db.commit()
@@ -0,0 +1,376 @@
+"""
+Revision repository for chapter content history.
+
+Each chapter has a chain of revisions: periodic full snapshots with
+compact deltas (JSON edit operations from app.utils.text_ops) in
+between. Saves within a time window are coalesced into one revision,
+the number of deltas between snapshots is capped so any revision is
+rebuilt in bounded time, and compaction thins out old revisions.
+"""
+
+import json
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.orm import Session, load_only
+from fastapi import HTTPException
+
+from ..config import get_settings
+from ..models import Chapter, ChapterRevision
+from ..utils.text_ops import apply_text_ops, diff_text_ops
+
+# A delta larger than this fraction of the content is stored as a snapshot
+MAX_DELTA_RATIO = 0.5
+
+_SUMMARY_COLUMNS = (
+    ChapterRevision.id, ChapterRevision.chapter_id, ChapterRevision.revision,
+    ChapterRevision.is_snapshot, ChapterRevision.content_length,
+    ChapterRevision.chapter_version, ChapterRevision.created_at, ChapterRevision.updated_at,
+)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite returns naive timestamps, which are stored in UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _encode(base: Optional[str], content: str) -> tuple[bool, str]:
+    """Encode content as a delta from base, or as a snapshot if that is smaller."""
+    if base is None:
+        return True, content
+    data = json.dumps(diff_text_ops(base, content), ensure_ascii=False, separators=(",", ":"))
+    if len(data) > MAX_DELTA_RATIO * len(content):
+        return True, content
+    return False, data
+
+
+class RevisionRepository:
+    """Repository for ChapterRevision database operations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        settings = get_settings()
+        self.window = timedelta(seconds=settings.revision_window_seconds)
+        self.snapshot_interval = settings.revision_snapshot_interval
+
+    def latest(self, chapter_id: int) -> Optional[ChapterRevision]:
+        """
+        Get a chapter's most recent revision.
+
+        Args:
+            chapter_id: The chapter ID
+
+        Returns:
+            The ChapterRevision or None if the chapter has no history
+        """
+        return self.db.execute(
+            select(ChapterRevision)
+            .where(ChapterRevision.chapter_id == chapter_id)
+            .order_by(ChapterRevision.revision.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+
+    def list_for_chapter(
+        self, chapter_id: int, limit: int, offset: int = 0
+    ) -> tuple[int, list[ChapterRevision]]:
+        """
+        List a chapter's revisions, newest first, without their data.
+
+        Args:
+            chapter_id: The chapter ID
+            limit: Maximum number of revisions to return
+            offset: Number of revisions to skip
+
+        Returns:
+            (total revision count, revisions)
+        """
+        total = self.db.execute(
+            select(func.count(ChapterRevision.id)).where(ChapterRevision.chapter_id == chapter_id)
+        ).scalar_one()
+        revisions = self.db.execute(
+            select(ChapterRevision)
+            .options(load_only(*_SUMMARY_COLUMNS, raiseload=True))
+            .where(ChapterRevision.chapter_id == chapter_id)
+            .order_by(ChapterRevision.revision.desc())
+            .limit(limit)
+            .offset(offset)
+        ).scalars().all()
+        return total, list(revisions)
+
+    def get_or_404(self, chapter_id: int, revision: int) -> ChapterRevision:
+        """
+        Get a revision's metadata, raising 404 if not found.
+
+        Args:
+            chapter_id: The chapter ID
+            revision: The revision number
+
+        Returns:
+            The ChapterRevision, without its data loaded
+
+        Raises:
+            HTTPException: 404 if the revision does not exist
+        """
+        found = self.db.execute(
+            select(ChapterRevision)
+            .options(load_only(*_SUMMARY_COLUMNS, raiseload=True))
+            .where(ChapterRevision.chapter_id == chapter_id, ChapterRevision.revision == revision)
+        ).scalar_one_or_none()
+        if not found:
+            raise HTTPException(status_code=404, detail="Revision not found")
+        return found
+
+    def get_previous_number(self, chapter_id: int, revision: int) -> Optional[int]:
+        """
+        Get the number of the revision before the given one.
+
+        Args:
+            chapter_id: The chapter ID
+            revision: The revision number
+
+        Returns:
+            The previous revision number, or None for the first revision
+        """
+        return self.db.execute(
+            select(func.max(ChapterRevision.revision))
+            .where(ChapterRevision.chapter_id == chapter_id, ChapterRevision.revision < revision)
+        ).scalar_one()
+
+    def get_text(self, chapter_id: int, revision: int) -> str:
+        """
+        Rebuild a revision's content from its nearest snapshot.
+
+        Reads at most revision_snapshot_interval deltas.
+
+        Args:
+            chapter_id: The chapter ID
+            revision: The revision number
+
+        Returns:
+            The chapter content at that revision
+
+        Raises:
+            HTTPException: 404 if the revision does not exist
+        """
+        snapshot = (
+            select(func.max(ChapterRevision.revision))
+            .where(
+                ChapterRevision.chapter_id == chapter_id,
+                # Bare column rather than IS TRUE, so Postgres can match
+                # the partial ix_chapter_revisions_snapshots index
+                ChapterRevision.is_snapshot,
+                ChapterRevision.revision <= revision,
+            )
+            .scalar_subquery()
+        )
+        rows = self.db.execute(
+            select(ChapterRevision.revision, ChapterRevision.is_snapshot, ChapterRevision.data)
+            .where(
+                ChapterRevision.chapter_id == chapter_id,
+                ChapterRevision.revision >= snapshot,
+                ChapterRevision.revision <= revision,
+            )
+            .order_by(ChapterRevision.revision)
+        ).all()
+        if not rows or rows[-1].revision != revision:
+            raise HTTPException(status_code=404, detail="Revision not found")
+
+        content = ""
+        for row in rows:
+            content = row.data if row.is_snapshot else apply_text_ops(content, json.loads(row.data))
+        return content
+
+    def _deltas_since_snapshot(self, chapter_id: int) -> int:
+        last_snapshot = (
+            select(func.max(ChapterRevision.revision))
+            .where(ChapterRevision.chapter_id == chapter_id, ChapterRevision.is_snapshot)
+            .scalar_subquery()
+        )
+        return self.db.execute(
+            select(func.count(ChapterRevision.id))
+            .where(ChapterRevision.chapter_id == chapter_id, ChapterRevision.revision > last_snapshot)
+        ).scalar_one()
+
+    def record(
+        self,
+        chapter: Chapter,
+        previous_content: Optional[str] = None,
+        previous_saved_at: Optional[datetime] = None,
+    ) -> ChapterRevision:
+        """
+        Record a chapter's current content in its history.
+
+        A save within revision_window_seconds of the latest revision
+        replaces that revision instead of adding one. For chapters
+        without history, previous_content is kept as the first revision
+        so the pre-edit text can be recovered.
+
+        Args:
+            chapter: The chapter, already flushed with its new content
+            previous_content: The content before this save
+            previous_saved_at: When previous_content was saved
+
+        Returns:
+            The new or updated ChapterRevision
+        """
+        content = chapter.content or ""
+        now = datetime.now(timezone.utc)
+        latest = self.latest(chapter.id)
+
+        if latest is None and previous_content and previous_content != content:
+            latest = ChapterRevision(
+                chapter_id=chapter.id, revision=1, is_snapshot=True, data=previous_content,
+                content_length=len(previous_content), created_at=previous_saved_at or now,
+            )
+            self.db.add(latest)
+            self.db.flush()
+
+        if latest is not None and now - _as_utc(latest.created_at) < self.window:
+            previous = self.get_previous_number(chapter.id, latest.revision)
+            base = None if latest.is_snapshot or previous is None else self.get_text(chapter.id, previous)
+            latest.is_snapshot, latest.data = _encode(base, content)
+            latest.content_length = len(content)
+            latest.chapter_version = chapter.version
+            self.db.flush()
+            return latest
+
+        base = None
+        if latest is not None and self._deltas_since_snapshot(chapter.id) < self.snapshot_interval:
+            base = self.get_text(chapter.id, latest.revision)
+        is_snapshot, data = _encode(base, content)
+        revision = ChapterRevision(
+            chapter_id=chapter.id,
+            revision=latest.revision + 1 if latest else 1,
+            is_snapshot=is_snapshot,
+            data=data,
+            content_length=len(content),
+            chapter_version=chapter.version,
+            created_at=now,
+        )
+        self.db.add(revision)
+        self.db.flush()
+        return revision
+
+    def record_initial(self, chapters: list[tuple[int, str]]) -> None:
+        """
+        Record the first revision of newly inserted chapters in one statement.
+
+        For chapters inserted with bulk statements, which don't go
+        through record().
+
+        Args:
+            chapters: (chapter ID, content) pairs; empty content is skipped
+        """
+        rows = [
+            {
+                "chapter_id": chapter_id, "revision": 1, "is_snapshot": True, "data": content,
+                "content_length": len(content), "chapter_version": 1,
+            }
+            for chapter_id, content in chapters if content
+        ]
+        if rows:
+            self.db.execute(insert(ChapterRevision), rows)
+
+    def delete_for_chapters(self, chapter_ids: list[int]) -> None:
+        """
+        Delete the history of chapters deleted with bulk statements.
+
+        Args:
+            chapter_ids: IDs of the deleted chapters
+        """
+        if chapter_ids:
+            self.db.execute(delete(ChapterRevision).where(ChapterRevision.chapter_id.in_(chapter_ids)))
+
+    def compact(self, keep_all_days: Optional[int] = None) -> tuple[int, int]:
+        """
+        Apply the retention policy to all chapters.
+
+        Revisions newer than keep_all_days are kept, as is each chapter's
+        latest revision; older ones are thinned to the last revision of
+        each day. Remaining revisions are re-encoded so every chain still
+        rebuilds. Each chapter is committed separately.
+
+        Args:
+            keep_all_days: Days of full history to keep
+                (default: revision_keep_all_days setting)
+
+        Returns:
+            (chapters compacted, revisions removed)
+        """
+        if keep_all_days is None:
+            keep_all_days = get_settings().revision_keep_all_days
+        cutoff = datetime.now(timezone.utc) - timedelta(days=keep_all_days)
+
+        chapter_ids = self.db.execute(
+            select(ChapterRevision.chapter_id)
+            .where(ChapterRevision.created_at < cutoff)
+            .distinct()
+        ).scalars().all()
+
+        chapters = removed = 0
+        for chapter_id in chapter_ids:
+            count = self._compact_chapter(chapter_id, cutoff)
+            self.db.commit()
+            if count:
+                chapters += 1
+                removed += count
+        return chapters, removed
+
+    def _compact_chapter(self, chapter_id: int, cutoff: datetime) -> int:
+        rows = self.db.execute(
+            select(ChapterRevision.id, ChapterRevision.created_at)
+            .where(ChapterRevision.chapter_id == chapter_id)
+            .order_by(ChapterRevision.revision)
+        ).all()
+
+        keep = {rows[-1].id}
+        last_of_day: dict[date, int] = {}
+        for row in rows:
+            created_at = _as_utc(row.created_at)
+            if created_at >= cutoff:
+                keep.add(row.id)
+            else:
+                last_of_day[created_at.date()] = row.id
+        keep.update(last_of_day.values())
+        if len(keep) == len(rows):
+            return 0
+
+        # Walk the chain once; after the first removed revision, re-encode
+        # each kept revision against the previous kept one
+        content = ""
+        kept_content: Optional[str] = None
+        deltas = 0
+        rewriting = False
+        removed = []
+        for row in rows:
+            revision = self.db.get(ChapterRevision, row.id)
+            if revision.is_snapshot:
+                content = revision.data
+            else:
+                content = apply_text_ops(content, json.loads(revision.data))
+
+            if row.id not in keep:
+                rewriting = True
+                removed.append(row.id)
+            else:
+                if rewriting:
+                    base = kept_content if deltas < self.snapshot_interval else None
+                    revision.is_snapshot, revision.data = _encode(base, content)
+                    self.db.flush()
+                deltas = 0 if revision.is_snapshot else deltas + 1
+                kept_content = content
+            self.db.expunge(revision)
+
+        self.db.execute(delete(ChapterRevision).where(ChapterRevision.id.in_(removed)))
+        return len(removed)
+
+
+# Revisions are removed with their chapter; SQLite doesn't enforce the
+# foreign key's ON DELETE CASCADE unless foreign_keys is enabled
+
+@event.listens_for(Chapter, "after_delete")
+def _delete_chapter_revisions(mapper, connection, target: Chapter) -> None:
+    connection.execute(
+        delete(ChapterRevision.__table__).where(ChapterRevision.__table__.c.chapter_id == target.id)
+    )
@@ -0,0 +1,423 @@
+"""
+Search repository for full-text search over chapters.
+
+This module maintains the chapter search index and runs ranked,
+user-scoped searches against it: the ``chapters_fts`` FTS5 table on
+SQLite, or the ``chapter_search`` table with a GIN-indexed tsvector
+column on Postgres. Either index stores the plain text of each chapter
+(markup stripped) keyed by the chapter ID, and is kept in sync through
+ORM hooks on the Chapter model.
+"""
+
+import re
+from typing import Iterable
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..models import Chapter
+from ..utils.text import html_to_text
+
+FTS_TABLE = "chapters_fts"
+PG_SEARCH_TABLE = "chapter_search"
+# Must match the configuration in the chapter_search.document column
+PG_TEXT_SEARCH_CONFIG = "simple"
+
+# Markers placed around matched terms by snippet()/highlight(); they are
+# stripped from the returned text and turned into highlight offsets.
+HIGHLIGHT_OPEN = "\x02"
+HIGHLIGHT_CLOSE = "\x03"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 24
+
+# bm25() column weights: (title, content)
+TITLE_WEIGHT = 5.0
+CONTENT_WEIGHT = 1.0
+
+# ts_rank() weights for the {D, C, B, A} labels; titles are A, content B
+PG_RANK_WEIGHTS = f"{{0.1, 0.1, {CONTENT_WEIGHT / TITLE_WEIGHT}, 1.0}}"
+PG_TITLE_HEADLINE = f"StartSel={HIGHLIGHT_OPEN}, StopSel={HIGHLIGHT_CLOSE}, HighlightAll=true"
+PG_SNIPPET_HEADLINE = (
+    f"StartSel={HIGHLIGHT_OPEN}, StopSel={HIGHLIGHT_CLOSE}, "
+    f"MaxWords={SNIPPET_TOKENS}, MinWords={SNIPPET_TOKENS // 2}, ShortWord=0"
+)
+
+# Index maintenance statements per dialect
+INDEX_STATEMENTS = {
+    "sqlite": {
+        "insert": f"INSERT INTO {FTS_TABLE} (rowid, title, content) VALUES (:id, :title, :content)",
+        "delete": f"DELETE FROM {FTS_TABLE} WHERE rowid = :id",
+        "update_title": f"UPDATE {FTS_TABLE} SET title = :title WHERE rowid = :id",
+        "clear": f"DELETE FROM {FTS_TABLE}",
+    },
+    "postgresql": {
+        "insert": f"INSERT INTO {PG_SEARCH_TABLE} (chapter_id, title, content) VALUES (:id, :title, :content)",
+        "delete": f"DELETE FROM {PG_SEARCH_TABLE} WHERE chapter_id = :id",
+        "update_title": f"UPDATE {PG_SEARCH_TABLE} SET title = :title WHERE chapter_id = :id",
+        "clear": f"DELETE FROM {PG_SEARCH_TABLE}",
+    },
+}
+
+REINDEX_BATCH_SIZE = 200
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free-form user input into a safe FTS5 MATCH expression.
+
+    Every word is quoted so FTS5 operators in the input are treated as
+    text, and the last word is matched as a prefix to support
+    search-as-you-type.
+
+    Args:
+        query: The raw search string
+
+    Returns:
+        The MATCH expression, or an empty string if there are no words
+    """
+    tokens = _TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return ""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def build_tsquery(query: str, operator: str = "&") -> str:
+    """
+    Turn free-form user input into a safe Postgres tsquery string.
+
+    The Postgres counterpart of build_match_query: every word is quoted
+    as a lexeme, joined with operator (all words must match by default),
+    and the last one is a prefix.
+
+    Args:
+        query: The raw search string
+        operator: "&" to require every word, "|" to accept any
+
+    Returns:
+        The tsquery text for to_tsquery(), or an empty string if there are no words
+    """
+    tokens = _TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return ""
+    quoted = [f"'{token.lower()}'" for token in tokens]
+    quoted[-1] += ":*"
+    return f" {operator} ".join(quoted)
+
+
+def extract_highlights(marked: str) -> tuple[str, list[tuple[int, int]]]:
+    """
+    Strip highlight markers from FTS output and compute their offsets.
+
+    Args:
+        marked: Text containing HIGHLIGHT_OPEN/HIGHLIGHT_CLOSE markers
+
+    Returns:
+        Tuple of (plain text, list of (start, end) offsets into it)
+    """
+    parts: list[str] = []
+    highlights: list[tuple[int, int]] = []
+    length = 0
+    start = None
+
+    for char in marked or "":
+        if char == HIGHLIGHT_OPEN:
+            start = length
+        elif char == HIGHLIGHT_CLOSE:
+            if start is not None:
+                highlights.append((start, length))
+            start = None
+        else:
+            parts.append(char)
+            length += 1
+
+    return "".join(parts), highlights
+
+
+def _supports_fts(connection: Connection) -> bool:
+    return connection.dialect.name in INDEX_STATEMENTS
+
+
+def _statement(connection: Connection, name: str):
+    return text(INDEX_STATEMENTS[connection.dialect.name][name])
+
+
+def _delete_document(connection: Connection, chapter_id: int) -> None:
+    connection.execute(_statement(connection, "delete"), {"id": chapter_id})
+
+
+def _insert_documents(connection: Connection, chapters: Iterable[dict]) -> None:
+    rows = [
+        {"id": c["id"], "title": c["title"] or "", "content": html_to_text(c["content"])}
+        for c in chapters
+    ]
+    if rows:
+        connection.execute(_statement(connection, "insert"), rows)
+
+
+def _build_results(rows) -> list[dict]:
+    results = []
+    for chapter_id, project_id, project_title, title, snippet, score in rows:
+        title_text, title_highlights = extract_highlights(title)
+        snippet_text, snippet_highlights = extract_highlights(snippet)
+        results.append({
+            "chapter_id": chapter_id,
+            "project_id": project_id,
+            "project_title": project_title,
+            "title": title_text,
+            "title_highlights": title_highlights,
+            "snippet": snippet_text,
+            "snippet_highlights": snippet_highlights,
+            "score": score,
+        })
+    return results
+
+
+class SearchRepository:
+    """Repository for chapter full-text search operations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        user_id: int,
+        query: str,
+        project_id: int | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[int, list[dict]]:
+        """
+        Search chapter titles and content for a user.
+
+        Args:
+            user_id: The user ID (results are limited to their projects)
+            query: The raw search string
+            project_id: Optional project ID to restrict the search to
+            limit: Maximum number of results to return
+            offset: Number of results to skip
+
+        Returns:
+            Tuple of (total match count, list of result dicts ordered by rank)
+        """
+        dialect = self.db.get_bind().dialect.name
+        if dialect == "postgresql":
+            return self._search_postgres(user_id, query, project_id, limit, offset)
+        if dialect != "sqlite":
+            return 0, []
+
+        match = build_match_query(query)
+        if not match:
+            return 0, []
+
+        params = {"match": match, "user_id": user_id}
+        filters = f"{FTS_TABLE} MATCH :match AND p.user_id = :user_id"
+        if project_id is not None:
+            filters += " AND c.project_id = :project_id"
+            params["project_id"] = project_id
+
+        joins = (
+            f"FROM {FTS_TABLE} "
+            f"JOIN chapters c ON c.id = {FTS_TABLE}.rowid "
+            f"JOIN projects p ON p.id = c.project_id"
+        )
+
+        total = self.db.execute(
+            text(f"SELECT count(*) {joins} WHERE {filters}"), params
+        ).scalar_one()
+        if total == 0:
+            return 0, []
+
+        rows = self.db.execute(
+            text(
+                f"SELECT c.id, c.project_id, p.title, "
+                f"highlight({FTS_TABLE}, 0, :open, :close), "
+                f"snippet({FTS_TABLE}, 1, :open, :close, :ellipsis, :tokens), "
+                f"-bm25({FTS_TABLE}, :title_weight, :content_weight) AS score "
+                f"{joins} WHERE {filters} "
+                f"ORDER BY score DESC LIMIT :limit OFFSET :offset"
+            ),
+            {
+                **params,
+                "open": HIGHLIGHT_OPEN,
+                "close": HIGHLIGHT_CLOSE,
+                "ellipsis": SNIPPET_ELLIPSIS,
+                "tokens": SNIPPET_TOKENS,
+                "title_weight": TITLE_WEIGHT,
+                "content_weight": CONTENT_WEIGHT,
+                "limit": limit,
+                "offset": offset,
+            },
+        ).all()
+        return total, _build_results(rows)
+
+    def _search_postgres(
+        self, user_id: int, query: str, project_id: int | None, limit: int, offset: int
+    ) -> tuple[int, list[dict]]:
+        """
+        Search using the GIN-indexed tsvector in chapter_search.
+
+        Matches require every word, but ranking uses the any-word form of
+        the query: ts_rank scores an all-words query by comparing every
+        pair of term positions, which gets slow on long chapters, while
+        the any-word form is linear and orders results much the same.
+        ts_headline snippets are only built for the page returned, since
+        each one reparses the chapter text.
+        """
+        tsquery = build_tsquery(query)
+        if not tsquery:
+            return 0, []
+
+        ts_query = f"to_tsquery('{PG_TEXT_SEARCH_CONFIG}', :tsquery)"
+        rank_query = f"to_tsquery('{PG_TEXT_SEARCH_CONFIG}', :rank_tsquery)"
+        params = {"tsquery": tsquery, "user_id": user_id}
+        filters = f"s.document @@ {ts_query} AND p.user_id = :user_id"
+        if project_id is not None:
+            filters += " AND c.project_id = :project_id"
+            params["project_id"] = project_id
+
+        joins = (
+            f"FROM {PG_SEARCH_TABLE} s "
+            f"JOIN chapters c ON c.id = s.chapter_id "
+            f"JOIN projects p ON p.id = c.project_id"
+        )
+
+        total = self.db.execute(
+            text(f"SELECT count(*) {joins} WHERE {filters}"), params
+        ).scalar_one()
+        if total == 0:
+            return 0, []
+
+        rows = self.db.execute(
+            text(
+                f"WITH ranked AS ("
+                f"SELECT s.chapter_id, c.project_id, p.title AS project_title, s.title, s.content, "
+                f"ts_rank(CAST(:weights AS real[]), s.document, {rank_query}) AS score "
+                f"{joins} WHERE {filters} "
+                f"ORDER BY score DESC, s.chapter_id LIMIT :limit OFFSET :offset) "
+                f"SELECT chapter_id, project_id, project_title, "
+                f"ts_headline('{PG_TEXT_SEARCH_CONFIG}', title, {ts_query}, :title_options), "
+                f"ts_headline('{PG_TEXT_SEARCH_CONFIG}', content, {ts_query}, :snippet_options), "
+                f"score FROM ranked ORDER BY score DESC, chapter_id"
+            ),
+            {
+                **params,
+                "rank_tsquery": build_tsquery(query, operator="|"),
+                "weights": PG_RANK_WEIGHTS,
+                "title_options": PG_TITLE_HEADLINE,
+                "snippet_options": PG_SNIPPET_HEADLINE,
+                "limit": limit,
+                "offset": offset,
+            },
+        ).all()
+        return total, _build_results(rows)
+
+    def index_chapters(self, chapters: Iterable[dict]) -> None:
+        """
+        Add new chapters to the index.
+
+        For chapters inserted with bulk statements, which bypass the ORM
+        hooks below.
+
+        Args:
+            chapters: Dicts with the id, title and content of each chapter
+        """
+        connection = self.db.connection()
+        if _supports_fts(connection):
+            _insert_documents(connection, chapters)
+
+    def update_titles(self, chapters: list[dict]) -> None:
+        """
+        Update the indexed titles of chapters renamed with bulk statements.
+
+        Args:
+            chapters: Dicts with the id and new title of each chapter
+        """
+        connection = self.db.connection()
+        if _supports_fts(connection) and chapters:
+            connection.execute(
+                _statement(connection, "update_title"),
+                [{"id": c["id"], "title": c["title"] or ""} for c in chapters],
+            )
+
+    def unindex_chapters(self, chapter_ids: list[int]) -> None:
+        """
+        Remove chapters deleted with bulk statements from the index.
+
+        Args:
+            chapter_ids: IDs of the deleted chapters
+        """
+        connection = self.db.connection()
+        if _supports_fts(connection) and chapter_ids:
+            connection.execute(
+                _statement(connection, "delete"),
+                [{"id": chapter_id} for chapter_id in chapter_ids],
+            )
+
+    def reindex(self, batch_size: int = REINDEX_BATCH_SIZE) -> int:
+        """
+        Rebuild the search index from the chapters table.
+
+        Args:
+            batch_size: Number of chapters to index per batch
+
+        Returns:
+            The number of chapters indexed
+        """
+        connection = self.db.connection()
+        if not _supports_fts(connection):
+            return 0
+
+        connection.execute(_statement(connection, "clear"))
+
+        indexed = 0
+        last_id = 0
+        while True:
+            batch = (
+                self.db.query(Chapter.id, Chapter.title, Chapter.content)
+                .filter(Chapter.id > last_id)
+                .order_by(Chapter.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            _insert_documents(connection, (row._asdict() for row in batch))
+            indexed += len(batch)
+            last_id = batch[-1].id
+
+        self.db.commit()
+        return indexed
+
+
+# ORM hooks keeping the index in sync with chapter writes
+
+@event.listens_for(Chapter, "after_insert")
+def _index_inserted_chapter(mapper, connection, target: Chapter) -> None:
+    if _supports_fts(connection):
+        _insert_documents(connection, [
+            {"id": target.id, "title": target.title, "content": target.content}
+        ])
+
+
+@event.listens_for(Chapter, "after_update")
+def _index_updated_chapter(mapper, connection, target: Chapter) -> None:
+    if not _supports_fts(connection):
+        return
+    state = inspect(target)
+    if not (state.attrs.title.history.has_changes() or state.attrs.content.history.has_changes()):
+        return
+    _delete_document(connection, target.id)
+    _insert_documents(connection, [
+        {"id": target.id, "title": target.title, "content": target.content}
+    ])
+
+
+@event.listens_for(Chapter, "after_delete")
+def _unindex_deleted_chapter(mapper, connection, target: Chapter) -> None:
+    if _supports_fts(connection):
+        _delete_document(connection, target.id)
@@ -0,0 +1,124 @@
+"""
+User settings repositories for database operations.
+
+This module provides sync and async repositories for UserSettings,
+encapsulating the per-user settings queries shared by the settings
+and AI endpoints.
+"""
+
+from typing import Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import UserSettings
+
+
+class UserSettingsRepository:
+    """Repository for UserSettings database operations."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_for_user(self, user_id: int) -> Optional[UserSettings]:
+        """
+        Get a user's settings.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            The UserSettings or None if the user has none yet
+        """
+        return self.db.query(UserSettings).filter(UserSettings.user_id == user_id).first()
+
+    def get_custom_prompts(self, user_id: int) -> dict | None:
+        """
+        Get a user's custom prompts.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            The custom prompts dict, or None if the user has no settings
+        """
+        return self.db.execute(
+            select(UserSettings.custom_prompts).where(UserSettings.user_id == user_id)
+        ).scalar_one_or_none()
+
+
+class AsyncUserSettingsRepository:
+    """Async repository for UserSettings database operations."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_for_user(self, user_id: int) -> Optional[UserSettings]:
+        """
+        Get a user's settings.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            The UserSettings or None if the user has none yet
+        """
+        result = await self.db.execute(
+            select(UserSettings).where(UserSettings.user_id == user_id)
+        )
+        return result.scalars().first()
+
+    async def get_custom_prompts(self, user_id: int) -> dict | None:
+        """
+        Get a user's custom prompts.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            The custom prompts dict, or None if the user has no settings
+        """
+        result = await self.db.execute(
+            select(UserSettings.custom_prompts).where(UserSettings.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_or_create(self, user_id: int) -> UserSettings:
+        """
+        Get a user's settings, creating empty defaults if none exist.
+
+        Args:
+            user_id: The user ID
+
+        Returns:
+            The UserSettings
+        """
+        settings = await self.get_for_user(user_id)
+        if not settings:
+            settings = UserSettings(user_id=user_id, custom_prompts={})
+            self.db.add(settings)
+            await self.db.commit()
+            await self.db.refresh(settings)
+        return settings
+
+    async def update_custom_prompts(self, user_id: int, custom_prompts: dict) -> UserSettings:
+        """
+        Replace a user's custom prompts, creating their settings if needed.
+
+        Args:
+            user_id: The user ID
+            custom_prompts: The new custom prompts
+
+        Returns:
+            The updated UserSettings
+        """
+        settings = await self.get_for_user(user_id)
+        if not settings:
+            settings = UserSettings(user_id=user_id)
+            self.db.add(settings)
+
+        settings.custom_prompts = custom_prompts
+
+        await self.db.commit()
+        await self.db.refresh(settings)
+        return settings
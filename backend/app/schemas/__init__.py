@@ -3,9 +3,19 @@ from .project import (
     ProjectCreate,
     ProjectUpdate,
     ProjectList,
+    ProjectPage,
+    ProjectOutline,
+    ImportResult,
     Chapter,
+    ChapterOutline,
+    ChapterPage,
     ChapterCreate,
     ChapterUpdate,
+    ChapterPatch,
+    ChapterPatchResult,
+    ChapterMutation,
+    ChapterBatch,
+    ChapterBatchResult,
 )
 
 __all__ = [
@@ -13,7 +23,17 @@ __all__ = [
     "ProjectCreate",
     "ProjectUpdate",
     "ProjectList",
+    "ProjectPage",
+    "ProjectOutline",
+    "ImportResult",
     "Chapter",
+    "ChapterOutline",
+    "ChapterPage",
     "ChapterCreate",
     "ChapterUpdate",
+    "ChapterPatch",
+    "ChapterPatchResult",
+    "ChapterMutation",
+    "ChapterBatch",
+    "ChapterBatchResult",
 ]
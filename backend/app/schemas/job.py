@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+class JobStatus(BaseModel):
+    id: str
+    kind: str
+    status: str
+    progress: int
+    total: Optional[int] = None
+    error: Optional[str] = None
+    result: Dict[str, Any] = {}
+    download_url: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
@@ -1,13 +1,28 @@
-from pydantic import BaseModel, Field
+import math
+
+from pydantic import BaseModel, Field, computed_field, model_validator
 from datetime import datetime
 from typing import Optional, List
 
 from ..constants import (
     MAX_TITLE_LENGTH, MAX_DESCRIPTION_LENGTH,
-    MAX_CONTENT_LENGTH, MAX_CHAPTER_ORDER
+    MAX_CONTENT_LENGTH, MAX_CHAPTER_ORDER, MAX_PATCH_OPERATIONS, MAX_BATCH_MUTATIONS,
+    READING_WORDS_PER_MINUTE,
 )
 
 
+class ContentStats(BaseModel):
+    """Statistics stored with chapters (per chapter) and projects (totals)."""
+    word_count: int = 0
+    character_count: int = 0
+    paragraph_count: int = 0
+
+    @computed_field
+    @property
+    def reading_minutes(self) -> int:
+        return math.ceil(self.word_count / READING_WORDS_PER_MINUTE)
+
+
 class ChapterBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=MAX_TITLE_LENGTH)
     content: Optional[str] = Field(default="", max_length=MAX_CONTENT_LENGTH)
@@ -24,9 +39,58 @@ class ChapterUpdate(BaseModel):
     order: Optional[int] = Field(default=None, ge=0, le=MAX_CHAPTER_ORDER)
 
 
-class Chapter(ChapterBase):
+class TextOperation(BaseModel):
+    """A single retain/insert/delete edit; exactly one field must be set."""
+    retain: Optional[int] = Field(default=None, ge=1, le=MAX_CONTENT_LENGTH)
+    insert: Optional[str] = Field(default=None, min_length=1, max_length=MAX_CONTENT_LENGTH)
+    delete: Optional[int] = Field(default=None, ge=1, le=MAX_CONTENT_LENGTH)
+
+    @model_validator(mode="after")
+    def check_single_operation(self) -> "TextOperation":
+        # An explicit null doesn't count as setting a field
+        if sum(value is not None for value in (self.retain, self.insert, self.delete)) != 1:
+            raise ValueError("Each operation must set exactly one of retain, insert or delete")
+        return self
+
+
+class ChapterPatch(BaseModel):
+    base_version: int = Field(..., ge=1)
+    ops: List[TextOperation] = Field(..., max_length=MAX_PATCH_OPERATIONS)
+
+
+class ChapterPatchResult(BaseModel):
+    id: int
+    version: int
+    content_length: int
+    updated_at: Optional[datetime] = None
+
+
+class ChapterMutation(BaseModel):
+    """A change to one chapter in a batch: new order and/or title, or deletion."""
+    id: int
+    version: Optional[int] = Field(default=None, ge=1)  # If set, the chapter must be at this version
+    order: Optional[int] = Field(default=None, ge=0, le=MAX_CHAPTER_ORDER)
+    title: Optional[str] = Field(default=None, min_length=1, max_length=MAX_TITLE_LENGTH)
+    delete: bool = False
+
+    @model_validator(mode="after")
+    def check_change(self) -> "ChapterMutation":
+        changes = self.order is not None or self.title is not None
+        if self.delete and changes:
+            raise ValueError("A deleted chapter can't also be changed")
+        if not self.delete and not changes:
+            raise ValueError("Each mutation must set order, title or delete")
+        return self
+
+
+class ChapterBatch(BaseModel):
+    mutations: List[ChapterMutation] = Field(..., min_length=1, max_length=MAX_BATCH_MUTATIONS)
+
+
+class Chapter(ChapterBase, ContentStats):
     id: int
     project_id: int
+    version: int
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -48,8 +112,9 @@ class ProjectUpdate(BaseModel):
     description: Optional[str] = Field(default=None, max_length=MAX_DESCRIPTION_LENGTH)
 
 
-class Project(ProjectBase):
+class Project(ProjectBase, ContentStats):
     id: int
+    chapter_count: int = 0
     created_at: datetime
     updated_at: Optional[datetime] = None
     chapters: List[Chapter] = []
@@ -58,7 +123,38 @@ class Project(ProjectBase):
         from_attributes = True
 
 
-class ProjectList(BaseModel):
+class ChapterOutline(ContentStats):
+    """A chapter's tree entry, without its content."""
+    id: int
+    title: str
+    order: int
+    version: int
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectOutline(ProjectBase, ContentStats):
+    id: int
+    chapter_count: int = 0
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    chapters: List[ChapterOutline] = []
+
+
+class ChapterBatchResult(BaseModel):
+    updated: int
+    deleted: int
+    chapters: List[ChapterOutline]
+
+
+class ImportResult(BaseModel):
+    project_id: int
+    chapters: List[ChapterOutline]
+
+
+class ProjectList(ContentStats):
     id: int
     title: str
     description: Optional[str] = None
@@ -68,3 +164,15 @@ class ProjectList(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ProjectPage(BaseModel):
+    items: List[ProjectList]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+class ChapterPage(BaseModel):
+    items: List[ChapterOutline]
+    next_cursor: Optional[str] = None
+    limit: int
@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import List, Optional
+
+
+class RevisionSummary(BaseModel):
+    revision: int
+    is_snapshot: bool
+    content_length: int
+    chapter_version: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class RevisionList(BaseModel):
+    chapter_id: int
+    total: int
+    limit: int
+    offset: int
+    revisions: List[RevisionSummary]
+
+
+class RevisionDetail(RevisionSummary):
+    content: str
+
+
+class RevisionDiff(BaseModel):
+    chapter_id: int
+    from_revision: int
+    to_revision: int
+    added_lines: int
+    removed_lines: int
+    diff: str  # Unified diff of the plain text
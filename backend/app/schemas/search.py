@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import List, Tuple
+
+
+class SearchResult(BaseModel):
+    chapter_id: int
+    project_id: int
+    project_title: str
+    title: str
+    title_highlights: List[Tuple[int, int]] = []
+    snippet: str
+    snippet_highlights: List[Tuple[int, int]] = []
+    score: float
+
+
+class SearchResponse(BaseModel):
+    query: str
+    total: int
+    limit: int
+    offset: int
+    results: List[SearchResult]
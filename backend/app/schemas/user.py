@@ -37,6 +37,7 @@ class UserCreate(UserBase):
 class UserResponse(UserBase):
     id: int
     is_approved: bool
+    is_admin: bool = False
     created_at: datetime
     updated_at: Optional[datetime] = None
 
@@ -5,6 +5,8 @@ This module separates authentication business logic from API endpoints,
 making it easier to test and maintain.
 """
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from datetime import timedelta
@@ -12,12 +14,63 @@ from typing import Optional
 
 from ..models import User
 from ..schemas.user import UserCreate, UserLogin
-from ..utils.auth import get_password_hash, verify_password, create_access_token
+from ..utils.auth import get_password_hash, verify_and_update_password, create_access_token
+from ..utils.password_hashing import password_pool
 from ..config import get_settings
 
 settings = get_settings()
 
 
+def _invalid_credentials() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email/username or password"
+    )
+
+
+def _check_not_registered(user_with_email: Optional[User], user_with_username: Optional[User]) -> None:
+    """Raise 400 if the email or username is already in use."""
+    if user_with_email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+    if user_with_username:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already taken"
+        )
+
+
+def _new_user(user_data: UserCreate, hashed_password: str) -> User:
+    return User(
+        email=user_data.email,
+        username=user_data.username,
+        full_name=user_data.full_name,
+        hashed_password=hashed_password,
+        is_approved=False  # Requires admin approval
+    )
+
+
+def _issue_access_token(user: User, remember_me: bool) -> str:
+    """Check the user is approved and create their access token."""
+    if not user.is_approved:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Your account is pending approval. Please contact an administrator."
+        )
+
+    access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
+    if remember_me:
+        # Extend token expiry for remember me (30 days)
+        access_token_expires = timedelta(days=30)
+
+    return create_access_token(
+        data={"sub": str(user.id)},
+        expires_delta=access_token_expires
+    )
+
+
 class AuthService:
     """Service class for authentication operations."""
 
@@ -37,31 +90,14 @@ class AuthService:
         Raises:
             HTTPException: If email or username already exists
         """
-        # Check if email already exists
-        existing_user = self.db.query(User).filter(User.email == user_data.email).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Email already registered"
-            )
-
-        # Check if username already exists
-        existing_user = self.db.query(User).filter(User.username == user_data.username).first()
-        if existing_user:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already taken"
-            )
+        # Check if email or username already exists
+        _check_not_registered(
+            self.db.query(User).filter(User.email == user_data.email).first(),
+            self.db.query(User).filter(User.username == user_data.username).first(),
+        )
 
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
-        new_user = User(
-            email=user_data.email,
-            username=user_data.username,
-            full_name=user_data.full_name,
-            hashed_password=hashed_password,
-            is_approved=False  # Requires admin approval
-        )
+        new_user = _new_user(user_data, get_password_hash(user_data.password))
 
         self.db.add(new_user)
         self.db.commit()
@@ -88,35 +124,18 @@ class AuthService:
         ).first()
 
         if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email/username or password"
-            )
+            raise _invalid_credentials()
 
-        if not verify_password(login_data.password, user.hashed_password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email/username or password"
-            )
-
-        if not user.is_approved:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Your account is pending approval. Please contact an administrator."
-            )
+        valid, new_hash = verify_and_update_password(login_data.password, user.hashed_password)
+        if not valid:
+            raise _invalid_credentials()
 
-        # Create access token
-        access_token_expires = timedelta(minutes=settings.jwt_access_token_expire_minutes)
-        if login_data.remember_me:
-            # Extend token expiry for remember me (30 days)
-            access_token_expires = timedelta(days=30)
+        if new_hash:
+            # Stored hash uses outdated cost settings; upgrade it
+            user.hashed_password = new_hash
+            self.db.commit()
 
-        access_token = create_access_token(
-            data={"sub": str(user.id)},
-            expires_delta=access_token_expires
-        )
-
-        return user, access_token
+        return user, _issue_access_token(user, login_data.remember_me)
 
     def get_user_by_id(self, user_id: int) -> Optional[User]:
         """
@@ -153,3 +172,117 @@ class AuthService:
             User instance or None
         """
         return self.db.query(User).filter(User.username == username).first()
+
+
+class AsyncAuthService:
+    """
+    Async service class for authentication operations.
+
+    Queries run on an AsyncSession and bcrypt hashing runs on the
+    password hashing pool, so none of these methods block the event loop.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def register_user(self, user_data: UserCreate) -> User:
+        """
+        Register a new user with validation.
+
+        Args:
+            user_data: User registration data
+
+        Returns:
+            Created user instance
+
+        Raises:
+            HTTPException: If email or username already exists
+        """
+        _check_not_registered(
+            await self.get_user_by_email(user_data.email),
+            await self.get_user_by_username(user_data.username),
+        )
+
+        hashed_password = await password_pool.hash(user_data.password)
+        new_user = _new_user(user_data, hashed_password)
+
+        self.db.add(new_user)
+        await self.db.commit()
+        await self.db.refresh(new_user)
+
+        return new_user
+
+    async def authenticate_user(self, login_data: UserLogin) -> tuple[User, str]:
+        """
+        Authenticate user and generate access token.
+
+        Args:
+            login_data: Login credentials
+
+        Returns:
+            Tuple of (user, access_token)
+
+        Raises:
+            HTTPException: If authentication fails
+        """
+        result = await self.db.execute(
+            select(User).where(
+                (User.email == login_data.login) | (User.username == login_data.login)
+            )
+        )
+        user = result.scalars().first()
+
+        if not user:
+            raise _invalid_credentials()
+
+        valid, new_hash = await password_pool.verify_and_update(
+            login_data.password, user.hashed_password
+        )
+        if not valid:
+            raise _invalid_credentials()
+
+        if new_hash:
+            # Stored hash uses outdated cost settings; upgrade it
+            user.hashed_password = new_hash
+            await self.db.commit()
+            await self.db.refresh(user)
+
+        return user, _issue_access_token(user, login_data.remember_me)
+
+    async def get_user_by_id(self, user_id: int) -> Optional[User]:
+        """
+        Get user by ID.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            User instance or None
+        """
+        return await self.db.get(User, user_id)
+
+    async def get_user_by_email(self, email: str) -> Optional[User]:
+        """
+        Get user by email.
+
+        Args:
+            email: User email
+
+        Returns:
+            User instance or None
+        """
+        result = await self.db.execute(select(User).where(User.email == email))
+        return result.scalars().first()
+
+    async def get_user_by_username(self, username: str) -> Optional[User]:
+        """
+        Get user by username.
+
+        Args:
+            username: Username
+
+        Returns:
+            User instance or None
+        """
+        result = await self.db.execute(select(User).where(User.username == username))
+        return result.scalars().first()
@@ -0,0 +1,146 @@
+"""
+Manuscript export to Markdown, DOCX and EPUB.
+
+Each format is a generator taking the project metadata and an iterator
+of chapters and yielding encoded bytes, so an export can be streamed in
+a response or written to a file with the same bounded memory.
+"""
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ...models import Project, User
+from . import docx, epub, markdown
+from .base import CHAPTER_BATCH_SIZE, ExportChapter, ExportProject, ProgressCallback, iter_chapters
+
+Generator = Callable[[ExportProject, Iterable[ExportChapter]], Iterator[bytes]]
+
+
+@dataclass(frozen=True)
+class ExportFormat:
+    """An export format and how to name and serve its output."""
+    extension: str
+    media_type: str
+    generate: Generator
+
+
+# Format registry; the key is the ?format= value
+EXPORT_FORMATS: dict[str, ExportFormat] = {
+    "markdown": ExportFormat(markdown.EXTENSION, markdown.MEDIA_TYPE, markdown.export_markdown),
+    "docx": ExportFormat(docx.EXTENSION, docx.MEDIA_TYPE, docx.export_docx),
+    "epub": ExportFormat(epub.EXTENSION, epub.MEDIA_TYPE, epub.export_epub),
+}
+
+
+def get_export_project(db: Session, project_id: int, user_id: int) -> Optional[ExportProject]:
+    """
+    Load the metadata of a project owned by the user, without its chapters.
+
+    Args:
+        db: Database session
+        project_id: The project ID
+        user_id: The owner's user ID
+
+    Returns:
+        The project metadata, or None if not found or not owned by the user
+    """
+    row = db.execute(
+        select(Project.id, Project.title, Project.description, User.full_name, Project.chapter_count)
+        .join(User, User.id == Project.user_id)
+        .where(Project.id == project_id, Project.user_id == user_id)
+    ).first()
+    if row is None:
+        return None
+    return ExportProject(
+        id=row.id,
+        title=row.title,
+        description=row.description,
+        author=row.full_name,
+        chapter_count=row.chapter_count,
+    )
+
+
+def stream_export(
+    export_format: str,
+    project: ExportProject,
+    session_factory: Callable[[], Session],
+    batch_size: int = CHAPTER_BATCH_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Iterator[bytes]:
+    """
+    Export a project, reading its chapters in batches as the output is consumed.
+
+    Args:
+        export_format: A key of EXPORT_FORMATS
+        project: The project metadata (ownership must already be checked)
+        session_factory: Callable returning a new Session for reading chapters
+        batch_size: Number of chapters loaded per query
+        on_progress: Called with the number of chapters exported so far
+
+    Returns:
+        Iterator of encoded chunks
+    """
+    chapters = iter_chapters(session_factory, project.id, batch_size=batch_size, on_progress=on_progress)
+    return EXPORT_FORMATS[export_format].generate(project, chapters)
+
+
+def write_export(
+    path: Path,
+    export_format: str,
+    project: ExportProject,
+    session_factory: Callable[[], Session],
+    on_progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Export a project to a file, replacing it only once the export is complete.
+
+    Args:
+        path: Destination file
+        export_format: A key of EXPORT_FORMATS
+        project: The project metadata (ownership must already be checked)
+        session_factory: Callable returning a new Session for reading chapters
+        on_progress: Called with the number of chapters exported so far
+
+    Returns:
+        Size of the written file in bytes
+    """
+    tmp_path = path.with_name(path.name + ".part")
+    size = 0
+    try:
+        with open(tmp_path, "wb") as output:
+            for chunk in stream_export(export_format, project, session_factory, on_progress=on_progress):
+                output.write(chunk)
+                size += len(chunk)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+    return size
+
+
+def export_filename(project: ExportProject, export_format: str) -> str:
+    """Build the download file name from the project title."""
+    stem = project.title
+    for character in '\\/:*?"<>|':
+        stem = stem.replace(character, " ")
+    stem = " ".join(stem.split())[:100] or f"project-{project.id}"
+    return f"{stem}.{EXPORT_FORMATS[export_format].extension}"
+
+
+__all__ = [
+    "CHAPTER_BATCH_SIZE",
+    "EXPORT_FORMATS",
+    "ExportChapter",
+    "ExportFormat",
+    "ExportProject",
+    "export_filename",
+    "get_export_project",
+    "iter_chapters",
+    "stream_export",
+    "write_export",
+]
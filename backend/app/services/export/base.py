@@ -0,0 +1,149 @@
+"""
+Shared pieces of the manuscript exporters.
+
+Chapters are read from the database in keyset-paginated batches with a
+dedicated session, so only one batch of chapter content is in memory at
+a time. Zip-based formats write through ZipStream, which hands back the
+compressed bytes as each entry is written instead of building the
+archive in memory or on disk.
+"""
+
+import zipfile
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from ...models import Chapter
+
+CHAPTER_BATCH_SIZE = 20
+
+
+@dataclass
+class ExportChapter:
+    """A chapter as seen by the exporters."""
+    number: int  # 1-based position in the manuscript
+    title: str
+    content: str
+
+
+@dataclass
+class ExportProject:
+    """Project metadata written before the chapters."""
+    id: int
+    title: str
+    description: Optional[str]
+    author: Optional[str]
+    chapter_count: int
+
+
+ProgressCallback = Callable[[int], None]
+
+
+def iter_chapters(
+    session_factory: Callable[[], Session],
+    project_id: int,
+    batch_size: int = CHAPTER_BATCH_SIZE,
+    on_progress: Optional[ProgressCallback] = None,
+) -> Iterator[ExportChapter]:
+    """
+    Yield a project's chapters in order, one batch in memory at a time.
+
+    Uses its own session, since it runs while the response streams,
+    after the request's session may have been closed.
+
+    Args:
+        session_factory: Callable returning a new Session
+        project_id: The project ID (ownership must already be checked)
+        batch_size: Number of chapters loaded per query
+        on_progress: Called with the number of chapters yielded so far
+
+    Yields:
+        ExportChapter for each chapter, ordered by order then id
+    """
+    db = session_factory()
+    try:
+        number = 0
+        last: Optional[tuple[int, int]] = None
+        while True:
+            query = (
+                select(Chapter.id, Chapter.order, Chapter.title, Chapter.content)
+                .where(Chapter.project_id == project_id)
+                .order_by(Chapter.order, Chapter.id)
+                .limit(batch_size)
+            )
+            if last is not None:
+                query = query.where(or_(
+                    Chapter.order > last[0],
+                    and_(Chapter.order == last[0], Chapter.id > last[1]),
+                ))
+            rows = db.execute(query).all()
+            # End the read transaction between batches
+            db.rollback()
+            if not rows:
+                break
+
+            for row in rows:
+                number += 1
+                yield ExportChapter(number=number, title=row.title, content=row.content or "")
+                if on_progress:
+                    on_progress(number)
+            last = (rows[-1].order, rows[-1].id)
+    finally:
+        db.close()
+
+
+class _ChunkWriter:
+    """Write-only, non-seekable file object collecting bytes until drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ZipStream:
+    """
+    Zip archive written to a non-seekable stream.
+
+    zipfile falls back to data descriptors when it can't seek, so each
+    entry is emitted as it is written. Call drain() to take the bytes
+    produced so far.
+    """
+
+    def __init__(self):
+        self._writer = _ChunkWriter()
+        self.zip = zipfile.ZipFile(self._writer, mode="w", compression=zipfile.ZIP_DEFLATED)
+
+    def write_stored(self, name: str, data: bytes) -> None:
+        """Add an uncompressed entry (e.g. the EPUB mimetype)."""
+        self.zip.writestr(zipfile.ZipInfo(name), data, compress_type=zipfile.ZIP_STORED)
+
+    def write(self, name: str, data: str | bytes) -> None:
+        """Add a complete compressed entry."""
+        self.zip.writestr(zipfile.ZipInfo(name), data, compress_type=zipfile.ZIP_DEFLATED)
+
+    def open(self, name: str):
+        """Open a compressed entry for incremental writing."""
+        info = zipfile.ZipInfo(name)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return self.zip.open(info, mode="w")
+
+    def drain(self) -> bytes:
+        return self._writer.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the remaining bytes."""
+        self.zip.close()
+        return self._writer.drain()
@@ -0,0 +1,168 @@
+"""
+Block model of chapter content for export.
+
+Parses the TipTap editor HTML into a flat list of blocks (paragraphs,
+headings, list items, quotes, code, rules), each holding runs of text
+with inline marks. Every export format renders these blocks, so the
+HTML is parsed the same way everywhere.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+# Inline tags and the mark each one applies
+MARK_TAGS = {
+    "strong": "bold", "b": "bold",
+    "em": "italic", "i": "italic",
+    "s": "strike", "strike": "strike", "del": "strike",
+    "u": "underline",
+    "code": "code",
+}
+HEADING_TAGS = {"h1": 1, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+LINE_BREAK = "\n"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class Block:
+    """A block of text; runs are (text, marks) pairs, with "\\n" for line breaks."""
+    kind: str  # paragraph, heading, list_item, quote, code, rule
+    level: int = 0  # Heading level, or list nesting depth
+    ordered: bool = False
+    runs: list[tuple[str, frozenset]] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "".join(text for text, _ in self.runs)
+
+
+class _BlockParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: list[Block] = []
+        self.current: Block | None = None
+        self.marks: list[str] = []
+        self.lists: list[bool] = []  # Ordered flag per open list
+        self.quote_depth = 0
+        self.in_pre = False
+
+    def _open(self, kind: str, level: int = 0, ordered: bool = False) -> None:
+        self._close()
+        self.current = Block(kind=kind, level=level, ordered=ordered)
+
+    def _close(self) -> None:
+        block, self.current = self.current, None
+        if block is None:
+            return
+        if block.kind != "code":
+            _trim(block)
+        if block.runs or block.kind == "rule":
+            self.blocks.append(block)
+
+    def handle_starttag(self, tag, attrs):
+        if tag in MARK_TAGS:
+            self.marks.append(MARK_TAGS[tag])
+        elif tag in HEADING_TAGS:
+            self._open("heading", level=HEADING_TAGS[tag])
+        elif tag in ("ul", "ol"):
+            self._close()
+            self.lists.append(tag == "ol")
+        elif tag == "li":
+            self._open("list_item", level=max(len(self.lists), 1), ordered=bool(self.lists and self.lists[-1]))
+        elif tag in ("p", "div"):
+            # A paragraph directly inside a list item continues that item
+            if not (self.current and self.current.kind == "list_item" and not self.current.runs):
+                self._open("quote" if self.quote_depth else "paragraph")
+        elif tag == "blockquote":
+            self._close()
+            self.quote_depth += 1
+        elif tag == "pre":
+            self._open("code")
+            self.in_pre = True
+        elif tag == "br":
+            if self.current is not None:
+                self.current.runs.append((LINE_BREAK, frozenset()))
+        elif tag == "hr":
+            self._open("rule")
+            self._close()
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+
+    def handle_endtag(self, tag):
+        if tag in MARK_TAGS:
+            mark = MARK_TAGS[tag]
+            if mark in self.marks:
+                self.marks.reverse()
+                self.marks.remove(mark)
+                self.marks.reverse()
+        elif tag in HEADING_TAGS or tag in ("p", "div", "li"):
+            self._close()
+        elif tag in ("ul", "ol"):
+            self._close()
+            if self.lists:
+                self.lists.pop()
+        elif tag == "blockquote":
+            self._close()
+            self.quote_depth = max(self.quote_depth - 1, 0)
+        elif tag == "pre":
+            self._close()
+            self.in_pre = False
+
+    def handle_data(self, data):
+        if not self.in_pre:
+            data = _WHITESPACE.sub(" ", data)
+            if self.current is None and not data.strip():
+                return
+        if self.current is None:
+            self._open("quote" if self.quote_depth else "paragraph")
+        self.current.runs.append((data, frozenset(self.marks)))
+
+    def close(self):
+        super().close()
+        self._close()
+
+
+def _trim(block: Block) -> None:
+    """Strip whitespace at the block edges and merge adjacent runs with equal marks."""
+    merged: list[tuple[str, frozenset]] = []
+    for text, marks in block.runs:
+        if merged and merged[-1][1] == marks and LINE_BREAK not in (text, merged[-1][0]):
+            merged[-1] = (merged[-1][0] + text, marks)
+        else:
+            merged.append((text, marks))
+    while merged and not merged[0][0].strip(" "):
+        merged.pop(0)
+    while merged and not merged[-1][0].strip(" "):
+        merged.pop()
+    if merged:
+        merged[0] = (merged[0][0].lstrip(" "), merged[0][1])
+        merged[-1] = (merged[-1][0].rstrip(" "), merged[-1][1])
+    block.runs = merged
+
+
+def parse_blocks(content: str | None) -> list[Block]:
+    """
+    Parse chapter content into blocks.
+
+    Args:
+        content: The chapter content (editor HTML or plain text)
+
+    Returns:
+        The blocks in document order
+    """
+    if not content:
+        return []
+    if "<" not in content:
+        # Plain text: one paragraph per line
+        return [
+            Block(kind="paragraph", runs=[(line.strip(), frozenset())])
+            for line in content.splitlines() if line.strip()
+        ]
+
+    parser = _BlockParser()
+    parser.feed(content)
+    parser.close()
+    return parser.blocks
@@ -0,0 +1,184 @@
+"""
+DOCX manuscript export.
+
+Writes a minimal WordprocessingML package: word/document.xml is streamed
+into the zip one chapter at a time, and the styles define the manuscript
+title, chapter headings (each starting a new page) and block quotes.
+Lists are written as indented paragraphs with their bullet or number
+as text, which keeps the package free of numbering definitions.
+"""
+
+from typing import Iterable, Iterator
+from xml.sax.saxutils import escape
+
+from .base import ExportChapter, ExportProject, ZipStream
+from .blocks import Block, LINE_BREAK, parse_blocks
+
+MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+EXTENSION = "docx"
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+<Override PartName="/word/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"/>
+<Override PartName="/docProps/core.xml" ContentType="application/vnd.openxmlformats-package.core-properties+xml"/>
+</Types>"""
+
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/package/2006/relationships/metadata/core-properties" Target="docProps/core.xml"/>
+</Relationships>"""
+
+DOCUMENT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>
+</Relationships>"""
+
+CORE_PROPERTIES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<cp:coreProperties xmlns:cp="http://schemas.openxmlformats.org/package/2006/metadata/core-properties" \
+xmlns:dc="http://purl.org/dc/elements/1.1/">
+<dc:title>{title}</dc:title>
+<dc:creator>{author}</dc:creator>
+<dc:language>id-ID</dc:language>
+</cp:coreProperties>"""
+
+STYLES = f"""<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:styles xmlns:w="{_W_NS}">
+<w:docDefaults>
+<w:rPrDefault><w:rPr><w:rFonts w:ascii="Times New Roman" w:hAnsi="Times New Roman" w:cs="Times New Roman"/>\
+<w:sz w:val="24"/><w:lang w:val="id-ID"/></w:rPr></w:rPrDefault>
+<w:pPrDefault><w:pPr><w:spacing w:after="0" w:line="480" w:lineRule="auto"/></w:pPr></w:pPrDefault>
+</w:docDefaults>
+<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/>\
+<w:pPr><w:ind w:firstLine="720"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Title"><w:name w:val="Title"/><w:basedOn w:val="Normal"/>\
+<w:pPr><w:jc w:val="center"/><w:ind w:firstLine="0"/><w:spacing w:before="2400" w:after="480"/></w:pPr>\
+<w:rPr><w:b/><w:sz w:val="40"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Subtitle"><w:name w:val="Subtitle"/><w:basedOn w:val="Normal"/>\
+<w:pPr><w:jc w:val="center"/><w:ind w:firstLine="0"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading1"><w:name w:val="heading 1"/><w:basedOn w:val="Normal"/>\
+<w:next w:val="Normal"/><w:pPr><w:pageBreakBefore/><w:keepNext/><w:jc w:val="center"/><w:ind w:firstLine="0"/>\
+<w:spacing w:before="1440" w:after="480"/><w:outlineLvl w:val="0"/></w:pPr><w:rPr><w:b/><w:sz w:val="32"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading2"><w:name w:val="heading 2"/><w:basedOn w:val="Normal"/>\
+<w:next w:val="Normal"/><w:pPr><w:keepNext/><w:ind w:firstLine="0"/><w:spacing w:before="240"/>\
+<w:outlineLvl w:val="1"/></w:pPr><w:rPr><w:b/><w:sz w:val="28"/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Heading3"><w:name w:val="heading 3"/><w:basedOn w:val="Normal"/>\
+<w:next w:val="Normal"/><w:pPr><w:keepNext/><w:ind w:firstLine="0"/><w:spacing w:before="240"/>\
+<w:outlineLvl w:val="2"/></w:pPr><w:rPr><w:b/><w:i/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="Quote"><w:name w:val="Quote"/><w:basedOn w:val="Normal"/>\
+<w:pPr><w:ind w:left="720" w:right="720" w:firstLine="0"/></w:pPr><w:rPr><w:i/></w:rPr></w:style>
+<w:style w:type="paragraph" w:styleId="ListParagraph"><w:name w:val="List Paragraph"/><w:basedOn w:val="Normal"/>\
+<w:pPr><w:ind w:firstLine="0"/></w:pPr></w:style>
+<w:style w:type="paragraph" w:styleId="Code"><w:name w:val="Code"/><w:basedOn w:val="Normal"/>\
+<w:pPr><w:ind w:firstLine="0"/><w:spacing w:line="240" w:lineRule="auto"/></w:pPr>\
+<w:rPr><w:rFonts w:ascii="Courier New" w:hAnsi="Courier New" w:cs="Courier New"/><w:sz w:val="20"/></w:rPr></w:style>
+</w:styles>"""
+
+DOCUMENT_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<w:document xmlns:w="{_W_NS}"><w:body>'
+)
+DOCUMENT_END = (
+    '<w:sectPr><w:pgSz w:w="11906" w:h="16838"/>'
+    '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" '
+    'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+    "</w:body></w:document>"
+)
+
+RUN_PROPERTIES = (
+    ("bold", "<w:b/>"),
+    ("italic", "<w:i/>"),
+    ("underline", '<w:u w:val="single"/>'),
+    ("strike", "<w:strike/>"),
+)
+CODE_FONT = '<w:rFonts w:ascii="Courier New" w:hAnsi="Courier New" w:cs="Courier New"/>'
+
+
+def _run(text: str, marks: frozenset = frozenset()) -> str:
+    if text == LINE_BREAK:
+        return "<w:r><w:br/></w:r>"
+    properties = (CODE_FONT if "code" in marks else "") + "".join(
+        tag for mark, tag in RUN_PROPERTIES if mark in marks
+    )
+    properties = f"<w:rPr>{properties}</w:rPr>" if properties else ""
+    return f'<w:r>{properties}<w:t xml:space="preserve">{escape(text)}</w:t></w:r>'
+
+
+def _paragraph(runs: str, style: str = "", indent: int = 0) -> str:
+    properties = f'<w:pStyle w:val="{style}"/>' if style else ""
+    if indent:
+        properties += f'<w:ind w:left="{indent}" w:hanging="360"/>'
+    properties = f"<w:pPr>{properties}</w:pPr>" if properties else ""
+    return f"<w:p>{properties}{runs}</w:p>"
+
+
+def render_blocks(blocks: Iterable[Block]) -> str:
+    """Render a chapter's blocks as WordprocessingML paragraphs."""
+    parts = []
+    counters: dict[int, int] = {}  # Ordered list item count per nesting level
+    for block in blocks:
+        if block.kind != "list_item":
+            counters.clear()
+        runs = "".join(_run(text, marks) for text, marks in block.runs)
+        if block.kind == "heading":
+            parts.append(_paragraph(runs, f"Heading{min(block.level + 1, 3)}"))
+        elif block.kind == "list_item":
+            for deeper in [level for level in counters if level > block.level]:
+                del counters[deeper]
+            if block.ordered:
+                counters[block.level] = counters.get(block.level, 0) + 1
+                marker = f"{counters[block.level]}."
+            else:
+                counters.pop(block.level, None)
+                marker = "•"
+            parts.append(_paragraph(_run(f"{marker}\t") + runs, "ListParagraph", indent=360 * (block.level + 1)))
+        elif block.kind == "quote":
+            parts.append(_paragraph(runs, "Quote"))
+        elif block.kind == "code":
+            lines = block.text.split("\n")
+            parts.append(_paragraph("<w:r><w:br/></w:r>".join(_run(line) for line in lines), "Code"))
+        elif block.kind == "rule":
+            parts.append(_paragraph(_run("*  *  *"), "Subtitle"))
+        else:
+            parts.append(_paragraph(runs))
+    return "".join(parts)
+
+
+def export_docx(project: ExportProject, chapters: Iterable[ExportChapter]) -> Iterator[bytes]:
+    """
+    Encode a manuscript as a DOCX package, streaming the zip as it is written.
+
+    Args:
+        project: Project metadata
+        chapters: The chapters, in order
+
+    Yields:
+        Chunks of the zip archive
+    """
+    archive = ZipStream()
+    archive.write("[Content_Types].xml", CONTENT_TYPES)
+    archive.write("_rels/.rels", PACKAGE_RELS)
+    archive.write("docProps/core.xml", CORE_PROPERTIES.format(
+        title=escape(project.title), author=escape(project.author or ""),
+    ))
+    archive.write("word/_rels/document.xml.rels", DOCUMENT_RELS)
+    archive.write("word/styles.xml", STYLES)
+    yield archive.drain()
+
+    with archive.open("word/document.xml") as document:
+        title = _paragraph(_run(project.title), "Title")
+        if project.author:
+            title += _paragraph(_run(project.author), "Subtitle")
+        document.write((DOCUMENT_START + title).encode("utf-8"))
+        for chapter in chapters:
+            heading = _paragraph(_run(chapter.title), "Heading1")
+            document.write((heading + render_blocks(parse_blocks(chapter.content))).encode("utf-8"))
+            yield archive.drain()
+        document.write(DOCUMENT_END.encode("utf-8"))
+
+    yield archive.close()
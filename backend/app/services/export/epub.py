@@ -0,0 +1,212 @@
+"""
+EPUB 3 manuscript export.
+
+The mimetype entry is written first and uncompressed, as the OCF spec
+requires, followed by one XHTML document per chapter. The package
+document and navigation document list every chapter, so they are
+written last, once the chapters have streamed; readers locate them via
+META-INF/container.xml rather than by position in the archive.
+"""
+
+import uuid
+from datetime import datetime, timezone
+from typing import Iterable, Iterator
+from xml.sax.saxutils import escape, quoteattr
+
+from .base import ExportChapter, ExportProject, ZipStream
+from .blocks import Block, LINE_BREAK, parse_blocks
+
+MEDIA_TYPE = "application/epub+zip"
+EXTENSION = "epub"
+LANGUAGE = "id"
+
+CONTAINER = """<?xml version="1.0" encoding="UTF-8"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+<rootfiles>
+<rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/>
+</rootfiles>
+</container>"""
+
+STYLESHEET = """body { font-family: serif; line-height: 1.5; }
+h1 { text-align: center; margin: 3em 0 2em; page-break-before: always; }
+p { margin: 0; text-indent: 1.5em; }
+h1 + p, h2 + p, h3 + p, hr + p { text-indent: 0; }
+blockquote { margin: 1em 2em; font-style: italic; }
+hr { border: none; text-align: center; margin: 1.5em 0; }
+hr::after { content: "* * *"; }
+.title-page { text-align: center; margin-top: 30%; }
+"""
+
+XHTML_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE html>
+<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" xml:lang="{lang}" lang="{lang}">
+<head><meta charset="UTF-8"/><title>{title}</title><link rel="stylesheet" type="text/css" href="style.css"/></head>
+<body>
+{body}
+</body>
+</html>"""
+
+MARK_TAGS = (("code", "code"), ("bold", "strong"), ("italic", "em"), ("underline", "u"), ("strike", "s"))
+
+
+def _chapter_file(number: int) -> str:
+    return f"chapter-{number:04d}.xhtml"
+
+
+def _identifier(project: ExportProject) -> str:
+    # Stable across exports, so readers treat a re-export as the same book
+    return f"urn:uuid:{uuid.uuid5(uuid.NAMESPACE_URL, f'diksiai:project:{project.id}')}"
+
+
+def _render_runs(block: Block) -> str:
+    parts = []
+    for text, marks in block.runs:
+        if text == LINE_BREAK:
+            parts.append("<br/>")
+            continue
+        text = escape(text)
+        for mark, tag in MARK_TAGS:
+            if mark in marks:
+                text = f"<{tag}>{text}</{tag}>"
+        parts.append(text)
+    return "".join(parts)
+
+
+def render_blocks(blocks: Iterable[Block]) -> str:
+    """Render a chapter's blocks as XHTML, rebuilding nested lists."""
+    parts = []
+    open_lists: list[str] = []  # Tag of each open list, outermost first
+
+    def close_lists(depth: int) -> None:
+        while len(open_lists) > depth:
+            parts.append(f"</li></{open_lists.pop()}>")
+
+    quote_open = False
+    for block in blocks:
+        if block.kind != "quote" and quote_open:
+            parts.append("</blockquote>")
+            quote_open = False
+
+        if block.kind == "list_item":
+            tag = "ol" if block.ordered else "ul"
+            close_lists(block.level)
+            if len(open_lists) == block.level and open_lists[-1] != tag:
+                close_lists(block.level - 1)
+            if len(open_lists) == block.level:
+                parts.append("</li>")
+            while len(open_lists) < block.level:
+                parts.append(f"<{tag}>")
+                open_lists.append(tag)
+                if len(open_lists) < block.level:
+                    parts.append("<li>")
+            parts.append(f"<li>{_render_runs(block)}")
+            continue
+
+        close_lists(0)
+        if block.kind == "heading":
+            level = min(block.level + 1, 6)
+            parts.append(f"<h{level}>{_render_runs(block)}</h{level}>")
+        elif block.kind == "quote":
+            if not quote_open:
+                parts.append("<blockquote>")
+                quote_open = True
+            parts.append(f"<p>{_render_runs(block)}</p>")
+        elif block.kind == "code":
+            parts.append(f"<pre><code>{escape(block.text)}</code></pre>")
+        elif block.kind == "rule":
+            parts.append("<hr/>")
+        else:
+            parts.append(f"<p>{_render_runs(block)}</p>")
+
+    close_lists(0)
+    if quote_open:
+        parts.append("</blockquote>")
+    return "\n".join(parts)
+
+
+def _package_document(project: ExportProject, identifier: str, chapters: list[tuple[int, str]]) -> str:
+    modified = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    manifest = [
+        '<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>',
+        '<item id="style" href="style.css" media-type="text/css"/>',
+        '<item id="title-page" href="title.xhtml" media-type="application/xhtml+xml"/>',
+    ]
+    spine = ['<itemref idref="title-page"/>']
+    for number, _ in chapters:
+        manifest.append(
+            f'<item id="chapter-{number}" href="{_chapter_file(number)}" media-type="application/xhtml+xml"/>'
+        )
+        spine.append(f'<itemref idref="chapter-{number}"/>')
+
+    metadata = [
+        f'<dc:identifier id="book-id">{identifier}</dc:identifier>',
+        f"<dc:title>{escape(project.title)}</dc:title>",
+        f"<dc:language>{LANGUAGE}</dc:language>",
+        f'<meta property="dcterms:modified">{modified}</meta>',
+    ]
+    if project.author:
+        metadata.append(f"<dc:creator>{escape(project.author)}</dc:creator>")
+    if project.description:
+        metadata.append(f"<dc:description>{escape(project.description)}</dc:description>")
+
+    newline = "\n"
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id" '
+        f'xml:lang="{LANGUAGE}">\n'
+        f'<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n{newline.join(metadata)}\n</metadata>\n'
+        f"<manifest>\n{newline.join(manifest)}\n</manifest>\n"
+        f"<spine>\n{newline.join(spine)}\n</spine>\n"
+        "</package>"
+    )
+
+
+def _navigation_document(project: ExportProject, chapters: list[tuple[int, str]]) -> str:
+    items = "\n".join(
+        f"<li><a href={quoteattr(_chapter_file(number))}>{escape(title)}</a></li>"
+        for number, title in chapters
+    )
+    body = f'<nav epub:type="toc" id="toc"><h1>Daftar Isi</h1>\n<ol>\n{items}\n</ol>\n</nav>'
+    return XHTML_TEMPLATE.format(lang=LANGUAGE, title=escape(project.title), body=body)
+
+
+def export_epub(project: ExportProject, chapters: Iterable[ExportChapter]) -> Iterator[bytes]:
+    """
+    Encode a manuscript as an EPUB 3 book, streaming the zip as it is written.
+
+    Args:
+        project: Project metadata
+        chapters: The chapters, in order
+
+    Yields:
+        Chunks of the zip archive
+    """
+    archive = ZipStream()
+    archive.write_stored("mimetype", MEDIA_TYPE.encode("ascii"))
+    archive.write("META-INF/container.xml", CONTAINER)
+    archive.write("OEBPS/style.css", STYLESHEET)
+
+    title_page = [f"<h2>{escape(project.title)}</h2>"]
+    if project.author:
+        title_page.append(f"<p>{escape(project.author)}</p>")
+    archive.write("OEBPS/title.xhtml", XHTML_TEMPLATE.format(
+        lang=LANGUAGE,
+        title=escape(project.title),
+        body='<section class="title-page">' + "\n".join(title_page) + "</section>",
+    ))
+    yield archive.drain()
+
+    # Only titles are kept for the table of contents
+    toc: list[tuple[int, str]] = []
+    for chapter in chapters:
+        toc.append((chapter.number, chapter.title))
+        body = f"<section epub:type=\"chapter\">\n<h1>{escape(chapter.title)}</h1>\n" \
+               f"{render_blocks(parse_blocks(chapter.content))}\n</section>"
+        archive.write(f"OEBPS/{_chapter_file(chapter.number)}", XHTML_TEMPLATE.format(
+            lang=LANGUAGE, title=escape(chapter.title), body=body,
+        ))
+        yield archive.drain()
+
+    archive.write("OEBPS/nav.xhtml", _navigation_document(project, toc))
+    archive.write("OEBPS/content.opf", _package_document(project, _identifier(project), toc))
+    yield archive.close()
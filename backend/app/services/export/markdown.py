@@ -0,0 +1,82 @@
+"""
+Markdown manuscript export.
+"""
+
+import re
+from typing import Iterable, Iterator
+
+from .base import ExportChapter, ExportProject
+from .blocks import Block, LINE_BREAK, parse_blocks
+
+MEDIA_TYPE = "text/markdown"
+EXTENSION = "md"
+
+MARK_DELIMITERS = (("code", "`"), ("bold", "**"), ("italic", "*"), ("strike", "~~"))
+_ESCAPE = re.compile(r"([\\`*_<\[\]])")
+_LINE_START = re.compile(r"^(\s*)([#>+\-]|\d+\.)(\s)", re.MULTILINE)
+
+
+def _escape(text: str) -> str:
+    return _LINE_START.sub(r"\1\\\2\3", _ESCAPE.sub(r"\\\1", text))
+
+
+def _render_runs(block: Block) -> str:
+    parts = []
+    for text, marks in block.runs:
+        if text == LINE_BREAK:
+            parts.append("  \n")
+            continue
+        if "code" not in marks:
+            text = _escape(text)
+        for mark, delimiter in MARK_DELIMITERS:
+            if mark in marks:
+                text = f"{delimiter}{text}{delimiter}"
+        parts.append(text)
+    return "".join(parts)
+
+
+def render_blocks(blocks: Iterable[Block]) -> str:
+    """Render a chapter's blocks as Markdown; headings start below the chapter title."""
+    lines = []
+    previous_kind = None
+    for block in blocks:
+        if block.kind == "list_item":
+            marker = "1." if block.ordered else "-"
+            line = f"{'   ' * (block.level - 1)}{marker} {_render_runs(block)}"
+            # List items stay together; anything else is separated by a blank line
+            lines.append(line if previous_kind == "list_item" else f"\n{line}")
+        elif block.kind == "heading":
+            lines.append(f"\n{'#' * min(block.level + 2, 6)} {_render_runs(block)}")
+        elif block.kind == "quote":
+            lines.append("\n" + "\n".join(f"> {line}" for line in _render_runs(block).split("\n")))
+        elif block.kind == "code":
+            lines.append(f"\n```\n{block.text}\n```")
+        elif block.kind == "rule":
+            lines.append("\n---")
+        else:
+            lines.append(f"\n{_render_runs(block)}")
+        previous_kind = block.kind
+    return "\n".join(lines).strip("\n") + "\n"
+
+
+def export_markdown(project: ExportProject, chapters: Iterable[ExportChapter]) -> Iterator[bytes]:
+    """
+    Encode a manuscript as Markdown, one chunk per chapter.
+
+    Args:
+        project: Project metadata
+        chapters: The chapters, in order
+
+    Yields:
+        UTF-8 encoded Markdown
+    """
+    header = [f"# {_escape(project.title)}\n"]
+    if project.author:
+        header.append(f"*{_escape(project.author)}*\n")
+    if project.description:
+        header.append(f"{_escape(project.description)}\n")
+    yield "\n".join(header).encode("utf-8")
+
+    for chapter in chapters:
+        body = render_blocks(parse_blocks(chapter.content))
+        yield f"\n## {_escape(chapter.title)}\n\n{body}".encode("utf-8")
@@ -0,0 +1,159 @@
+"""
+Manuscript import from .txt, .md and .docx files.
+
+The upload is read as a stream of paragraphs and split into chapters at
+headings: Markdown # / ## headings, Word Title / Heading 1 paragraphs,
+and short paragraphs matching the configured heading patterns (e.g.
+"BAB 3" or "Prolog"). Chapters are appended to the project with batched
+inserts in a single transaction, so a failed import leaves no chapters
+behind.
+"""
+
+import re
+from functools import lru_cache
+from pathlib import PurePath
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from sqlalchemy.orm import Session
+
+from ...config import get_settings
+from ...constants import MAX_CONTENT_LENGTH, MAX_TITLE_LENGTH
+from ...repositories import ChapterRepository
+from .readers import READERS, Paragraph, ReadProgress
+
+# Paragraphs longer than this are never treated as headings
+MAX_HEADING_LENGTH = 120
+
+
+class ManuscriptImportError(ValueError):
+    """The upload can't be imported; the message is safe to show to the user."""
+
+
+@lru_cache()
+def get_heading_patterns() -> tuple[re.Pattern, ...]:
+    """Compile the configured chapter heading patterns (case-insensitive)."""
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in get_settings().import_heading_patterns)
+
+
+def supported_extension(filename: Optional[str]) -> Optional[str]:
+    """Return the file's extension if it can be imported, else None."""
+    extension = PurePath(filename or "").suffix.lower()
+    return extension if extension in READERS else None
+
+
+def _is_heading(paragraph: Paragraph, patterns: Iterable[re.Pattern]) -> bool:
+    if paragraph.chapter_heading:
+        return True
+    if not paragraph.text or len(paragraph.text) > MAX_HEADING_LENGTH:
+        return False
+    return any(pattern.match(paragraph.text) for pattern in patterns)
+
+
+def split_chapters(
+    paragraphs: Iterable[Paragraph],
+    default_title: str,
+    patterns: Optional[Iterable[re.Pattern]] = None,
+) -> Iterator[dict]:
+    """
+    Group paragraphs into chapters, yielding each chapter once it is complete.
+
+    Text before the first heading, or the whole file if it has no
+    headings, becomes a chapter titled default_title.
+
+    Args:
+        paragraphs: The manuscript's paragraphs, in order
+        default_title: Title for text not under any heading
+        patterns: Heading patterns (default: the configured ones)
+
+    Yields:
+        Dicts with the title and content (editor HTML) of each chapter
+
+    Raises:
+        ManuscriptImportError: If a chapter exceeds MAX_CONTENT_LENGTH
+    """
+    patterns = tuple(patterns) if patterns is not None else get_heading_patterns()
+    title = default_title
+    parts: list[str] = []
+    length = 0
+    started = False
+
+    def chapter() -> dict:
+        return {"title": title[:MAX_TITLE_LENGTH], "content": "".join(parts)}
+
+    for paragraph in paragraphs:
+        if _is_heading(paragraph, patterns):
+            if parts or started:
+                yield chapter()
+            title = " ".join(paragraph.text.split()) or default_title
+            parts, length, started = [], 0, True
+            continue
+        if not paragraph.html:
+            continue
+        length += len(paragraph.html)
+        if length > MAX_CONTENT_LENGTH:
+            raise ManuscriptImportError(
+                f'Chapter "{title[:50]}" exceeds {MAX_CONTENT_LENGTH} characters; '
+                "add chapter headings to split it"
+            )
+        parts.append(paragraph.html)
+
+    if parts or started:
+        yield chapter()
+
+
+def import_manuscript(
+    db: Session,
+    project_id: int,
+    stream: BinaryIO,
+    filename: str,
+    on_progress: Optional[ReadProgress] = None,
+) -> list[int]:
+    """
+    Import a manuscript file as new chapters at the end of a project.
+
+    Args:
+        db: Database session
+        project_id: The project ID (ownership must already be checked)
+        stream: The uploaded file, opened in binary mode and seekable
+        filename: The upload's file name, used for its type and default title
+        on_progress: Called with (bytes read, total bytes) while parsing
+
+    Returns:
+        IDs of the created chapters, in order
+
+    Raises:
+        ManuscriptImportError: If the file type is unsupported, the file
+            can't be parsed, or it contains no text
+    """
+    extension = supported_extension(filename)
+    if extension is None:
+        raise ManuscriptImportError(f"Unsupported file type; use one of: {', '.join(READERS)}")
+
+    default_title = PurePath(filename).stem[:MAX_TITLE_LENGTH] or "Naskah"
+    repo = ChapterRepository(db)
+    try:
+        paragraphs = READERS[extension](stream, on_progress)
+        chapter_ids = repo.bulk_create(project_id, split_chapters(paragraphs, default_title), auto_commit=False)
+    except ValueError as e:  # Includes ManuscriptImportError
+        db.rollback()
+        raise ManuscriptImportError(str(e))
+    except Exception:
+        db.rollback()
+        raise
+
+    if not chapter_ids:
+        db.rollback()
+        raise ManuscriptImportError("The file contains no text to import")
+
+    db.commit()
+    return chapter_ids
+
+
+__all__ = [
+    "ManuscriptImportError",
+    "READERS",
+    "get_heading_patterns",
+    "import_manuscript",
+    "split_chapters",
+    "supported_extension",
+]
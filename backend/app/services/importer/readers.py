@@ -0,0 +1,241 @@
+"""
+Streaming readers turning uploaded manuscripts into paragraphs.
+
+Each reader consumes a binary file incrementally and yields Paragraph
+objects holding editor HTML and the plain text used for chapter heading
+detection, so a large manuscript is never decoded in one piece.
+"""
+
+import io
+import re
+import zipfile
+from dataclasses import dataclass
+from html import escape
+from typing import BinaryIO, Callable, Iterator, Optional
+from xml.etree import ElementTree
+
+# Called with (bytes read, total bytes) as a file is consumed
+ReadProgress = Callable[[int, int], None]
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DOCX_DOCUMENT = "word/document.xml"
+# Paragraph styles starting a chapter; localized Word versions keep these IDs
+DOCX_CHAPTER_STYLES = {"title", "heading1"}
+DOCX_SUBHEADING_STYLES = {"heading2": "h2", "heading3": "h3"}
+
+_MD_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_MD_BOLD = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_MD_ITALIC = re.compile(r"(\*|_)(?=\S)(.+?)(?<=\S)\1")
+_MD_RULE = re.compile(r"^\s*([*_-])(\s*\1){2,}\s*$")
+
+
+@dataclass
+class Paragraph:
+    """A paragraph of imported text."""
+    html: str
+    text: str
+    chapter_heading: bool = False  # Marked as a chapter heading by the source format
+
+
+class _CountingReader(io.RawIOBase):
+    """Raw reader over a binary stream, reporting the bytes read so far."""
+
+    def __init__(self, stream: BinaryIO, total: int, on_progress: Optional[ReadProgress]):
+        self._stream = stream
+        self._total = total
+        self._on_progress = on_progress
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        data = self._stream.read(len(buffer))
+        buffer[:len(data)] = data
+        self.bytes_read += len(data)
+        if self._on_progress and data:
+            self._on_progress(self.bytes_read, self._total)
+        return len(data)
+
+
+def _stream_size(stream: BinaryIO) -> int:
+    position = stream.tell()
+    size = stream.seek(0, io.SEEK_END)
+    stream.seek(position)
+    return size - position
+
+
+def _text_lines(stream: BinaryIO, on_progress: Optional[ReadProgress]) -> Iterator[str]:
+    raw = _CountingReader(stream, _stream_size(stream), on_progress)
+    # utf-8-sig drops the BOM Windows editors write
+    text = io.TextIOWrapper(io.BufferedReader(raw), encoding="utf-8-sig", errors="replace")
+    for line in text:
+        yield line.rstrip("\r\n")
+
+
+def read_text(stream: BinaryIO, on_progress: Optional[ReadProgress] = None) -> Iterator[Paragraph]:
+    """Read a plain text file; every non-empty line is a paragraph."""
+    for line in _text_lines(stream, on_progress):
+        line = line.strip()
+        if line:
+            yield Paragraph(html=f"<p>{escape(line, quote=False)}</p>", text=line)
+
+
+def _markdown_inline(text: str) -> str:
+    html = escape(text, quote=False)
+    html = _MD_BOLD.sub(r"<strong>\2</strong>", html)
+    return _MD_ITALIC.sub(r"<em>\2</em>", html)
+
+
+def read_markdown(stream: BinaryIO, on_progress: Optional[ReadProgress] = None) -> Iterator[Paragraph]:
+    """
+    Read a Markdown file.
+
+    Paragraphs are separated by blank lines; # and ## headings start
+    chapters, deeper headings stay in the chapter.
+    """
+    lines: list[str] = []
+
+    def flush() -> Iterator[Paragraph]:
+        if lines:
+            text = " ".join(lines)
+            lines.clear()
+            yield Paragraph(html=f"<p>{_markdown_inline(text)}</p>", text=text)
+
+    for line in _text_lines(stream, on_progress):
+        stripped = line.strip()
+        heading = _MD_HEADING.match(stripped)
+        if heading:
+            yield from flush()
+            level, title = len(heading.group(1)), heading.group(2)
+            if level <= 2:
+                yield Paragraph(html="", text=title, chapter_heading=True)
+            else:
+                tag = f"h{min(level - 1, 3)}"
+                yield Paragraph(html=f"<{tag}>{_markdown_inline(title)}</{tag}>", text=title)
+        elif _MD_RULE.match(stripped):
+            yield from flush()
+            yield Paragraph(html="<hr>", text="")
+        elif stripped.startswith(">"):
+            yield from flush()
+            quote = stripped.lstrip("> ").strip()
+            if quote:
+                yield Paragraph(html=f"<blockquote><p>{_markdown_inline(quote)}</p></blockquote>", text=quote)
+        elif stripped:
+            lines.append(stripped)
+        else:
+            yield from flush()
+    yield from flush()
+
+
+def _is_on(properties: Optional[ElementTree.Element], tag: str) -> bool:
+    if properties is None:
+        return False
+    element = properties.find(_W + tag)
+    return element is not None and element.get(_W + "val", "true") not in ("0", "false", "none")
+
+
+def _docx_paragraph(element: ElementTree.Element) -> Optional[Paragraph]:
+    properties = element.find(_W + "pPr")
+    style = ""
+    if properties is not None:
+        style_element = properties.find(_W + "pStyle")
+        if style_element is not None:
+            style = style_element.get(_W + "val", "").lower()
+
+    html_parts, text_parts = [], []
+    for run in element.iter(_W + "r"):
+        run_properties = run.find(_W + "rPr")
+        run_text = []
+        for child in run:
+            if child.tag == _W + "t":
+                run_text.append(child.text or "")
+            elif child.tag == _W + "tab":
+                run_text.append("\t")
+            elif child.tag in (_W + "br", _W + "cr"):
+                if run_text:
+                    html_parts.append(escape("".join(run_text), quote=False))
+                    text_parts.append("".join(run_text))
+                    run_text = []
+                html_parts.append("<br>")
+                text_parts.append(" ")
+        if not run_text:
+            continue
+        text = "".join(run_text)
+        text_parts.append(text)
+        html = escape(text, quote=False)
+        if _is_on(run_properties, "i"):
+            html = f"<em>{html}</em>"
+        if _is_on(run_properties, "b"):
+            html = f"<strong>{html}</strong>"
+        html_parts.append(html)
+
+    text = "".join(text_parts).strip()
+    if not text:
+        return None
+    if style in DOCX_CHAPTER_STYLES:
+        return Paragraph(html="", text=text, chapter_heading=True)
+    if style in DOCX_SUBHEADING_STYLES:
+        tag = DOCX_SUBHEADING_STYLES[style]
+        return Paragraph(html=f"<{tag}>{escape(text, quote=False)}</{tag}>", text=text)
+    if style in ("quote", "intensequote"):
+        return Paragraph(html=f"<blockquote><p>{''.join(html_parts)}</p></blockquote>", text=text)
+    return Paragraph(html=f"<p>{''.join(html_parts)}</p>", text=text)
+
+
+def read_docx(stream: BinaryIO, on_progress: Optional[ReadProgress] = None) -> Iterator[Paragraph]:
+    """
+    Read the body of a Word document.
+
+    word/document.xml is parsed incrementally and each top-level body
+    element is discarded once handled, so memory stays flat however
+    long the document is. Title and Heading 1 paragraphs start chapters;
+    table cells are read as plain paragraphs.
+
+    Raises:
+        ValueError: If the file is not a Word document
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+        info = archive.getinfo(DOCX_DOCUMENT)
+    except (zipfile.BadZipFile, KeyError):
+        raise ValueError("Not a valid .docx file")
+
+    with archive.open(info) as document:
+        reader = _CountingReader(document, info.file_size, on_progress)
+        depth = 0
+        body = None
+        try:
+            for event, element in ElementTree.iterparse(reader, events=("start", "end")):
+                if event == "start":
+                    depth += 1
+                    if depth == 2 and element.tag == _W + "body":
+                        body = element
+                    continue
+
+                depth -= 1
+                if depth != 2 or body is None:
+                    continue
+                # A top-level body element is complete
+                if element.tag == _W + "p":
+                    paragraphs = [element]
+                elif element.tag == _W + "tbl":
+                    paragraphs = list(element.iter(_W + "p"))
+                else:
+                    paragraphs = []
+                for paragraph_element in paragraphs:
+                    paragraph = _docx_paragraph(paragraph_element)
+                    if paragraph is not None:
+                        yield paragraph
+                body.clear()
+        except ElementTree.ParseError:
+            raise ValueError("The .docx document is malformed")
+
+
+# Readers by file extension
+READERS: dict[str, Callable[..., Iterator[Paragraph]]] = {
+    ".txt": read_text,
+    ".md": read_markdown,
+    ".markdown": read_markdown,
+    ".docx": read_docx,
+}
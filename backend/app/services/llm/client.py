@@ -3,10 +3,20 @@ LLM Client factory for managing different LLM providers.
 
 This module provides a factory class for creating LLM clients
 based on the specified model and available API keys.
+
+The groq SDK (and the httpx stack under it) takes a few hundred
+milliseconds to import, so it is only imported when the first client is
+built. Clients are built once per API key and reused, which also keeps
+their HTTP connections and TLS context alive between calls.
 """
 
-from groq import Groq
-from app.config import get_settings
+import threading
+from typing import TYPE_CHECKING
+
+from app.config import get_settings, MODEL_API_KEY_REGISTRY, DEFAULT_API_KEY_ATTR
+
+if TYPE_CHECKING:
+    from groq import Groq
 
 
 class LLMClientFactory:
@@ -14,8 +24,10 @@ class LLMClientFactory:
 
     def __init__(self):
         self.settings = get_settings()
+        self._clients: dict[str, "Groq"] = {}
+        self._lock = threading.Lock()
 
-    def get_client(self, model: str) -> Groq:
+    def get_client(self, model: str) -> "Groq":
         """
         Get the appropriate client for the given model.
 
@@ -23,7 +35,8 @@ class LLMClientFactory:
             model: The model identifier
 
         Returns:
-            A configured Groq client instance with 30s timeout
+            A configured Groq client instance with 30s timeout, shared by
+            all models using the same API key
 
         Raises:
             ValueError: If no API key is configured for the model
@@ -33,10 +46,41 @@ class LLMClientFactory:
         if not api_key:
             raise ValueError(f"No API key configured for model: {model}")
 
-        # For now, we use Groq client for all models
-        # OpenRouter uses OpenAI-compatible API, so Groq client works
-        # Configure 30s timeout to prevent hanging requests
-        return Groq(api_key=api_key, timeout=30.0)
+        client = self._clients.get(api_key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(api_key)
+                if client is None:
+                    from groq import Groq
+
+                    # For now, we use Groq client for all models
+                    # OpenRouter uses OpenAI-compatible API, so Groq client works
+                    # Configure 30s timeout to prevent hanging requests
+                    client = self._clients[api_key] = Groq(api_key=api_key, timeout=30.0)
+        return client
+
+    def warm_up(self) -> None:
+        """Build the clients of every model that has an API key configured."""
+        for info in self.get_available_models():
+            if info["available"]:
+                self.get_client(info["model"])
+
+    def get_provider(self, model: str) -> str:
+        """
+        Get the name of the provider serving the given model.
+
+        Args:
+            model: The model identifier
+
+        Returns:
+            The provider name, e.g. "groq" or "openrouter"
+        """
+        api_key_attr = DEFAULT_API_KEY_ATTR
+        for prefix, attr in MODEL_API_KEY_REGISTRY:
+            if model.startswith(prefix):
+                api_key_attr = attr
+                break
+        return api_key_attr.removesuffix("_api_key")
 
     def is_model_available(self, model: str) -> bool:
         """
@@ -8,7 +8,10 @@ title suggestions, and live review.
 
 import json
 import re
+import time
 
+from app.utils.metrics import LLM_ERRORS, LLM_REQUEST_DURATION, LLM_TIME_TO_FIRST_TOKEN, LLM_TOKENS
+from app.utils.tracing import span
 from .client import LLMClientFactory
 from .sanitizer import sanitize_user_input
 from .styles import get_writing_style, get_title_style, WRITING_STYLES, TITLE_STYLES
@@ -23,7 +26,10 @@ class LLMService:
 
     def __init__(self):
         self.client_factory = LLMClientFactory()
-        print("✓ LLM Service initialized")
+
+    def warm_up(self) -> None:
+        """Build the API clients ahead of the first AI request."""
+        self.client_factory.warm_up()
 
     async def generate_continuation(
         self,
@@ -52,29 +58,30 @@ class LLMService:
         Returns:
             Generated continuation text
         """
-        client = self.client_factory.get_client(model)
-        style_description = get_writing_style(writing_style, custom_prompts)
+        with span("prompt"):
+            style_description = get_writing_style(writing_style, custom_prompts)
 
-        # Build task instruction
-        task_instruction = self._build_continuation_instruction(
-            paragraph_count, brief_idea
-        )
+            # Build task instruction
+            task_instruction = self._build_continuation_instruction(
+                paragraph_count, brief_idea
+            )
 
-        messages = [
-            {"role": "system", "content": style_description},
-            {
-                "role": "user",
-                "content": f"""Konteks:
+            messages = [
+                {"role": "system", "content": style_description},
+                {
+                    "role": "user",
+                    "content": f"""Konteks:
 {context}
 
 {task_instruction}
 
 Kelanjutan:"""
-            }
-        ]
+                }
+            ]
 
-        response = client.chat.completions.create(
-            model=model,
+        response = self._complete(
+            "continuation",
+            model,
             messages=messages,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -106,15 +113,15 @@ Kelanjutan:"""
         Returns:
             Improved text
         """
-        client = self.client_factory.get_client(model)
-        style_description = get_writing_style(writing_style, custom_prompts)
-        sanitized_instruction = sanitize_user_input(instruction, max_length=500)
-
-        messages = [
-            {"role": "system", "content": style_description},
-            {
-                "role": "user",
-                "content": f"""Teks Asli:
+        with span("prompt"):
+            style_description = get_writing_style(writing_style, custom_prompts)
+            sanitized_instruction = sanitize_user_input(instruction, max_length=500)
+
+            messages = [
+                {"role": "system", "content": style_description},
+                {
+                    "role": "user",
+                    "content": f"""Teks Asli:
 {text}
 
 Tugas: {sanitized_instruction}
@@ -122,11 +129,12 @@ Tugas: {sanitized_instruction}
 ATURAN PENTING: Perbaiki teks dengan mengikuti gaya sastrawi yang dipilih. Pertahankan inti cerita dan suasana emosi, tetapi tingkatkan kualitas bahasa sesuai gaya penulisan. Tulis HANYA dalam BAHASA INDONESIA.
 
 Teks yang Diperbaiki:"""
-            }
-        ]
+                }
+            ]
 
-        response = client.chat.completions.create(
-            model=model,
+        response = self._complete(
+            "improvement",
+            model,
             messages=messages,
             temperature=temperature,
             stop=["Teks Asli:", "Tugas:"]
@@ -153,13 +161,13 @@ Teks yang Diperbaiki:"""
         Returns:
             List of suggested titles (up to 5)
         """
-        client = self.client_factory.get_client(model)
-        style_desc = get_title_style(title_style)
+        with span("prompt"):
+            style_desc = get_title_style(title_style)
 
-        messages = [
-            {
-                "role": "system",
-                "content": f"""Kamu adalah asisten penulis yang ahli dalam membuat judul cerita yang menarik.
+            messages = [
+                {
+                    "role": "system",
+                    "content": f"""Kamu adalah asisten penulis yang ahli dalam membuat judul cerita yang menarik.
 
 Gaya judul yang diminta: {style_desc}
 
@@ -171,26 +179,28 @@ Tugas: Buat 5 judul berbeda yang sesuai dengan gaya tersebut. Setiap judul harus
 5. Judul kelima
 
 Tulis HANYA dalam BAHASA INDONESIA."""
-            },
-            {
-                "role": "user",
-                "content": f"""Konten Cerita:
+                },
+                {
+                    "role": "user",
+                    "content": f"""Konten Cerita:
 {content[:2000]}
 
 Berdasarkan konten di atas, buatlah 5 judul yang sesuai dengan gaya: {style_desc}
 
 Judul:"""
-            }
-        ]
+                }
+            ]
 
-        response = client.chat.completions.create(
-            model=model,
+        response = self._complete(
+            "title_suggestion",
+            model,
             messages=messages,
             temperature=temperature,
             max_tokens=10000
         )
 
-        return self._parse_titles(response.choices[0].message.content.strip())
+        with span("parse"):
+            return self._parse_titles(response.choices[0].message.content.strip())
 
     async def live_review(
         self,
@@ -209,22 +219,23 @@ Judul:"""
         Returns:
             List of issues with positions, severity, suggestions, and explanations
         """
-        client = self.client_factory.get_client(model)
+        with span("prompt"):
 
-        messages = [
-            {"role": "system", "content": self._get_review_system_prompt()},
-            {
-                "role": "user",
-                "content": f"""Analisis teks berikut dan identifikasi bagian yang perlu diperbaiki:
+            messages = [
+                {"role": "system", "content": self._get_review_system_prompt()},
+                {
+                    "role": "user",
+                    "content": f"""Analisis teks berikut dan identifikasi bagian yang perlu diperbaiki:
 
 {content}
 
 Kembalikan hasil analisis dalam format JSON array:"""
-            }
-        ]
+                }
+            ]
 
-        response = client.chat.completions.create(
-            model=model,
+        response = self._complete(
+            "live_review",
+            model,
             messages=messages,
             temperature=temperature,
             max_tokens=4000
@@ -233,6 +244,43 @@ Kembalikan hasil analisis dalam format JSON array:"""
         result_text = response.choices[0].message.content.strip()
         return self._parse_review_issues(result_text, content)
 
+    def _complete(self, operation: str, model: str, **kwargs):
+        """
+        Run a chat completion, recording its latency, tokens and errors.
+
+        Args:
+            operation: Name of the AI operation, for metrics
+            model: Model to use
+            **kwargs: Passed to chat.completions.create
+
+        Returns:
+            The completion response
+        """
+        client = self.client_factory.get_client(model)
+        labels = {
+            "operation": operation,
+            "model": model,
+            "provider": self.client_factory.get_provider(model),
+        }
+        started = time.perf_counter()
+        try:
+            with span("upstream"):
+                response = client.chat.completions.create(model=model, **kwargs)
+        except Exception as e:
+            LLM_REQUEST_DURATION.observe(time.perf_counter() - started, outcome="error", **labels)
+            LLM_ERRORS.inc(error=type(e).__name__, **labels)
+            raise
+
+        elapsed = time.perf_counter() - started
+        LLM_REQUEST_DURATION.observe(elapsed, outcome="ok", **labels)
+        # Replies aren't streamed, so the first token arrives with the rest
+        LLM_TIME_TO_FIRST_TOKEN.observe(elapsed, **labels)
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            LLM_TOKENS.inc(usage.prompt_tokens or 0, kind="prompt", **labels)
+            LLM_TOKENS.inc(usage.completion_tokens or 0, kind="completion", **labels)
+        return response
+
     def check_model_available(self, model: str = "openai/gpt-oss-120b") -> bool:
         """Check if the specified model is available."""
         return self.client_factory.is_model_available(model)
@@ -325,45 +373,47 @@ Kembalikan HANYA JSON array tanpa penjelasan tambahan. Format:
 
     def _parse_review_issues(self, result_text: str, content: str) -> list[dict]:
         """Parse review issues from LLM response and calculate positions."""
-        try:
-            json_match = re.search(r'\[[\s\S]*\]', result_text)
-            if json_match:
-                issues_raw = json.loads(json_match.group())
-            else:
-                issues_raw = json.loads(result_text)
-        except json.JSONDecodeError:
-            return []
-
-        issues = []
-        used_positions = set()
-
-        for issue in issues_raw:
-            original_text = issue.get("original_text", "")
-            if not original_text:
-                continue
-
-            search_start = 0
-            while True:
-                start_offset = content.find(original_text, search_start)
-                if start_offset == -1:
-                    break
-                end_offset = start_offset + len(original_text)
-
-                position_key = (start_offset, end_offset)
-                if position_key not in used_positions:
-                    used_positions.add(position_key)
-                    issues.append({
-                        "original_text": original_text,
-                        "start_offset": start_offset,
-                        "end_offset": end_offset,
-                        "severity": issue.get("severity", "warning"),
-                        "issue_type": issue.get("issue_type", "style"),
-                        "suggestion": issue.get("suggestion", original_text),
-                        "explanation": issue.get("explanation", "")
-                    })
-                    break
-
-                search_start = start_offset + 1
+        with span("parse"):
+            try:
+                json_match = re.search(r'\[[\s\S]*\]', result_text)
+                if json_match:
+                    issues_raw = json.loads(json_match.group())
+                else:
+                    issues_raw = json.loads(result_text)
+            except json.JSONDecodeError:
+                return []
+
+        with span("offsets"):
+            issues = []
+            used_positions = set()
+
+            for issue in issues_raw:
+                original_text = issue.get("original_text", "")
+                if not original_text:
+                    continue
+
+                search_start = 0
+                while True:
+                    start_offset = content.find(original_text, search_start)
+                    if start_offset == -1:
+                        break
+                    end_offset = start_offset + len(original_text)
+
+                    position_key = (start_offset, end_offset)
+                    if position_key not in used_positions:
+                        used_positions.add(position_key)
+                        issues.append({
+                            "original_text": original_text,
+                            "start_offset": start_offset,
+                            "end_offset": end_offset,
+                            "severity": issue.get("severity", "warning"),
+                            "issue_type": issue.get("issue_type", "style"),
+                            "suggestion": issue.get("suggestion", original_text),
+                            "explanation": issue.get("explanation", "")
+                        })
+                        break
+
+                    search_start = start_offset + 1
 
         return issues
 
@@ -12,7 +12,9 @@ from typing import Callable, Any
 
 from fastapi import HTTPException
 
-from ..services.llm import llm_service
+from ..config import get_settings
+
+settings = get_settings()
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,7 @@ logger = logging.getLogger(__name__)
 class AIRequestContext:
     """Context object for AI requests with logging and timing."""
 
-    def __init__(self, request_id: int, operation: str):
+    def __init__(self, request_id: str, operation: str):
         self.request_id = request_id
         self.operation = operation
         self.start_time = time.time()
@@ -66,7 +68,7 @@ class AIRequestContext:
         return time.time() - self.start_time
 
 
-def validate_model_availability(model: str, request_id: int) -> None:
+def validate_model_availability(model: str, request_id: str) -> None:
     """
     Validate that the specified model is available.
 
@@ -77,7 +79,7 @@ def validate_model_availability(model: str, request_id: int) -> None:
     Raises:
         HTTPException: If the model is not available (503)
     """
-    if not llm_service.check_model_available(model):
+    if not settings.get_api_key_for_model(model):
         logger.error(f"[{request_id}] Model {model} not available")
         raise HTTPException(
             status_code=503,
@@ -1,23 +1,60 @@
-from passlib.context import CryptContext
+from functools import lru_cache
 from jose import JWTError, jwt
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from ..config import get_settings
 
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
 settings = get_settings()
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+@lru_cache(maxsize=None)
+def get_pwd_context() -> "CryptContext":
+    """
+    Get the password hashing context, building it on first use.
+
+    Rounds are pinned to exactly the configured cost, so hashes made with a
+    different cost (higher or lower) are flagged for rehashing on the
+    user's next login. passlib is only imported here, as most requests
+    never hash a password.
+    """
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.password_bcrypt_rounds,
+        bcrypt__min_rounds=settings.password_bcrypt_rounds,
+        bcrypt__max_rounds=settings.password_bcrypt_rounds,
+    )
+
+
+def load_password_backend() -> None:
+    """Build the hashing context and load its bcrypt backend."""
+    get_pwd_context().handler().get_backend()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against a hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if the stored hash is outdated.
+
+    Returns:
+        Tuple of (valid, new_hash); new_hash is set only when the password
+        is valid and its hash uses other cost settings than the current ones
+    """
+    return get_pwd_context().verify_and_update(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Hash a password"""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
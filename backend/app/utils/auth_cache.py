@@ -0,0 +1,98 @@
+"""
+In-process cache of authenticated user identities.
+
+Every authenticated request resolves its bearer token to a user. Most
+endpoints only need the user's id, approval and admin flags, so those
+fields are kept in a small TTL/LRU cache and the users table is only
+queried on a miss. Updates and deletes of User rows made through the ORM evict the
+entry straight away; changes made outside this process (another worker,
+or SQL run by hand) are picked up once the entry expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+
+from ..config import get_settings
+from ..models import User
+
+
+@dataclass(frozen=True)
+class CurrentIdentity:
+    """The auth-relevant fields of the current user."""
+
+    id: int
+    is_approved: bool
+    is_admin: bool = False
+
+    @classmethod
+    def from_user(cls, user: User) -> "CurrentIdentity":
+        return cls(id=user.id, is_approved=bool(user.is_approved), is_admin=bool(user.is_admin))
+
+
+class IdentityCache:
+    """
+    Thread-safe TTL/LRU cache of CurrentIdentity keyed by user id.
+
+    Args:
+        ttl_seconds: How long an entry may be served; 0 disables the cache
+        max_entries: Least recently used entries are dropped beyond this
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, tuple[float, CurrentIdentity]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int) -> Optional[CurrentIdentity]:
+        """Return the cached identity, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires_at, identity = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return identity
+
+    def put(self, identity: CurrentIdentity) -> None:
+        """Cache an identity for ttl_seconds."""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[identity.id] = (time.monotonic() + self.ttl_seconds, identity)
+            self._entries.move_to_end(identity.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop the entry for one user."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+settings = get_settings()
+identity_cache = IdentityCache(settings.auth_cache_ttl_seconds, settings.auth_cache_max_entries)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User) -> None:
+    """Evict a user whose row was changed or removed through the ORM."""
+    if target.id is not None:
+        identity_cache.invalidate(target.id)
@@ -0,0 +1,128 @@
+"""
+Compression codecs for chapter content at rest.
+
+Stored values start with a one-byte header naming the codec, followed by
+the UTF-8 text encoded with it:
+
+    0x00  raw UTF-8
+    0x01  zlib
+    0x02  zstd (requires the optional ``zstandard`` package)
+
+Values written before compression was introduced are plain strings and
+are returned unchanged.
+"""
+
+import logging
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+CODECS = {"none": CODEC_RAW, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+ZLIB_LEVEL = 6
+ZSTD_LEVEL = 9
+
+
+def resolve_codec(name: str) -> int:
+    """
+    Map a configured codec name to its header byte.
+
+    Falls back to zlib when zstd is requested but not installed.
+
+    Args:
+        name: "none", "zlib" or "zstd"
+
+    Returns:
+        The codec header byte
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name not in CODECS:
+        raise ValueError(f"Unknown content compression codec '{name}', expected one of {sorted(CODECS)}")
+    codec = CODECS[name]
+    if codec == CODEC_ZSTD and zstandard is None:
+        logger.warning("zstandard is not installed, compressing chapter content with zlib")
+        return CODEC_ZLIB
+    return codec
+
+
+def compress_text(text: str, codec: int, min_size: int = 0) -> bytes:
+    """
+    Encode text for storage.
+
+    Text shorter than min_size, or that doesn't shrink, is stored raw.
+
+    Args:
+        text: The text to store
+        codec: Codec header byte to compress with
+        min_size: Minimum UTF-8 size in bytes worth compressing
+
+    Returns:
+        Header byte followed by the encoded text
+    """
+    data = text.encode("utf-8")
+    if codec != CODEC_RAW and len(data) >= min_size:
+        if codec == CODEC_ZLIB:
+            compressed = zlib.compress(data, ZLIB_LEVEL)
+        else:
+            compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        if len(compressed) < len(data):
+            return bytes([codec]) + compressed
+    return bytes([CODEC_RAW]) + data
+
+
+def stored_codec(value: bytes | str | None) -> int | None:
+    """
+    Get the codec a stored value was written with.
+
+    Args:
+        value: The stored value
+
+    Returns:
+        The codec header byte, or None for legacy plain-text and NULL values
+    """
+    if value is None or isinstance(value, str):
+        return None
+    return value[0] if value else None
+
+
+def decompress_text(value: bytes | memoryview | str | None) -> str | None:
+    """
+    Decode a stored value back to text.
+
+    Args:
+        value: The stored value, or a legacy plain string
+
+    Returns:
+        The text, or None for NULL
+
+    Raises:
+        ValueError: If the header names an unknown codec
+        RuntimeError: If the value is zstd-compressed and zstandard is not installed
+    """
+    if value is None or isinstance(value, str):
+        return value
+    value = bytes(value)
+    if not value:
+        return ""
+
+    codec, payload = value[0], value[1:]
+    if codec == CODEC_RAW:
+        return payload.decode("utf-8")
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("Chapter content is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    raise ValueError(f"Unknown content codec header {codec}")
@@ -0,0 +1,86 @@
+"""
+Database maintenance utilities for the SQLite storage profile.
+
+This module provides WAL checkpointing and query planner maintenance,
+plus a background loop that checkpoints the WAL periodically so it
+does not grow without bound between restarts.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_MODES = {"PASSIVE", "FULL", "RESTART", "TRUNCATE"}
+
+
+def checkpoint_wal(engine: Engine, mode: str = "PASSIVE") -> tuple[int, int, int] | None:
+    """
+    Run a WAL checkpoint.
+
+    Args:
+        engine: The database engine
+        mode: Checkpoint mode (PASSIVE never blocks readers or writers)
+
+    Returns:
+        Tuple of (busy, wal_pages, checkpointed_pages), or None if the
+        database is not SQLite
+    """
+    if engine.dialect.name != "sqlite":
+        return None
+    if mode not in CHECKPOINT_MODES:
+        raise ValueError(f"Unknown checkpoint mode: {mode}")
+
+    with engine.connect() as connection:
+        busy, wal_pages, checkpointed = connection.execute(
+            text(f"PRAGMA wal_checkpoint({mode})")
+        ).one()
+    return busy, wal_pages, checkpointed
+
+
+def optimize(engine: Engine) -> None:
+    """
+    Run PRAGMA optimize so the query planner statistics stay current.
+
+    Args:
+        engine: The database engine
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.connect() as connection:
+        connection.execute(text("PRAGMA optimize"))
+
+
+async def run_periodic_checkpoint(engine: Engine, interval: float) -> None:
+    """
+    Checkpoint the WAL every ``interval`` seconds until cancelled.
+
+    Args:
+        engine: The database engine
+        interval: Seconds between checkpoints
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await run_in_threadpool(checkpoint_wal, engine)
+            logger.debug(f"WAL checkpoint (busy, log, checkpointed): {result}")
+        except Exception as e:
+            logger.warning(f"WAL checkpoint failed: {e}")
+
+
+def shutdown(engine: Engine) -> None:
+    """
+    Run end-of-process maintenance: optimize and truncate the WAL.
+
+    Args:
+        engine: The database engine
+    """
+    try:
+        optimize(engine)
+        checkpoint_wal(engine, "TRUNCATE")
+    except Exception as e:
+        logger.warning(f"Database shutdown maintenance failed: {e}")
@@ -0,0 +1,137 @@
+"""
+ETag helpers for conditional requests.
+
+Chapter and project responses carry a strong ETag derived from row
+versions, so clients can revalidate with If-None-Match instead of
+re-downloading unchanged content, and guard writes with If-Match.
+"""
+
+import hashlib
+from typing import Iterable
+
+from fastapi import HTTPException, Request, Response
+
+from .metrics import record_cache
+
+# Responses with an ETag must be revalidated before reuse, but may be cached
+CACHE_CONTROL = "private, no-cache"
+
+# Suffixes added to ETags by CompressionMiddleware for each content coding
+CODING_SUFFIXES = ('-gzip"', '-br"')
+
+
+def make_etag(*parts) -> str:
+    """
+    Build a strong ETag from the given version parts.
+
+    Args:
+        *parts: Values that change whenever the representation changes
+
+    Returns:
+        A quoted ETag value
+    """
+    digest = hashlib.sha256(":".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def chapter_etag(chapter_id: int, version: int) -> str:
+    """ETag for a single chapter."""
+    return make_etag("chapter", chapter_id, version)
+
+
+def project_etag(
+    project_id: int,
+    version: int,
+    chapter_versions: Iterable[tuple[int, int]],
+    representation: str = "project",
+) -> str:
+    """
+    ETag for a project including its chapters.
+
+    Args:
+        project_id: The project ID
+        version: The project's version
+        chapter_versions: (chapter_id, version) pairs for its chapters
+        representation: Name of the response shape, so the full project
+            and its outline never share an ETag
+
+    Returns:
+        A quoted ETag value
+    """
+    chapters = ",".join(f"{cid}.{cversion}" for cid, cversion in sorted(chapter_versions))
+    return make_etag(representation, project_id, version, chapters)
+
+
+def _parse_etags(header: str) -> list[str]:
+    return [tag.strip() for tag in header.split(",") if tag.strip()]
+
+
+def _strip_coding(tag: str) -> str:
+    # Compressed responses carry the coding in the ETag, e.g. "abc-gzip"
+    for suffix in CODING_SUFFIXES:
+        if tag.endswith(suffix):
+            return tag[:-len(suffix)] + '"'
+    return tag
+
+
+def _opaque(tag: str) -> str:
+    return _strip_coding(tag[2:] if tag.startswith("W/") else tag)
+
+
+def if_none_match(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match matches the current ETag.
+
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+
+    Args:
+        request: The incoming request
+        etag: The current ETag
+
+    Returns:
+        True if the client's copy is current and a 304 can be sent
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = _parse_etags(header)
+    matched = "*" in tags or _opaque(etag) in (_opaque(tag) for tag in tags)
+    record_cache("etag", matched)
+    return matched
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """
+    Enforce the request's If-Match precondition, if any.
+
+    Uses strong comparison, so weak ETags never satisfy it.
+
+    Args:
+        request: The incoming request
+        etag: The current ETag
+
+    Raises:
+        HTTPException: 412 if If-Match is present and does not match
+    """
+    header = request.headers.get("if-match")
+    if not header:
+        return
+    tags = _parse_etags(header)
+    if "*" in tags or etag in (_strip_coding(tag) for tag in tags):
+        return
+    raise HTTPException(
+        status_code=412,
+        detail="Resource has been modified",
+        headers={"ETag": etag},
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach an ETag and revalidation Cache-Control to a response."""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """Build a 304 Not Modified response for the given ETag."""
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
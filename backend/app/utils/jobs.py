@@ -0,0 +1,158 @@
+"""
+File-backed store for background jobs.
+
+Each job is a directory under the configured job_dir holding job.json
+(status, progress, result) and, for jobs that read or produce a file,
+the input and artifact. Metadata is replaced atomically, so any uvicorn
+worker can serve status and downloads for a job another worker is
+running. Jobs older than job_ttl_hours are pruned with their files.
+"""
+
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+
+from ..config import get_settings
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+METADATA_FILE = "job.json"
+
+_JOB_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+@dataclass
+class Job:
+    """A background job as stored in job.json."""
+    id: str
+    user_id: int
+    kind: str  # e.g. "export"
+    status: str = JOB_PENDING
+    progress: int = 0
+    total: Optional[int] = None
+    error: Optional[str] = None
+    artifact_name: Optional[str] = None  # Download file name once succeeded
+    media_type: Optional[str] = None
+    result: dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    updated_at: float = field(default_factory=time.time)
+
+
+class JobStore:
+    """Create, update and look up jobs stored on disk."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or get_settings().job_dir)
+
+    def _dir(self, job_id: str) -> Path:
+        # Job IDs come from URLs; only accept the form create() generates
+        if not _JOB_ID.match(job_id):
+            raise ValueError("Invalid job ID")
+        return self.root / job_id
+
+    def _save(self, job: Job) -> None:
+        path = self._dir(job.id) / METADATA_FILE
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(asdict(job)), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def create(self, user_id: int, kind: str, total: Optional[int] = None) -> Job:
+        """
+        Create a pending job.
+
+        Args:
+            user_id: The user the job belongs to
+            kind: Job type, e.g. "export"
+            total: Number of steps, if known
+
+        Returns:
+            The new job
+        """
+        job = Job(id=uuid.uuid4().hex, user_id=user_id, kind=kind, total=total)
+        self._dir(job.id).mkdir(parents=True)
+        self._save(job)
+        return job
+
+    def get(self, job_id: str, user_id: Optional[int] = None) -> Optional[Job]:
+        """
+        Get a job by ID.
+
+        Args:
+            job_id: The job ID
+            user_id: If given, only return the job if it belongs to this user
+
+        Returns:
+            The job, or None if not found, not owned by the user or the ID is malformed
+        """
+        try:
+            data = json.loads((self._dir(job_id) / METADATA_FILE).read_text(encoding="utf-8"))
+        except (ValueError, OSError):
+            return None
+        job = Job(**data)
+        if user_id is not None and job.user_id != user_id:
+            return None
+        return job
+
+    def update(self, job: Job, **changes) -> Job:
+        """
+        Apply changes to a job and save it.
+
+        Args:
+            job: The job to update
+            **changes: Job fields to set
+
+        Returns:
+            The updated job
+        """
+        for key, value in changes.items():
+            setattr(job, key, value)
+        job.updated_at = time.time()
+        self._save(job)
+        return job
+
+    def artifact_path(self, job: Job) -> Path:
+        """Path of the file a job writes its output to."""
+        return self._dir(job.id) / "artifact"
+
+    def input_path(self, job: Job) -> Path:
+        """Path of the file a job reads its input from (e.g. an uploaded manuscript)."""
+        return self._dir(job.id) / "input"
+
+    def prune(self, ttl_hours: Optional[int] = None) -> int:
+        """
+        Delete jobs, and their artifacts, last updated more than ttl_hours ago.
+
+        Args:
+            ttl_hours: Maximum age (default: the job_ttl_hours setting)
+
+        Returns:
+            Number of jobs deleted
+        """
+        if ttl_hours is None:
+            ttl_hours = get_settings().job_ttl_hours
+        if not self.root.is_dir():
+            return 0
+
+        cutoff = time.time() - ttl_hours * 3600
+        deleted = 0
+        for entry in self.root.iterdir():
+            if not _JOB_ID.match(entry.name):
+                continue
+            metadata = entry / METADATA_FILE
+            try:
+                updated_at = metadata.stat().st_mtime
+            except OSError:
+                updated_at = entry.stat().st_mtime
+            if updated_at < cutoff:
+                shutil.rmtree(entry, ignore_errors=True)
+                deleted += 1
+        return deleted
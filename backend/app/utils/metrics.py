@@ -0,0 +1,524 @@
+"""
+In-process metrics exposed in the Prometheus text format.
+
+Counters, gauges and histograms are plain dicts updated under a lock, so
+recording a sample costs about a microsecond and needs no extra service.
+With several uvicorn workers, each one writes a snapshot of its metrics to
+metrics_dir every metrics_flush_interval seconds; /metrics,
+served by whichever worker gets the scrape, merges the snapshots of all live
+workers. Counters and histograms are summed across workers; gauges are
+reported per worker with a `worker` label. When a worker exits its counts
+drop out of the sum, which Prometheus treats as a counter reset.
+
+Leave metrics_dir empty to expose only the serving process's metrics.
+"""
+
+import asyncio
+import bisect
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import orjson
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+
+settings = get_settings()
+
+# Request latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# LLM call buckets, in seconds
+LLM_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+# Database query buckets, in seconds
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+# Statements per request buckets
+STATEMENT_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+# Event loop lag buckets, in seconds
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list:
+        """[label values, value] pairs, as stored in snapshots."""
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down.
+
+    Pass `callback` to read the value at collection time instead; it
+    returns {label values tuple: value}.
+    """
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 callback: Optional[Callable[[], dict]] = None):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> list:
+        if self.callback is None:
+            return super().samples()
+        return [[list(key), value] for key, value in self.callback().items()]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum."""
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # Per-bucket counts (last one is +Inf), then sum
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def samples(self) -> list:
+        with self._lock:
+            return [[list(key), list(value)] for key, value in self._values.items()]
+
+
+class MetricsRegistry:
+    """The set of metrics a process records."""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+              callback: Optional[Callable[[], dict]] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> dict:
+        """All metrics and their current samples, as plain data."""
+        snapshot = {}
+        for metric in self._metrics.values():
+            entry = {
+                "type": metric.type_name,
+                "help": metric.documentation,
+                "labels": list(metric.labelnames),
+                "samples": metric.samples(),
+            }
+            if isinstance(metric, Histogram):
+                entry["buckets"] = list(metric.buckets)
+            snapshot[metric.name] = entry
+        return snapshot
+
+    def clear(self) -> None:
+        for metric in self._metrics.values():
+            metric.clear()
+
+
+REGISTRY = MetricsRegistry()
+
+# HTTP
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "Time to serve a request, by route template",
+    ("method", "route", "status"),
+)
+
+# LLM calls
+LLM_REQUEST_DURATION = REGISTRY.histogram(
+    "llm_request_duration_seconds", "Duration of LLM API calls",
+    ("operation", "model", "provider", "outcome"), LLM_BUCKETS,
+)
+LLM_TIME_TO_FIRST_TOKEN = REGISTRY.histogram(
+    "llm_time_to_first_token_seconds",
+    "Time until the first output token arrived (the whole reply, for non-streamed calls)",
+    ("operation", "model", "provider"), LLM_BUCKETS,
+)
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "Tokens reported by LLM providers", ("operation", "model", "provider", "kind"),
+)
+LLM_ERRORS = REGISTRY.counter(
+    "llm_errors_total", "Failed LLM calls, by exception class",
+    ("operation", "model", "provider", "error"),
+)
+
+# Caches; hit ratio = hits / (hits + misses)
+CACHE_REQUESTS = REGISTRY.counter(
+    "cache_requests_total", "Cache lookups by result (hit or miss)", ("cache", "result"),
+)
+
+# Database
+DB_QUERY_DURATION = REGISTRY.histogram(
+    "db_query_duration_seconds", "Duration of database statements", ("operation",), QUERY_BUCKETS,
+)
+# Per statement fingerprint (SQL with literals and parameters replaced by ?)
+DB_STATEMENT_CALLS = REGISTRY.counter(
+    "db_statement_calls_total", "Executions of each statement fingerprint", ("fingerprint", "statement"),
+)
+DB_STATEMENT_SECONDS = REGISTRY.counter(
+    "db_statement_seconds_total", "Time spent in each statement fingerprint", ("fingerprint", "statement"),
+)
+DB_SLOW_STATEMENTS = REGISTRY.counter(
+    "db_slow_statements_total", "Executions slower than db_slow_query_ms", ("fingerprint", "statement"),
+)
+DB_STATEMENTS_PER_REQUEST = REGISTRY.histogram(
+    "db_statements_per_request", "Database statements run while serving a request", ("route",),
+    STATEMENT_COUNT_BUCKETS,
+)
+DB_REPEATED_STATEMENTS = REGISTRY.counter(
+    "db_repeated_statements_total",
+    "Requests that ran one statement fingerprint db_n_plus_one_threshold or more times (likely N+1 queries)",
+    ("route", "fingerprint", "statement"),
+)
+
+# Event loop
+EVENT_LOOP_LAG = REGISTRY.histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer", (), LAG_BUCKETS,
+)
+
+# Queues; sources register themselves with register_queue()
+_queue_depths: dict[str, Callable[[], int]] = {}
+
+
+def _queue_depth_samples() -> dict:
+    samples = {}
+    for name, depth in list(_queue_depths.items()):
+        try:
+            samples[(name,)] = depth()
+        except Exception:
+            # e.g. the threadpool depth can only be read on the event loop
+            continue
+    return samples
+
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "queue_depth", "Work waiting or running in a bounded queue or pool", ("queue",),
+    callback=_queue_depth_samples,
+)
+
+
+def register_queue(name: str, depth: Callable[[], int]) -> None:
+    """Report depth() as queue_depth{queue=name} at collection time."""
+    _queue_depths[name] = depth
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count one lookup in the named cache."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def statement_operation(statement: str) -> str:
+    """The SQL verb of a statement, for the operation label."""
+    verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return verb if verb in ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH") else "OTHER"
+
+
+QueryObserver = Callable[[str, object, bool, float], None]
+_query_observers: list[QueryObserver] = []
+
+
+def add_query_observer(observer: QueryObserver) -> None:
+    """
+    Also pass each statement to observer (e.g. request tracing).
+
+    It is called with the SQL, its parameters, whether it was an
+    executemany, and its duration in seconds.
+    """
+    _query_observers.append(observer)
+
+
+def install_query_metrics(engine) -> None:
+    """
+    Time every statement run on a (sync) engine.
+
+    For an AsyncEngine pass its sync_engine.
+    """
+    from sqlalchemy import event
+
+    # The start time is kept on the execution context, which is discarded
+    # with the statement even when it fails and after_cursor_execute
+    # never runs
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _finish(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._metrics_query_start
+        DB_QUERY_DURATION.observe(duration, operation=statement_operation(statement))
+        for observer in _query_observers:
+            observer(statement, parameters, executemany, duration)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Record how late a periodic timer fires, until cancelled."""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - started - interval))
+
+
+_route_templates: dict[int, dict] = {}
+
+
+def route_template(scope: Scope) -> str:
+    """
+    The path template of the route that handled a request, e.g.
+    /api/v1/projects/{project_id}, or "unmatched" for 404s.
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    app = scope.get("app")
+    templates = _route_templates.get(id(app))
+    if templates is None:
+        # Routes are fixed once the app serves requests
+        templates = _route_templates[id(app)] = {
+            getattr(route, "endpoint", None): route.path
+            for route in getattr(app, "routes", ())
+            if hasattr(route, "path")
+        }
+    return templates.get(endpoint, "unmatched")
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request by method, route template and status."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=route_template(scope),
+                status=status_code,
+            )
+
+
+class MetricsExporter:
+    """
+    Shares this worker's metrics with the others through metrics_dir.
+
+    Args:
+        registry: The metrics to export
+        directory: Where worker snapshots live; None exports only this process
+    """
+
+    def __init__(self, registry: MetricsRegistry, directory: Optional[str]):
+        self.registry = registry
+        self.directory = directory
+
+    @property
+    def pid(self) -> int:
+        return os.getpid()
+
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def flush(self) -> None:
+        """Write this worker's snapshot atomically."""
+        if not self.directory:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(self.pid)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(self.registry.snapshot()))
+        os.replace(tmp_path, path)
+
+    def remove(self) -> None:
+        """Drop this worker's snapshot, e.g. on shutdown."""
+        if self.directory:
+            try:
+                os.remove(self._path(self.pid))
+            except FileNotFoundError:
+                pass
+
+    def collect(self) -> dict[int, dict]:
+        """Snapshots of all live workers, keyed by pid (this one is read live)."""
+        snapshots = {self.pid: self.registry.snapshot()}
+        if not self.directory or not os.path.isdir(self.directory):
+            return snapshots
+        for name in os.listdir(self.directory):
+            stem, extension = os.path.splitext(name)
+            if extension != ".json" or not stem.isdigit() or int(stem) == self.pid:
+                continue
+            pid = int(stem)
+            if not _pid_alive(pid):
+                try:
+                    os.remove(self._path(pid))
+                except FileNotFoundError:
+                    pass
+                continue
+            try:
+                with open(self._path(pid), "rb") as f:
+                    snapshots[pid] = orjson.loads(f.read())
+            except (FileNotFoundError, orjson.JSONDecodeError):
+                continue
+        return snapshots
+
+    def render(self) -> str:
+        """All workers' metrics in the Prometheus text exposition format."""
+        return render_snapshots(self.collect())
+
+    async def run_periodic_flush(self, interval: float) -> None:
+        """Flush every interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            self.flush()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_snapshots(snapshots: dict[int, dict]) -> str:
+    """
+    Merge worker snapshots and render them in the text exposition format.
+
+    Args:
+        snapshots: Registry snapshots keyed by worker pid
+
+    Returns:
+        The exposition text
+    """
+    merged: dict[str, dict] = {}
+    for pid, snapshot in sorted(snapshots.items()):
+        for name, entry in snapshot.items():
+            target = merged.setdefault(name, {**entry, "values": {}})
+            labels = tuple(entry["labels"])
+            if entry["type"] == "gauge":
+                labels = labels + ("worker",)
+            target["labels"] = list(labels)
+            for label_values, value in entry["samples"]:
+                key = tuple(label_values)
+                if entry["type"] == "gauge":
+                    target["values"][key + (str(pid),)] = value
+                elif entry["type"] == "histogram":
+                    current = target["values"].get(key)
+                    target["values"][key] = (
+                        list(value) if current is None
+                        else [a + b for a, b in zip(current, value)]
+                    )
+                else:
+                    target["values"][key] = target["values"].get(key, 0) + value
+
+    lines = []
+    for name, entry in merged.items():
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        names = entry["labels"]
+        for key, value in sorted(entry["values"].items()):
+            if entry["type"] != "histogram":
+                lines.append(f"{name}{_labels(names, key)} {_number(value)}")
+                continue
+            cumulative = 0
+            bounds = list(entry["buckets"]) + [float("inf")]
+            for bound, count in zip(bounds, value[:-1]):
+                cumulative += count
+                lines.append(
+                    f"{name}_bucket{_labels(list(names) + ['le'], list(key) + [_number(bound)])} {cumulative}"
+                )
+            lines.append(f"{name}_sum{_labels(names, key)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(names, key)} {cumulative}")
+    return "\n".join(lines) + "\n"
+
+
+exporter = MetricsExporter(REGISTRY, settings.metrics_dir or None)
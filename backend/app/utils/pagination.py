@@ -0,0 +1,108 @@
+"""
+Cursor pagination and field selection for list endpoints.
+
+Listings are paged by keyset: the cursor names the last row of the
+previous page, and the next page is the rows that sort after it. The
+comparison is made against that row's stored sort values inside the
+query, so it never depends on how a timestamp round-trips through the
+client. Cursors are opaque to clients and only valid for the listing
+that issued them.
+"""
+
+import base64
+import binascii
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional
+
+import orjson
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the ID of a page's last row as an opaque cursor."""
+    return base64.urlsafe_b64encode(orjson.dumps({"id": last_id})).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor made by encode_cursor.
+
+    Args:
+        cursor: The cursor from a previous page's next_cursor
+
+    Returns:
+        The ID of the previous page's last row
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        data = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        last_id = data["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return last_id
+
+
+@lru_cache()
+def _response_fields(schema: type[BaseModel]) -> frozenset[str]:
+    """Names of a schema's serialized fields, including computed ones."""
+    return frozenset(schema.model_json_schema(mode="serialization")["properties"])
+
+
+def parse_fields(fields: Optional[str], schema: type[BaseModel]) -> Optional[set[str]]:
+    """
+    Parse a comma-separated fields= parameter against a response schema.
+
+    The id field is always included, since clients need it to address
+    items and the next cursor is built from it.
+
+    Args:
+        fields: The raw parameter, e.g. "id,title"; None or blank selects all fields
+        schema: The item schema the fields must belong to
+
+    Returns:
+        The selected field names, or None for all fields
+
+    Raises:
+        HTTPException: 400 if a field is not part of the schema
+    """
+    if fields is None or not fields.strip():
+        return None
+    allowed = _response_fields(schema)
+    selected = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = selected - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}; "
+                   f"choose from: {', '.join(sorted(allowed))}"
+        )
+    return selected | {"id"}
+
+
+def selected_columns(
+    selected: Optional[set[str]],
+    schema: type[BaseModel],
+    derived: Mapping[str, Iterable[str]],
+) -> list[str]:
+    """
+    List the columns to load for a field selection.
+
+    Args:
+        selected: Field names from parse_fields, or None for all fields
+        schema: The item schema
+        derived: Computed fields mapped to the columns they are derived from
+
+    Returns:
+        Column names, in schema order
+    """
+    names = list(schema.model_fields) if selected is None else [
+        name for name in schema.model_fields if name in selected
+    ]
+    for field in (selected or ()):
+        names.extend(column for column in derived.get(field, ()) if column not in names)
+    return names
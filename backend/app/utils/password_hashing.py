@@ -0,0 +1,105 @@
+"""
+Bounded worker pool for password hashing.
+
+bcrypt takes a few hundred milliseconds of CPU per call by design. Running
+it on the event loop would stall every other request for that long, and
+running it on the shared AnyIO threadpool lets a burst of logins take all
+the threads sync endpoints need. Hashing therefore gets its own small
+thread pool (bcrypt releases the GIL, so threads hash in parallel) with a
+limit on how many calls may wait for it; beyond that, requests are turned
+away with 503 instead of queueing without bound.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from ..config import get_settings
+from .auth import get_password_hash, verify_and_update_password
+from .metrics import register_queue
+
+T = TypeVar("T")
+
+# Seconds clients are asked to wait when the pool is saturated
+RETRY_AFTER_SECONDS = 2
+
+
+class PasswordHashPool:
+    """
+    Runs password hashing on a dedicated, bounded thread pool.
+
+    Args:
+        workers: Number of hashing threads
+        queue_limit: Calls allowed to wait for a free thread; more are rejected
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = max(1, workers)
+        self.queue_limit = max(0, queue_limit)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    @property
+    def pending(self) -> int:
+        """Calls currently running or waiting for a thread."""
+        return self._pending
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run func(*args) on the pool.
+
+        Raises:
+            HTTPException: 503 if the pool and its queue are full
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many sign-in attempts in progress. Please try again shortly.",
+                    headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+                )
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the current cost settings."""
+        return await self.run(get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """
+        Verify a password, rehashing it if the stored hash is outdated.
+
+        Returns:
+            Tuple of (valid, new_hash); new_hash is None unless the stored
+            hash should be replaced
+        """
+        return await self.run(verify_and_update_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads; a later call starts a fresh pool."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+settings = get_settings()
+password_pool = PasswordHashPool(settings.password_hash_workers, settings.password_hash_queue_limit)
+register_queue("password_hash", lambda: password_pool.pending)
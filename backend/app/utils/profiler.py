@@ -0,0 +1,267 @@
+"""
+On-demand profiling of the live process, for administrators.
+
+Two tools, neither of which does anything until it is asked to:
+
+- SamplingProfiler reads the stack of every thread with
+  sys._current_frames() at a fixed interval for a number of seconds and
+  counts identical stacks. The profiled code runs unmodified (no tracing
+  hooks are installed); the only cost is the sampler waking up once per
+  interval while a profile is being taken. The result is in the collapsed
+  ("folded") format read by flamegraph.pl, speedscope and inferno, one
+  `thread;outer;...;inner count` line per distinct stack.
+- @profileable runs one call of an endpoint under cProfile when an
+  administrator sends `X-Profile: cprofile` (a pstats text report comes
+  back instead of the usual body) or `X-Profile: pstats` (the raw stats,
+  for snakeviz or pstats.Stats). Every other request pays one header
+  lookup.
+
+Each process only runs one profile of each kind at a time; concurrent
+requests are turned away with 409. With several uvicorn workers a profile
+covers the worker that answered, whose pid is sent back in X-Profile-PID.
+"""
+
+import cProfile
+import functools
+import inspect
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import CodeType
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import PlainTextResponse, Response
+
+from ..config import get_settings
+
+settings = get_settings()
+
+PROFILE_HEADER = "X-Profile"
+# Functions listed in the cProfile text report
+REPORT_LIMIT = 80
+
+
+def _busy_exception(kind: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"A {kind} profile is already running in this process. Please try again when it finishes.",
+    )
+
+
+@dataclass
+class StackProfile:
+    """Stack counts collected by the sampling profiler."""
+    interval: float
+    duration: float = 0.0
+    samples: int = 0
+    stacks: Counter = field(default_factory=Counter)
+
+    def collapsed(self) -> str:
+        """The stacks in collapsed format, root frame first."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of all threads of this process.
+
+    A profile runs on the calling thread, which leaves itself out of the
+    samples; run it on a worker thread rather than the event loop.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    def profile(self, seconds: float, interval: float) -> StackProfile:
+        """
+        Sample every other thread each `interval` seconds for `seconds`.
+
+        Raises:
+            HTTPException: 409 if a profile is already being taken
+        """
+        if not self._lock.acquire(blocking=False):
+            raise _busy_exception("sampling")
+        try:
+            return self._sample(seconds, interval)
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> StackProfile:
+        own_ident = threading.get_ident()
+        thread_names: dict[int, str] = {}
+        labels: dict[CodeType, str] = {}
+        result = StackProfile(interval=interval)
+
+        started = time.perf_counter()
+        deadline = started + seconds
+        next_sample = started
+        while True:
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code, frame.f_globals)
+                    stack.append(label)
+                    frame = frame.f_back
+                name = thread_names.get(ident)
+                if name is None:
+                    thread_names.update((thread.ident, _thread_label(thread)) for thread in threading.enumerate())
+                    name = thread_names.setdefault(ident, f"thread-{ident}")
+                stack.append(name)
+                stack.reverse()
+                result.stacks[tuple(stack)] += 1
+            result.samples += 1
+
+            next_sample += interval
+            if next_sample >= deadline:
+                break
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (e.g. the GIL was held); skip the missed samples
+                next_sample = time.perf_counter()
+        result.duration = time.perf_counter() - started
+        return result
+
+
+def _frame_label(code: CodeType, module_globals: dict) -> str:
+    module = module_globals.get("__name__", "?")
+    return f"{module}:{code.co_qualname}".replace(";", ":")
+
+
+def _thread_label(thread: threading.Thread) -> str:
+    return thread.name.replace(";", ":")
+
+
+class RequestProfiler:
+    """Runs single endpoint calls under cProfile, one at a time."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def start(self) -> cProfile.Profile:
+        """
+        Start profiling the calling thread.
+
+        Raises:
+            HTTPException: 409 if another call is being profiled
+        """
+        if not self._lock.acquire(blocking=False):
+            raise _busy_exception("cProfile")
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except BaseException:
+            self._lock.release()
+            raise
+        return profile
+
+    def stop(self, profile: cProfile.Profile) -> None:
+        """Stop a profile started with start()."""
+        try:
+            profile.disable()
+        finally:
+            self._lock.release()
+
+
+def profile_response(profile: cProfile.Profile, mode: str, elapsed: float) -> Response:
+    """
+    The response sent back for a profiled call.
+
+    Args:
+        profile: The finished profile
+        mode: "cprofile" for a text report, "pstats" for the marshalled stats
+        elapsed: Wall-clock seconds the call took
+    """
+    headers = {
+        "X-Profile-PID": str(os.getpid()),
+        "X-Profile-Elapsed-Ms": f"{elapsed * 1000:.1f}",
+    }
+    if mode == "pstats":
+        profile.create_stats()
+        headers["Content-Disposition"] = f'attachment; filename="request-{os.getpid()}-{int(time.time())}.pstats"'
+        return Response(marshal.dumps(profile.stats), media_type="application/octet-stream", headers=headers)
+
+    report = io.StringIO()
+    stats = pstats.Stats(profile, stream=report)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(REPORT_LIMIT)
+    return PlainTextResponse(report.getvalue(), headers=headers)
+
+
+def _requested_mode(kwargs: dict) -> Optional[str]:
+    """The profiling mode an administrator asked for, or None."""
+    request = kwargs.get("request")
+    if not isinstance(request, Request):
+        return None
+    mode = request.headers.get(PROFILE_HEADER)
+    if mode is None or not settings.profiler_enabled:
+        return None
+    mode = mode.strip().lower()
+    if mode not in ("cprofile", "pstats"):
+        return None
+    # Everyone else gets the endpoint's normal response
+    if not getattr(kwargs.get("current_user"), "is_admin", False):
+        return None
+    return mode
+
+
+def profileable(func: Callable) -> Callable:
+    """
+    Let administrators profile a call of this endpoint with cProfile.
+
+    The endpoint must take `request: Request` and a `current_user`
+    identity. Place the decorator below @limiter.limit so profiled calls
+    are still rate limited.
+
+    cProfile only follows the thread it was started on: sync endpoints are
+    profiled completely, while async ones also record whatever else the
+    event loop runs meanwhile and miss work handed to other threads.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            mode = _requested_mode(kwargs)
+            if mode is None:
+                return await func(*args, **kwargs)
+            started = time.perf_counter()
+            profile = request_profiler.start()
+            try:
+                await func(*args, **kwargs)
+            finally:
+                request_profiler.stop(profile)
+            return profile_response(profile, mode, time.perf_counter() - started)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def sync_wrapper(*args, **kwargs):
+        mode = _requested_mode(kwargs)
+        if mode is None:
+            return func(*args, **kwargs)
+        started = time.perf_counter()
+        profile = request_profiler.start()
+        try:
+            func(*args, **kwargs)
+        finally:
+            request_profiler.stop(profile)
+        return profile_response(profile, mode, time.perf_counter() - started)
+    return sync_wrapper
+
+
+sampling_profiler = SamplingProfiler()
+request_profiler = RequestProfiler()
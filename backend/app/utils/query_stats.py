@@ -0,0 +1,235 @@
+"""
+SQL statement statistics, slow-query log and N+1 detection.
+
+Every statement is reduced to a fingerprint: its SQL with literals and
+bound parameters replaced by ?, IN lists and multi-row VALUES collapsed,
+and whitespace normalized, so the same query with different values is
+counted once. Executions and time per fingerprint are exported through
+/metrics (db_statement_calls_total, db_statement_seconds_total).
+
+Statements slower than db_slow_query_ms are logged as JSON records to the
+"app.sql" logger, with the shape of their parameters (types and sizes,
+never values). QueryStatsMiddleware counts the fingerprints each request
+runs; one that runs db_n_plus_one_threshold or more times in a request is
+logged and counted in db_repeated_statements_total as a likely N+1 query,
+and db_statements_per_request shows the totals by route.
+
+This replaces database_echo for day-to-day diagnosis, which logs every
+statement or none.
+"""
+
+import datetime
+import decimal
+import functools
+import hashlib
+import logging
+import re
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+import orjson
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from ..config import get_settings
+from .metrics import (
+    DB_REPEATED_STATEMENTS, DB_SLOW_STATEMENTS, DB_STATEMENT_CALLS, DB_STATEMENT_SECONDS,
+    DB_STATEMENTS_PER_REQUEST, add_query_observer, route_template, statement_operation,
+)
+from .tracing import current_trace
+
+settings = get_settings()
+
+logger = logging.getLogger("app.sql")
+
+# Distinct fingerprints given their own metric labels; later ones are
+# counted under fingerprint="other"
+MAX_FINGERPRINTS = 500
+# Longest statement text used as a metric label or in log records
+MAX_STATEMENT_LENGTH = 300
+# Parameters described individually in the slow-query log
+MAX_PARAMETERS_SHOWN = 20
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?(?![\w])")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \(\?(?:, \?)*\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """A normalized statement and its short, stable id."""
+    id: str
+    statement: str
+    operation: str
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> Fingerprint:
+    """
+    Normalize a statement so executions with different values match.
+
+    The id is a hash of the normalized text, so it is the same in every
+    worker process.
+    """
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING.sub("?", normalized)
+    normalized = _PLACEHOLDER.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    normalized = _VALUES_ROWS.sub(r"\1, ...", normalized)
+    return Fingerprint(
+        id=hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest(),
+        statement=normalized,
+        operation=statement_operation(normalized),
+    )
+
+
+def _value_shape(value) -> str:
+    if value is None:
+        return "None"
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
+        return f"{type(value).__name__}[{len(value)}]"
+    if isinstance(value, (bool, int, float, decimal.Decimal, datetime.date, datetime.time)):
+        return type(value).__name__
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def parameter_shape(parameters, executemany: bool = False) -> str:
+    """
+    Describe bound parameters by type and size, without their values.
+
+    e.g. "(int, str[42], None)" or, for an executemany, "120 x (int, bytes[5120])".
+    """
+    if executemany:
+        rows = list(parameters or ())
+        if not rows:
+            return "0 x ()"
+        return f"{len(rows)} x {parameter_shape(rows[0])}"
+    if isinstance(parameters, dict):
+        items = [f"{name}: {_value_shape(value)}" for name, value in list(parameters.items())[:MAX_PARAMETERS_SHOWN]]
+        more = ", ..." if len(parameters) > MAX_PARAMETERS_SHOWN else ""
+        return "{" + ", ".join(items) + more + "}"
+    values = list(parameters or ())
+    items = [_value_shape(value) for value in values[:MAX_PARAMETERS_SHOWN]]
+    more = ", ..." if len(values) > MAX_PARAMETERS_SHOWN else ""
+    return "(" + ", ".join(items) + more + ")"
+
+
+_labelled: set[str] = set()
+
+
+def _labels(entry: Fingerprint) -> dict:
+    """Metric labels for a fingerprint, capped at MAX_FINGERPRINTS distinct ones."""
+    if entry.id not in _labelled:
+        if len(_labelled) >= MAX_FINGERPRINTS:
+            return {"fingerprint": "other", "statement": ""}
+        _labelled.add(entry.id)
+    return {"fingerprint": entry.id, "statement": entry.statement[:MAX_STATEMENT_LENGTH]}
+
+
+@dataclass
+class RequestQueries:
+    """The statements run while serving one request."""
+    scope: Scope
+    total: int = 0
+    counts: dict[str, int] = field(default_factory=dict)
+    statements: dict[str, Fingerprint] = field(default_factory=dict)
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope)
+
+
+_current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+def record_statement(statement: str, parameters, executemany: bool, duration: float) -> None:
+    """Count a statement under its fingerprint and log it if it was slow."""
+    entry = fingerprint(statement)
+    labels = _labels(entry)
+    DB_STATEMENT_CALLS.inc(**labels)
+    DB_STATEMENT_SECONDS.inc(duration, **labels)
+
+    queries = _current_queries.get()
+    if queries is not None:
+        queries.total += 1
+        # An executemany is already one round trip for many rows
+        if not executemany and entry.operation != "OTHER":
+            queries.counts[entry.id] = queries.counts.get(entry.id, 0) + 1
+            queries.statements.setdefault(entry.id, entry)
+
+    if settings.db_slow_query_ms > 0 and duration * 1000 >= settings.db_slow_query_ms:
+        DB_SLOW_STATEMENTS.inc(**labels)
+        trace = current_trace()
+        logger.warning(orjson.dumps({
+            "event": "slow_query",
+            "duration_ms": round(duration * 1000, 2),
+            "fingerprint": entry.id,
+            "statement": entry.statement[:MAX_STATEMENT_LENGTH],
+            "parameters": parameter_shape(parameters, executemany),
+            "route": queries.route if queries is not None else None,
+            "request_id": trace.request_id if trace is not None else None,
+        }).decode())
+
+
+add_query_observer(record_statement)
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware counting each request's statements and reporting
+    fingerprints repeated often enough to look like N+1 queries.
+
+    Args:
+        app: The wrapped application
+        n_plus_one_threshold: Runs of one fingerprint in a request that
+            are reported; 0 only counts statements per request
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 10):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_queries.reset(token)
+            self._report(queries, scope["method"], time.perf_counter() - started)
+
+    def _report(self, queries: RequestQueries, method: str, duration: float) -> None:
+        route = queries.route
+        DB_STATEMENTS_PER_REQUEST.observe(queries.total, route=route)
+        if self.n_plus_one_threshold <= 0:
+            return
+        trace = current_trace()
+        for fingerprint_id, count in queries.counts.items():
+            if count < self.n_plus_one_threshold:
+                continue
+            entry = queries.statements[fingerprint_id]
+            labels = _labels(entry)
+            DB_REPEATED_STATEMENTS.inc(route=route, **labels)
+            logger.warning(orjson.dumps({
+                "event": "repeated_statement",
+                "method": method,
+                "route": route,
+                "count": count,
+                "request_statements": queries.total,
+                "duration_ms": round(duration * 1000, 2),
+                "fingerprint": entry.id,
+                "statement": entry.statement[:MAX_STATEMENT_LENGTH],
+                "request_id": trace.request_id if trace is not None else None,
+            }).decode())
@@ -1,6 +1,50 @@
-from slowapi import Limiter
-from slowapi.util import get_remote_address
-from fastapi import Request
+"""
+Rate limiting shared across worker processes.
+
+Each limited endpoint has a token bucket per client: authenticated
+requests are keyed by the user id in their bearer token, anonymous ones
+(login, register) by client IP. A limit such as "60/minute" is a bucket of
+60 tokens refilled at 60 per minute, and every request takes its cost from
+it, one token by default or a weight estimated from the request for
+expensive operations such as AI calls.
+
+Buckets live in a small SQLite file (rate_limit_storage) so all uvicorn
+workers on the host share them; leave it empty to keep buckets in process
+memory. Responses carry X-RateLimit-Limit, X-RateLimit-Remaining and
+X-RateLimit-Reset (Unix time when the bucket is full again), and rejected
+requests get 429 with Retry-After.
+"""
+
+import functools
+import inspect
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from fastapi import HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config import get_settings
+from .auth import verify_token
+
+settings = get_settings()
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+# Rough characters per token for estimating AI request size
+CHARS_PER_TOKEN = 4
+# Estimated AI tokens (prompt plus output) charged as one request
+AI_TOKENS_PER_UNIT = 2000
+
+# Buckets untouched for this long are full again and can be dropped
+IDLE_BUCKET_SECONDS = 86400
+PRUNE_EVERY = 1000
 
 
 def get_client_ip(request: Request) -> str:
@@ -10,15 +54,293 @@ def get_client_ip(request: Request) -> str:
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
         return forwarded.split(",")[0].strip()
-    return get_remote_address(request)
+    return request.client.host if request.client else "127.0.0.1"
+
+
+def get_rate_limit_key(request: Request) -> str:
+    """
+    Key requests by the user in a valid bearer token, else by client IP.
+
+    The token is only decoded here, not looked up, so keying costs no
+    database round trip; unknown users are still rejected by the auth
+    dependencies.
+    """
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        payload = verify_token(token)
+        if payload and payload.get("sub") is not None:
+            return f"user:{payload['sub']}"
+    return f"ip:{get_client_ip(request)}"
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """
+    Parse a limit such as "60/minute" into (capacity, period seconds).
+
+    Raises:
+        ValueError: If the limit is malformed
+    """
+    amount, _, period = rate.partition("/")
+    try:
+        return int(amount), PERIODS[period.strip().rstrip("s")]
+    except (KeyError, ValueError):
+        raise ValueError(f"Invalid rate limit: {rate!r}")
+
+
+def estimate_tokens(*texts: str) -> int:
+    """Estimate the model tokens in the given texts."""
+    return sum(len(text) for text in texts if text) // CHARS_PER_TOKEN
+
+
+def ai_cost(tokens: int) -> int:
+    """Rate limit cost of an AI call expected to use `tokens` tokens."""
+    return 1 + max(0, tokens) // AI_TOKENS_PER_UNIT
+
+
+@dataclass(frozen=True)
+class BucketState:
+    """Outcome of taking tokens from a bucket."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_at: float  # Unix time the bucket is full again
+    retry_after: float  # Seconds until the request would be allowed; 0 if allowed
+
+
+def _take(tokens: float, updated_at: float, now: float, capacity: int, period: int,
+          cost: int) -> tuple[float, BucketState]:
+    """Refill a bucket up to now and take cost from it if there is enough."""
+    rate = capacity / period
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate)
+    allowed = tokens >= cost
+    if allowed:
+        tokens -= cost
+        retry_after = 0.0
+    else:
+        retry_after = (cost - tokens) / rate
+    return tokens, BucketState(
+        allowed=allowed,
+        limit=capacity,
+        remaining=int(tokens),
+        reset_at=now + (capacity - tokens) / rate,
+        retry_after=retry_after,
+    )
+
+
+class MemoryBucketStore:
+    """Token buckets in process memory (not shared between workers)."""
+
+    # take() only holds an in-process lock briefly
+    blocking = False
+
+    def __init__(self):
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, period: int, cost: int) -> BucketState:
+        now = time.time()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens, state = _take(tokens, updated_at, now, capacity, period, cost)
+            self._buckets[key] = (tokens, now)
+        return state
+
+    def reset(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets in a SQLite file shared by every process on the host.
+
+    Each take is one short write transaction. The file only holds
+    throwaway counters, so it skips fsync; losing it just refills every
+    bucket. A take waits up to 5 seconds for another process's write
+    lock, so async endpoints run it on a worker thread.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._takes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=OFF")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def take(self, key: str, capacity: int, period: int, cost: int) -> BucketState:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated_at FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated_at = row if row else (capacity, now)
+            tokens, state = _take(tokens, updated_at, now, capacity, period, cost)
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            self._takes += 1
+            if self._takes % PRUNE_EVERY == 0:
+                connection.execute(
+                    "DELETE FROM buckets WHERE updated_at < ?", (now - IDLE_BUCKET_SECONDS,)
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return state
+
+    def reset(self) -> None:
+        self._connection().execute("DELETE FROM buckets")
+
+
+Cost = Union[int, Callable[..., int]]
+
+
+class RateLimiter:
+    """
+    Applies per-endpoint token bucket limits.
+
+    Args:
+        store: Where buckets are kept
+        key_func: Maps a request to the client it is charged to
+    """
+
+    def __init__(self, store, key_func: Callable[[Request], str] = get_rate_limit_key):
+        self.store = store
+        self.key_func = key_func
+        self.enabled = True
+
+    def check(self, request: Request, scope: str, rate: str, cost: int = 1) -> BucketState:
+        """
+        Take cost from the caller's bucket for scope.
+
+        Costs above the limit are capped at it, so the largest requests
+        need a full bucket rather than never being allowed.
+
+        Raises:
+            HTTPException: 429 if the bucket doesn't hold enough tokens
+        """
+        capacity, period = parse_rate(rate)
+        cost = max(1, min(cost, capacity))
+        state = self.store.take(f"{scope}:{self.key_func(request)}", capacity, period, cost)
+        request.state.rate_limit = state
+        if not state.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {rate}",
+                headers={**rate_limit_headers(state),
+                         "Retry-After": str(math.ceil(state.retry_after))},
+            )
+        return state
+
+    def limit(self, rate: str, cost: Cost = 1) -> Callable:
+        """
+        Decorate an endpoint with a rate limit.
+
+        The endpoint must take a `request: Request` parameter. `cost` is
+        either a fixed number of tokens or a callable receiving the
+        endpoint's keyword arguments (the parsed body included) and
+        returning one. For async endpoints, a store that can block
+        (waiting for a lock shared with other processes) is used from
+        the threadpool, never on the event loop.
+
+        Args:
+            rate: Limit such as "60/minute"
+            cost: Tokens each call takes
+        """
+        parse_rate(rate)
+
+        def decorator(func: Callable) -> Callable:
+            scope = f"{func.__module__}.{func.__name__}"
+
+            def apply(kwargs: dict) -> None:
+                if not self.enabled:
+                    return
+                request = kwargs.get("request")
+                if not isinstance(request, Request):
+                    raise RuntimeError(f"{scope} needs a `request: Request` parameter to be rate limited")
+                self.check(request, scope, rate, cost(**kwargs) if callable(cost) else cost)
+
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if self.enabled and getattr(self.store, "blocking", True):
+                        await run_in_threadpool(apply, kwargs)
+                    else:
+                        apply(kwargs)
+                    return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def sync_wrapper(*args, **kwargs):
+                apply(kwargs)
+                return func(*args, **kwargs)
+            return sync_wrapper
+
+        return decorator
+
+
+def rate_limit_headers(state: BucketState) -> dict[str, str]:
+    """X-RateLimit-* headers describing a bucket."""
+    return {
+        "X-RateLimit-Limit": str(state.limit),
+        "X-RateLimit-Remaining": str(state.remaining),
+        "X-RateLimit-Reset": str(math.ceil(state.reset_at)),
+    }
+
+
+class RateLimitHeadersMiddleware:
+    """ASGI middleware adding X-RateLimit-* headers to rate limited responses."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                state = scope.get("state", {}).get("rate_limit")
+                if state is not None:
+                    headers = MutableHeaders(scope=message)
+                    for name, value in rate_limit_headers(state).items():
+                        headers.setdefault(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
+
+
+def create_store(path: Optional[str]):
+    """Bucket store for the configured rate_limit_storage path."""
+    return SQLiteBucketStore(path) if path else MemoryBucketStore()
 
 
-# Create limiter instance with IP-based key function
-limiter = Limiter(key_func=get_client_ip)
+limiter = RateLimiter(create_store(settings.rate_limit_storage))
 
 
 # Rate limit constants
 RATE_LIMIT_LOGIN = "5/minute"  # Strict limit for login attempts
 RATE_LIMIT_REGISTER = "3/minute"  # Strict limit for registration
 RATE_LIMIT_DEFAULT = "60/minute"  # Default limit for authenticated endpoints
-RATE_LIMIT_AI = "20/minute"  # Limit for AI endpoints (expensive operations)
+RATE_LIMIT_AI = "20/minute"  # Limit for AI endpoints (expensive operations), in AI cost units
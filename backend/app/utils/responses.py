@@ -0,0 +1,55 @@
+"""
+JSON response helpers.
+
+API routers render JSON with orjson (see ORJSONResponse in the v1
+router). Constant payloads are encoded once with PrecomputedJSON, which
+also keeps their compressed variants so repeated requests cost no
+serialization or compression work.
+"""
+
+import hashlib
+from typing import Any
+
+import orjson
+from fastapi import Request, Response
+
+from .etag import if_none_match, not_modified
+from .response_compression import choose_encoding, compress_body
+
+# Responses smaller than this are sent uncompressed
+PRECOMPUTED_MIN_COMPRESS_SIZE = 1024
+
+
+class PrecomputedJSON:
+    """A constant JSON payload, encoded and compressed once."""
+
+    def __init__(self, content: Any):
+        self.body = orjson.dumps(content)
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self._encoded: dict[str, bytes] = {}
+
+    def _encode(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            self._encoded[encoding] = compress_body(self.body, encoding, gzip_level=9, brotli_quality=11)
+        return self._encoded[encoding]
+
+    def response(self, request: Request) -> Response:
+        """
+        Build the response for a request, honoring If-None-Match and Accept-Encoding.
+
+        Args:
+            request: The incoming request
+
+        Returns:
+            A 304, or the payload in the best accepted encoding
+        """
+        if if_none_match(request, self.etag):
+            return not_modified(self.etag)
+
+        headers = {"ETag": self.etag, "Vary": "Accept-Encoding"}
+        body = self.body
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding and len(body) >= PRECOMPUTED_MIN_COMPRESS_SIZE:
+            body = self._encode(encoding)
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
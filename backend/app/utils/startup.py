@@ -0,0 +1,70 @@
+"""
+Startup phase and warm-up hooks.
+
+Importing the app is kept cheap: heavy components (the LLM SDK and its
+clients, the password hashing backend, ORM mapper configuration, the
+first database connection) are built on first use. The startup phase,
+run from the app's lifespan, gets them ready ahead of traffic by calling
+the registered warm-up hooks on worker threads.
+
+startup_warmup selects when:
+
+- "background": serve immediately while the hooks run; a request that
+  needs a component first simply builds it itself
+- "wait": finish the hooks before the worker accepts requests
+- "off": build everything on first use only
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODES = ("background", "wait", "off")
+
+_warmups: list[tuple[str, Callable[[], None]]] = []
+
+
+def register_warmup(name: str, hook: Callable[[], None]) -> None:
+    """Call hook() during the startup phase."""
+    _warmups.append((name, hook))
+
+
+async def _run_hook(name: str, hook: Callable[[], None]) -> None:
+    started = time.perf_counter()
+    try:
+        await run_in_threadpool(hook)
+    except Exception as e:
+        # A failed warm-up only means the component is built on first use
+        logger.warning(f"Warm-up {name} failed after {time.perf_counter() - started:.3f}s: {e}")
+    else:
+        logger.info(f"Warm-up {name} finished in {time.perf_counter() - started:.3f}s")
+
+
+async def run_warmups() -> None:
+    """Run all registered warm-up hooks concurrently."""
+    await asyncio.gather(*(_run_hook(name, hook) for name, hook in _warmups))
+
+
+async def start(mode: str) -> Optional[asyncio.Task]:
+    """
+    Run the startup phase.
+
+    Args:
+        mode: One of WARMUP_MODES
+
+    Returns:
+        The task running the hooks in "background" mode, else None
+    """
+    if mode not in WARMUP_MODES:
+        raise ValueError(f"Unknown startup_warmup mode: {mode}")
+    if mode == "off" or not _warmups:
+        return None
+    if mode == "wait":
+        await run_warmups()
+        return None
+    return asyncio.create_task(run_warmups())
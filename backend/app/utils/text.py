@@ -0,0 +1,138 @@
+"""
+Plain-text helpers for chapter content.
+
+Chapter content is stored as the HTML produced by the TipTap editor.
+This module converts it to plain text for indexing and other
+server-side processing that should not see markup.
+"""
+
+import re
+from html import unescape
+from html.parser import HTMLParser
+from typing import NamedTuple
+
+# Tags that start a new line of text when converting HTML to plain text
+BLOCK_TAGS = {
+    "p", "div", "br", "li", "ul", "ol", "blockquote", "pre",
+    "h1", "h2", "h3", "h4", "h5", "h6", "hr", "tr",
+}
+
+
+class _TextExtractor(HTMLParser):
+    """HTML parser that collects text content, one line per block element."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def html_to_text(content: str | None) -> str:
+    """
+    Convert editor HTML into plain text.
+
+    Block elements become line breaks, inline markup is dropped and
+    HTML entities are unescaped. Plain text input passes through unchanged.
+
+    Args:
+        content: The chapter content (HTML or plain text)
+
+    Returns:
+        The plain text, with runs of blank lines collapsed
+    """
+    if not content:
+        return ""
+    if "<" not in content:
+        return unescape(content).strip()
+
+    parser = _TextExtractor()
+    parser.feed(content)
+    parser.close()
+
+    lines = [line.strip() for line in "".join(parser.parts).split("\n")]
+    return "\n".join(line for line in lines if line)
+
+
+def count_words(content: str | None) -> int:
+    """
+    Count the words in chapter content.
+
+    Args:
+        content: The chapter content (HTML or plain text)
+
+    Returns:
+        The number of whitespace-separated words in the plain text
+    """
+    return len(html_to_text(content).split())
+
+
+class ContentStats(NamedTuple):
+    """Size statistics of chapter content."""
+    words: int
+    characters: int  # Characters of plain text, excluding line breaks
+    paragraphs: int  # Lines of text: paragraphs, headings, list items
+
+
+def content_stats(content: str | None) -> ContentStats:
+    """
+    Compute the statistics stored with each chapter.
+
+    Args:
+        content: The chapter content (HTML or plain text)
+
+    Returns:
+        Word, character and paragraph counts of the plain text
+    """
+    text = html_to_text(content)
+    if not text:
+        return ContentStats(0, 0, 0)
+    lines = text.split("\n")
+    return ContentStats(
+        words=len(text.split()),
+        characters=len(text) - (len(lines) - 1),
+        paragraphs=len(lines),
+    )
+
+
+def context_before(
+    content: str | None, cursor_offset: int | None, max_lines: int, max_chars: int
+) -> str:
+    """
+    Take the text leading up to a cursor position as AI context.
+
+    The chapter is converted with html_to_text, so cursor_offset counts
+    characters of that plain text (one line per block, blank lines
+    dropped). The last max_lines lines before the cursor are kept, then
+    trimmed from the front to max_chars, starting at a word boundary.
+
+    Args:
+        content: The chapter content (HTML or plain text)
+        cursor_offset: Position in the plain text; None means the end
+        max_lines: Most lines (paragraphs) to include
+        max_chars: Most characters to include
+
+    Returns:
+        The context, with paragraphs separated by blank lines as the
+        editor's own plain text is
+    """
+    text = html_to_text(content)
+    cursor = len(text) if cursor_offset is None else max(0, min(cursor_offset, len(text)))
+    lines = [line for line in text[:cursor].split("\n") if line.strip()][-max_lines:]
+    context = "\n\n".join(lines)
+    if len(context) > max_chars:
+        context = context[-max_chars:]
+        # Don't start in the middle of a word
+        boundary = re.search(r"\s+", context)
+        if boundary and boundary.end() < len(context):
+            context = context[boundary.end():]
+    return context.strip()
@@ -0,0 +1,98 @@
+"""
+Text edit operations for incremental chapter updates.
+
+An edit is a list of operations applied left to right against a base
+text, each one of:
+
+    {"retain": n}    keep the next n characters
+    {"insert": "s"}  insert s at the current position
+    {"delete": n}    remove the next n characters
+
+Any text left after the last operation is kept. Offsets count Unicode
+code points.
+"""
+
+
+class TextOpsError(ValueError):
+    """Raised when operations don't fit the text they are applied to."""
+
+
+def apply_text_ops(text: str, ops: list[dict]) -> str:
+    """
+    Apply edit operations to a text.
+
+    Args:
+        text: The base text
+        ops: List of retain/insert/delete operations
+
+    Returns:
+        The edited text
+
+    Raises:
+        TextOpsError: If an operation is malformed or runs past the end of the text
+    """
+    parts: list[str] = []
+    position = 0
+    length = len(text)
+
+    for op in ops:
+        if len(op) != 1:
+            raise TextOpsError(f"Operation must have exactly one key: {op}")
+        kind, value = next(iter(op.items()))
+
+        if kind == "insert":
+            parts.append(value)
+        elif kind in ("retain", "delete"):
+            if position + value > length:
+                raise TextOpsError(
+                    f"{kind} of {value} at offset {position} exceeds text length {length}"
+                )
+            if kind == "retain":
+                parts.append(text[position:position + value])
+            position += value
+        else:
+            raise TextOpsError(f"Unknown operation: {kind}")
+
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def _common_prefix_length(a: str, b: str) -> int:
+    # Binary search with slice comparisons, which run in C, instead of
+    # comparing chapter-length strings one character at a time in Python
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        mid = (low + high + 1) // 2
+        if a[low:mid] == b[low:mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def diff_text_ops(old: str, new: str) -> list[dict]:
+    """
+    Build the operations that turn one text into another.
+
+    Produces at most one retain, delete and insert around the changed
+    span between the common prefix and suffix, so the result is small
+    for localized edits.
+
+    Args:
+        old: The base text
+        new: The edited text
+
+    Returns:
+        List of retain/insert/delete operations; empty if the texts are equal
+    """
+    prefix = _common_prefix_length(old, new)
+    suffix = _common_prefix_length(old[prefix:][::-1], new[prefix:][::-1])
+
+    ops: list[dict] = []
+    if prefix:
+        ops.append({"retain": prefix})
+    if len(old) - prefix - suffix:
+        ops.append({"delete": len(old) - prefix - suffix})
+    if len(new) - prefix - suffix:
+        ops.append({"insert": new[prefix:len(new) - suffix]})
+    return ops
@@ -0,0 +1,316 @@
+"""
+Lightweight per-request tracing.
+
+TracingMiddleware gives every request an id (the client's X-Request-ID
+when it sends a sane one) and a Trace held in a context variable, which
+also follows sync dependencies and endpoints into the threadpool. Code
+marks its phases with `with span("name"):`, and database statements are
+added up per request. When the response starts, the spans are sent back
+in a Server-Timing header together with X-Request-ID. Once it finishes, a
+structured trace record is logged to the "app.trace" logger and, if
+tracing_otlp_endpoint is set, exported in the OTLP/HTTP JSON format to a
+local collector.
+
+Outside a request, span() does nothing.
+"""
+
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+import orjson
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import add_query_observer, route_template
+
+logger = logging.getLogger("app.trace")
+
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{8,64}$")
+# Server-Timing metric names must be tokens
+_TIMING_NAME = re.compile(r"[^A-Za-z0-9_-]")
+
+
+@dataclass
+class Span:
+    """A timed phase of a request."""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float  # perf_counter
+    start_unix: float
+    duration: float = 0.0
+
+
+@dataclass
+class Trace:
+    """The spans and query totals of one request."""
+    request_id: str
+    trace_id: str
+    root_id: str = field(default_factory=lambda: os.urandom(8).hex())
+    start: float = field(default_factory=time.perf_counter)
+    start_unix: float = field(default_factory=time.time)
+    spans: list[Span] = field(default_factory=list)
+    query_count: int = 0
+    query_time: float = 0.0
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("current_span", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """The trace of the request being handled, if any."""
+    return _current_trace.get()
+
+
+def current_request_id() -> str:
+    """The id of the request being handled, or a fresh one outside requests."""
+    trace = _current_trace.get()
+    return trace.request_id if trace else uuid.uuid4().hex
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as a phase of the current request."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    current = Span(
+        name=name,
+        span_id=os.urandom(8).hex(),
+        parent_id=_current_span.get() or trace.root_id,
+        start=time.perf_counter(),
+        start_unix=time.time(),
+    )
+    token = _current_span.set(current.span_id)
+    try:
+        yield
+    finally:
+        current.duration = time.perf_counter() - current.start
+        _current_span.reset(token)
+        trace.spans.append(current)
+
+
+def record_query(statement: str, parameters, executemany: bool, duration: float) -> None:
+    """Add a database statement to the current request's totals."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.query_count += 1
+        trace.query_time += duration
+
+
+add_query_observer(record_query)
+
+
+def server_timing(trace: Trace) -> str:
+    """
+    Build the Server-Timing header value for a trace.
+
+    Spans with the same name are added up; `db` holds all statements and
+    `total` the time until the response started.
+    """
+    totals: dict[str, float] = {}
+    for item in trace.spans:
+        name = _TIMING_NAME.sub("_", item.name)
+        totals[name] = totals.get(name, 0.0) + item.duration
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in totals.items()]
+    if trace.query_count:
+        queries = "query" if trace.query_count == 1 else "queries"
+        entries.append(f'db;dur={trace.query_time * 1000:.1f};desc="{trace.query_count} {queries}"')
+    entries.append(f"total;dur={(time.perf_counter() - trace.start) * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def trace_record(trace: Trace, method: str, route: str, status: int, duration: float) -> dict:
+    """The structured record logged for a finished request."""
+    return {
+        "request_id": trace.request_id,
+        "trace_id": trace.trace_id,
+        "method": method,
+        "route": route,
+        "status": status,
+        "duration_ms": round(duration * 1000, 2),
+        "db_queries": trace.query_count,
+        "db_ms": round(trace.query_time * 1000, 2),
+        "spans": [
+            {
+                "name": item.name,
+                "start_ms": round((item.start - trace.start) * 1000, 2),
+                "duration_ms": round(item.duration * 1000, 2),
+                "parent": item.parent_id if item.parent_id != trace.root_id else None,
+                "id": item.span_id,
+            }
+            for item in trace.spans
+        ],
+    }
+
+
+def _otlp_attributes(values: dict) -> list[dict]:
+    attributes = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            attributes.append({"key": key, "value": {"boolValue": value}})
+        elif isinstance(value, int):
+            attributes.append({"key": key, "value": {"intValue": str(value)}})
+        else:
+            attributes.append({"key": key, "value": {"stringValue": str(value)}})
+    return attributes
+
+
+def _nanos(unix_seconds: float) -> str:
+    return str(int(unix_seconds * 1_000_000_000))
+
+
+def otlp_spans(trace: Trace, method: str, route: str, status: int, duration: float) -> list[dict]:
+    """A finished request as OTLP JSON spans: the request and its phases."""
+    spans = [{
+        "traceId": trace.trace_id,
+        "spanId": trace.root_id,
+        "name": f"{method} {route}",
+        "kind": 2,  # SERVER
+        "startTimeUnixNano": _nanos(trace.start_unix),
+        "endTimeUnixNano": _nanos(trace.start_unix + duration),
+        "attributes": _otlp_attributes({
+            "http.request.method": method,
+            "http.route": route,
+            "http.response.status_code": status,
+            "request.id": trace.request_id,
+            "db.statement_count": trace.query_count,
+        }),
+        "status": {"code": 2 if status >= 500 else 0},
+    }]
+    for item in trace.spans:
+        spans.append({
+            "traceId": trace.trace_id,
+            "spanId": item.span_id,
+            "parentSpanId": item.parent_id,
+            "name": item.name,
+            "kind": 1,  # INTERNAL
+            "startTimeUnixNano": _nanos(item.start_unix),
+            "endTimeUnixNano": _nanos(item.start_unix + item.duration),
+        })
+    return spans
+
+
+class OTLPExporter:
+    """
+    Sends spans to an OTLP/HTTP collector (JSON encoding) from a background thread.
+
+    Spans are batched; when the collector can't keep up, the oldest
+    unsent requests are dropped rather than slowing requests down.
+
+    Args:
+        endpoint: Collector URL, e.g. http://localhost:4318/v1/traces
+        service_name: Reported as the service.name resource attribute
+    """
+
+    MAX_QUEUED = 2048
+    BATCH_SIZE = 256
+    FLUSH_SECONDS = 2.0
+
+    def __init__(self, endpoint: str, service_name: str = "diksiai-backend"):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self._queue: "queue.Queue[list[dict]]" = queue.Queue(self.MAX_QUEUED)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: list[dict]) -> None:
+        """Queue one request's spans for sending."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+                self._thread.start()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            self._queue.put_nowait(spans)
+
+    def _run(self) -> None:
+        while True:
+            batch = self._queue.get()
+            deadline = time.monotonic() + self.FLUSH_SECONDS
+            while len(batch) < self.BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.extend(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            self._send(batch)
+
+    def _send(self, spans: list[dict]) -> None:
+        body = orjson.dumps({"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": self.service_name})},
+            "scopeSpans": [{"scope": {"name": "app.tracing"}, "spans": spans}],
+        }]})
+        request = urllib.request.Request(
+            self.endpoint, data=body, headers={"Content-Type": "application/json"}, method="POST"
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=5):
+                pass
+        except Exception as e:
+            logger.warning(f"Could not export {len(spans)} spans to {self.endpoint}: {e}")
+
+
+class TracingMiddleware:
+    """ASGI middleware starting a trace per request and reporting it."""
+
+    def __init__(self, app: ASGIApp, exporter: Optional[OTLPExporter] = None,
+                 log_records: bool = True):
+        self.app = app
+        self.exporter = exporter
+        self.log_records = log_records
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get("x-request-id", "")
+        trace_id = uuid.uuid4().hex
+        trace = Trace(
+            request_id=incoming if _REQUEST_ID.match(incoming) else trace_id,
+            trace_id=trace_id,
+        )
+        token = _current_trace.set(trace)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = trace.request_id
+                headers["Server-Timing"] = server_timing(trace)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_trace.reset(token)
+            duration = time.perf_counter() - trace.start
+            route = route_template(scope)
+            if self.log_records:
+                logger.info(orjson.dumps(
+                    trace_record(trace, scope["method"], route, status_code, duration)
+                ).decode())
+            if self.exporter is not None:
+                self.exporter.export(otlp_spans(trace, scope["method"], route, status_code, duration))
@@ -0,0 +1,163 @@
+"""
+Benchmark login throughput and event-loop lag during a login burst.
+
+Drives the app in-process with httpx over ASGI, so requests share one
+event loop with a ticker task that wakes every few milliseconds and records
+how late it was. Each mode fires the same burst of concurrent logins:
+
+- ``pool``: the password hashing pool, as the app runs in production
+- ``inline``: bcrypt called directly on the event loop, for comparison
+
+Logins turned away because the hashing queue is full (503) are counted
+separately from successful ones.
+
+Usage (from the backend directory):
+
+    python scripts/bench_login.py --logins 40 --concurrency 20 --rounds 12 --workers 2
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "Bench-login-123"
+TICK_SECONDS = 0.005
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class InlineHashPool:
+    """Stand-in for PasswordHashPool that hashes on the calling thread."""
+
+    def __init__(self, verify_and_update):
+        self._verify_and_update = verify_and_update
+
+    async def verify_and_update(self, password: str, hashed_password: str):
+        return self._verify_and_update(password, hashed_password)
+
+
+async def measure_lag(stop: asyncio.Event, lags: list[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(loop.time() - started - TICK_SECONDS)
+
+
+async def burst(app, logins: int, concurrency: int) -> dict:
+    import httpx
+    from app.database import dispose_async_engine
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statuses: dict[int, int] = {}
+
+    async def login(client) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/v1/auth/login", json={"login": "bench", "password": PASSWORD}
+            )
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+            if response.status_code == 200:
+                latencies.append(time.perf_counter() - started)
+
+    lags: list[float] = []
+    stop = asyncio.Event()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        ticker = asyncio.create_task(measure_lag(stop, lags))
+        started = time.perf_counter()
+        await asyncio.gather(*(login(client) for _ in range(logins)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await ticker
+    # The async engine's connections belong to this run's event loop
+    await dispose_async_engine()
+
+    return {
+        "elapsed": elapsed,
+        "ok": statuses.get(200, 0),
+        "rejected": statuses.get(503, 0),
+        "other": sum(count for code, count in statuses.items() if code not in (200, 503)),
+        "latency_p50": statistics.median(latencies) if latencies else 0.0,
+        "latency_p95": percentile(latencies, 0.95),
+        "lag_p95": percentile(lags, 0.95),
+        "lag_max": max(lags, default=0.0),
+    }
+
+
+def setup(database_path: str, args: argparse.Namespace):
+    os.environ["DATABASE_URL"] = f"sqlite:///{database_path}"
+    os.environ["DEBUG"] = "false"
+    os.environ["PASSWORD_BCRYPT_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_QUEUE_LIMIT"] = str(args.queue_limit)
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(os.path.join(BACKEND_DIR, "alembic.ini")), "head")
+
+    from app.database import SessionLocal
+    from app.main import app
+    from app.models import User
+    from app.utils.auth import get_password_hash
+    from app.utils.rate_limiter import limiter
+
+    limiter.enabled = False
+    db = SessionLocal()
+    db.add(User(email="bench@example.com", username="bench", full_name="Bench",
+                hashed_password=get_password_hash(PASSWORD), is_approved=True))
+    db.commit()
+    db.close()
+    return app
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=40, help="Logins per burst")
+    parser.add_argument("--concurrency", type=int, default=20, help="Logins in flight at once")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost")
+    parser.add_argument("--workers", type=int, default=2, help="Hashing pool threads")
+    parser.add_argument("--queue-limit", type=int, default=32, help="Hashes allowed to wait")
+    parser.add_argument("--modes", nargs="+", choices=("pool", "inline"), default=["pool", "inline"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        app = setup(os.path.join(directory, "bench.db"), args)
+
+        from app.services import auth_service
+        from app.utils.auth import verify_and_update_password
+
+        pool = auth_service.password_pool
+        print(f"{args.logins} logins, {args.concurrency} concurrent, bcrypt cost {args.rounds}, "
+              f"{args.workers} hashing threads, queue limit {args.queue_limit}")
+        print(f"{'mode':<8}{'logins/s':>10}{'ok':>6}{'503':>6}{'other':>7}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'lag p95 ms':>12}{'lag max ms':>12}")
+        for mode in args.modes:
+            auth_service.password_pool = pool if mode == "pool" else InlineHashPool(verify_and_update_password)
+            result = asyncio.run(burst(app, args.logins, args.concurrency))
+            print(f"{mode:<8}{result['ok'] / result['elapsed']:>10.1f}{result['ok']:>6}"
+                  f"{result['rejected']:>6}{result['other']:>7}"
+                  f"{result['latency_p50'] * 1000:>9.0f}{result['latency_p95'] * 1000:>9.0f}"
+                  f"{result['lag_p95'] * 1000:>12.1f}{result['lag_max'] * 1000:>12.1f}")
+        auth_service.password_pool = pool
+        pool.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+Benchmark response serialization and compression.
+
+Runs representative get_project and live_review payloads through
+FastAPI's response validation/serialization, then compares rendering
+with the stdlib json encoder (JSONResponse) against orjson
+(ORJSONResponse), and reports bytes on the wire for each content coding
+CompressionMiddleware can produce.
+
+Usage (from the backend directory):
+
+    python scripts/bench_response_encoding.py [--chapters 60] [--chapter-size 20000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse, ORJSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.api.ai import LiveReviewResponse  # noqa: E402
+from app.schemas import Project as ProjectSchema  # noqa: E402
+from app.config import get_settings  # noqa: E402
+from app.utils.response_compression import compress_body, supported_encodings  # noqa: E402
+
+WORDS = (
+    "hujan turun perlahan di atas kota tua dan sari menatap jendela dengan mata "
+    "yang basah karena kenangan tentang ibunya kembali datang tanpa diundang "
+    "malam itu angin berbisik pelan seolah menyimpan rahasia yang tak pernah terucap"
+).split()
+
+
+def prose(size: int, rng: random.Random) -> str:
+    paragraphs, length = [], 0
+    while length < size:
+        sentence = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+        paragraphs.append(f"<p>{sentence}</p>")
+        length += len(paragraphs[-1])
+    return "".join(paragraphs)
+
+
+def project_payload(chapters: int, chapter_size: int) -> dict:
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc)
+    return {
+        "id": 1, "title": "Novel", "description": "Sebuah novel", "created_at": now, "updated_at": now,
+        "chapters": [
+            {
+                "id": i, "project_id": 1, "title": f"Bab {i}", "content": prose(chapter_size, rng),
+                "order": i, "version": 3, "word_count": chapter_size // 6, "created_at": now, "updated_at": now,
+            }
+            for i in range(chapters)
+        ],
+    }
+
+
+def live_review_payload(issues: int) -> dict:
+    rng = random.Random(2)
+    return {
+        "model": "openai/gpt-oss-120b",
+        "issues": [
+            {
+                "original_text": prose(80, rng), "start_offset": i * 100, "end_offset": i * 100 + 80,
+                "severity": rng.choice(["critical", "warning"]), "issue_type": "style",
+                "suggestion": prose(100, rng), "explanation": prose(200, rng),
+            }
+            for i in range(issues)
+        ],
+    }
+
+
+def timed(fn, repeat: int) -> tuple[float, object]:
+    result = fn()
+    start = time.process_time()
+    for _ in range(repeat):
+        fn()
+    return (time.process_time() - start) / repeat * 1000, result
+
+
+def bench(name: str, model, payload: dict, repeat: int) -> None:
+    field = create_response_field(name="response", type_=model)
+
+    def serialize():
+        return asyncio.run(serialize_response(field=field, response_content=payload))
+
+    serialize_ms, content = timed(serialize, repeat)
+    json_ms, json_body = timed(lambda: JSONResponse(content).body, repeat)
+    orjson_ms, orjson_body = timed(lambda: ORJSONResponse(content).body, repeat)
+
+    print(f"\n{name}")
+    print(f"  validate + serialize     {serialize_ms:8.2f} ms")
+    print(f"  render json (stdlib)     {json_ms:8.2f} ms  {len(json_body):>10,} bytes")
+    print(f"  render orjson            {orjson_ms:8.2f} ms  {len(orjson_body):>10,} bytes")
+    settings = get_settings()
+    levels = {"gzip": (1, settings.response_gzip_level), "br": (1, settings.response_brotli_quality)}
+    for encoding in supported_encodings():
+        for level in levels[encoding]:
+            compress_ms, compressed = timed(
+                lambda: compress_body(orjson_body, encoding, gzip_level=level, brotli_quality=level),
+                max(1, repeat // 5),
+            )
+            ratio = len(orjson_body) / len(compressed)
+            label = f"{encoding} level {level}"
+            print(f"  {label:<24} {compress_ms:8.2f} ms  {len(compressed):>10,} bytes  ({ratio:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chapters", type=int, default=60)
+    parser.add_argument("--chapter-size", type=int, default=20_000, help="Characters of HTML per chapter")
+    parser.add_argument("--issues", type=int, default=40, help="Issues in the live_review response")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    bench(f"get_project ({args.chapters} chapters x {args.chapter_size:,} chars)",
+          ProjectSchema, project_payload(args.chapters, args.chapter_size), args.repeat)
+    bench(f"live_review ({args.issues} issues)",
+          LiveReviewResponse, live_review_payload(args.issues), args.repeat * 10)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark concurrent autosave throughput for the SQLite storage profiles.
+
+Simulates the production layout (several uvicorn workers, each with a
+threadpool) by running worker processes whose threads repeatedly save
+chapter content to one shared database file. Each profile gets a fresh
+database so WAL mode (which persists in the file) doesn't leak between runs.
+
+Usage (from the backend directory):
+
+    python scripts/bench_sqlite_profile.py --workers 2 --threads 8 --seconds 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.config import Settings  # noqa: E402
+from app.database import Base, create_database_engine  # noqa: E402
+from app.models import User, Project, Chapter  # noqa: E402
+
+CHAPTER_COUNT = 60
+CHAPTER_SIZE = 50_000
+
+
+def seed(url: str, profile: str) -> None:
+    engine = create_database_engine(url, Settings(sqlite_profile=profile))
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), {
+            "id": 1, "email": "bench@example.com", "username": "bench",
+            "full_name": "Bench", "hashed_password": "x", "is_approved": True,
+        })
+        connection.execute(Project.__table__.insert(), {"id": 1, "user_id": 1, "title": "Bench"})
+        connection.execute(Chapter.__table__.insert(), [
+            {"id": i, "project_id": 1, "title": f"Bab {i}", "content": "a" * CHAPTER_SIZE, "order": i}
+            for i in range(1, CHAPTER_COUNT + 1)
+        ])
+    engine.dispose()
+
+
+def run_worker(url: str, profile: str, threads: int, seconds: float, results) -> None:
+    engine = create_database_engine(url, Settings(sqlite_profile=profile))
+    deadline = time.perf_counter() + seconds
+    counts = {"saves": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def autosave_loop():
+        saves = errors = 0
+        body = "kata " * (CHAPTER_SIZE // 5)
+        while time.perf_counter() < deadline:
+            chapter_id = random.randint(1, CHAPTER_COUNT)
+            try:
+                with engine.begin() as connection:
+                    connection.execute(
+                        update(Chapter.__table__)
+                        .where(Chapter.__table__.c.id == chapter_id)
+                        .values(content=body + str(saves))
+                    )
+                    # Autosave responses read the row back
+                    connection.execute(
+                        Chapter.__table__.select().where(Chapter.__table__.c.id == chapter_id)
+                    ).one()
+                saves += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["saves"] += saves
+            counts["errors"] += errors
+
+    pool = [threading.Thread(target=autosave_loop) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    engine.dispose()
+    results.put(counts)
+
+
+def bench(profile: str, workers: int, threads: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        seed(url, profile)
+
+        results = multiprocessing.Queue()
+        procs = [
+            multiprocessing.Process(target=run_worker, args=(url, profile, threads, seconds, results))
+            for _ in range(workers)
+        ]
+        for proc in procs:
+            proc.start()
+        totals = {"saves": 0, "errors": 0}
+        for _ in procs:
+            counts = results.get()
+            totals["saves"] += counts["saves"]
+            totals["errors"] += counts["errors"]
+        for proc in procs:
+            proc.join()
+
+    totals["saves_per_sec"] = totals["saves"] / seconds
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--profiles", nargs="+", default=["default", "production"])
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.threads} threads, {args.seconds:.0f}s, "
+          f"{CHAPTER_COUNT} chapters of {CHAPTER_SIZE // 1000} KB")
+    for profile in args.profiles:
+        result = bench(profile, args.workers, args.threads, args.seconds)
+        print(f"{profile:>10}: {result['saves_per_sec']:8.1f} saves/s  "
+              f"({result['saves']} saves, {result['errors']} lock errors)")
+
+
+if __name__ == "__main__":
+    main()
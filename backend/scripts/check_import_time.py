@@ -0,0 +1,91 @@
+"""
+Import-time budget check for the application module.
+
+Imports app.main in fresh interpreters under ``python -X importtime`` and
+exits non-zero if the median import time exceeds the budget, or if a
+package that is meant to load lazily (see LAZY_PACKAGES) was imported
+eagerly. The slowest top-level packages are listed to show where the
+time goes.
+
+Usage (from the backend directory):
+
+    python scripts/check_import_time.py [--budget-ms 1800] [--runs 5] [--verbose]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULE = "app.main"
+# Packages only needed by some requests; they are imported on first use
+# or by the startup warm-up, never while importing the app
+LAZY_PACKAGES = ("groq", "passlib")
+
+
+def measure() -> dict[str, tuple[int, int]]:
+    """Import MODULE in a fresh interpreter; {module: (self us, cumulative us)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"Importing {MODULE} failed")
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def by_package(modules: dict[str, tuple[int, int]]) -> list[tuple[str, int]]:
+    """Self time summed per top-level package, slowest first."""
+    totals: dict[str, int] = {}
+    for name, (self_us, _) in modules.items():
+        package = name.split(".", 1)[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--budget-ms", type=float, default=1800, help="Allowed median import time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--verbose", action="store_true", help="List the slowest packages")
+    args = parser.parse_args()
+
+    # One untimed run so bytecode caches and the OS page cache are warm
+    measure()
+    runs = [measure() for _ in range(args.runs)]
+    median_ms = statistics.median(run[MODULE][1] for run in runs) / 1000
+
+    failed = False
+    eager = sorted({
+        name for name in runs[0]
+        if name.split(".", 1)[0] in LAZY_PACKAGES
+    })
+    if eager:
+        failed = True
+        print(f"[FAIL] lazily loaded packages imported by {MODULE}: {', '.join(eager[:10])}")
+
+    status = "  ok" if median_ms <= args.budget_ms else "FAIL"
+    failed = failed or median_ms > args.budget_ms
+    print(f"[{status}] import {MODULE}: {median_ms:.0f} ms median of {args.runs} (budget {args.budget_ms:.0f} ms)")
+
+    if args.verbose or failed:
+        for package, self_us in by_package(runs[-1])[:15]:
+            print(f"         {package:<24}{self_us / 1000:>8.1f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Query-plan regression check for the repository layer.
+
+Migrates a scratch SQLite database to head, seeds it with a large
+multi-user dataset, calls each repository method while capturing the
+SQL it emits, and runs EXPLAIN QUERY PLAN on every captured statement.
+Exits non-zero if any statement does a full table scan.
+
+Usage (from the backend directory):
+
+    python scripts/check_query_plans.py [--users 200] [--verbose]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+_tmp_dir = tempfile.mkdtemp(prefix="query-plans-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'plans.db')}"
+os.environ["DATABASE_ECHO"] = "false"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from alembic import command  # noqa: E402
+from alembic.config import Config  # noqa: E402
+from sqlalchemy import event, text  # noqa: E402
+
+from app.database import engine, SessionLocal  # noqa: E402
+from app.models import User, Project, Chapter, UserSettings  # noqa: E402
+from app.repositories import (  # noqa: E402
+    ProjectRepository, ChapterRepository, SearchRepository, UserSettingsRepository, RevisionRepository,
+)
+from app.services.auth_service import AuthService  # noqa: E402
+from app.utils.text import html_to_text  # noqa: E402
+
+USER_ID_OFFSET = 1
+PROJECTS_PER_USER = 20
+CHAPTERS_PER_PROJECT = 30
+CHAPTER_CONTENT = "<p>Hujan turun di kota.</p>"
+
+# SQLite reports constrained lookups as "SEARCH ..." and anything that
+# walks a whole table or index as "SCAN ...". FTS lookups also show up as
+# "SCAN t VIRTUAL TABLE INDEX n:M" even though the MATCH constrains them.
+ALLOWED_SCAN_MARKERS = ("VIRTUAL TABLE", "CONSTANT ROW")
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+
+def migrate() -> None:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    command.upgrade(config, "head")
+
+
+def seed(users: int) -> None:
+    user_rows, settings_rows, project_rows, chapter_rows = [], [], [], []
+    project_id = chapter_id = 0
+    # User IDs start after the admin account created by the first migration
+    for user_id in range(USER_ID_OFFSET + 1, USER_ID_OFFSET + users + 1):
+        user_rows.append({
+            "id": user_id, "email": f"user{user_id}@example.com", "username": f"user{user_id}",
+            "full_name": f"User {user_id}", "hashed_password": "x", "is_approved": True,
+        })
+        settings_rows.append({"user_id": user_id, "custom_prompts": {}})
+        for _ in range(PROJECTS_PER_USER):
+            project_id += 1
+            project_rows.append({"id": project_id, "user_id": user_id, "title": f"Project {project_id}"})
+            for order in range(CHAPTERS_PER_PROJECT):
+                chapter_id += 1
+                chapter_rows.append({
+                    "id": chapter_id, "project_id": project_id, "title": f"Bab {order}",
+                    "content": CHAPTER_CONTENT, "order": order,
+                })
+
+    with engine.begin() as connection:
+        connection.execute(User.__table__.insert(), user_rows)
+        connection.execute(UserSettings.__table__.insert(), settings_rows)
+        connection.execute(Project.__table__.insert(), project_rows)
+        connection.execute(Chapter.__table__.insert(), chapter_rows)
+        # Content is stored compressed, so index the plain text directly
+        connection.execute(
+            text("INSERT INTO chapters_fts (rowid, title, content) SELECT id, title, :content FROM chapters"),
+            {"content": html_to_text(CHAPTER_CONTENT)},
+        )
+        # One snapshot revision per chapter, copying the stored content as-is
+        connection.execute(text(
+            "INSERT INTO chapter_revisions (chapter_id, revision, is_snapshot, data, content_length, chapter_version) "
+            "SELECT id, 1, 1, content, :length, 1 FROM chapters"
+        ), {"length": len(CHAPTER_CONTENT)})
+        connection.execute(text("ANALYZE"))
+
+
+class StatementRecorder:
+    """Collects the statements executed on the engine while active."""
+
+    def __init__(self):
+        self.statements: list[tuple[str, object]] = []
+        self.active = False
+        event.listen(engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if self.active and not executemany and statement.lstrip().upper().startswith(EXPLAINABLE):
+            self.statements.append((statement, parameters))
+
+    def capture(self, fn):
+        self.statements = []
+        self.active = True
+        try:
+            fn()
+        finally:
+            self.active = False
+        return list(self.statements)
+
+
+def explain(statement: str, parameters) -> list[str]:
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def full_scans(plan: list[str]) -> list[str]:
+    return [
+        step for step in plan
+        if step.startswith("SCAN ") and not any(marker in step for marker in ALLOWED_SCAN_MARKERS)
+    ]
+
+
+def build_cases(users: int):
+    """Repository calls to check, as (name, fn(db)) pairs."""
+    user_id = USER_ID_OFFSET + users // 2
+    project_id = (user_id - USER_ID_OFFSET - 1) * PROJECTS_PER_USER + 1
+    chapter_id = (project_id - 1) * CHAPTERS_PER_PROJECT + 1
+
+    return [
+        ("ProjectRepository.get_by_id", lambda db: ProjectRepository(db).get_by_id(project_id, user_id)),
+        ("ProjectRepository.get_version_vector",
+         lambda db: ProjectRepository(db).get_version_vector(project_id, user_id)),
+        ("ProjectRepository.list_for_user", lambda db: ProjectRepository(db).list_for_user(user_id)),
+        ("ProjectRepository.list_page_for_user (after cursor)",
+         lambda db: ProjectRepository(db).list_page_for_user(user_id, 20, after_id=project_id)),
+        ("Project.chapters (lazy load)", lambda db: ProjectRepository(db).get_by_id(project_id, user_id).chapters),
+        ("ProjectRepository.update", lambda db: ProjectRepository(db).update(
+            ProjectRepository(db).get_by_id(project_id, user_id), auto_commit=False, title="Renamed")),
+        ("ProjectRepository.delete", lambda db: ProjectRepository(db).delete(
+            ProjectRepository(db).get_by_id(project_id, user_id), auto_commit=False)),
+        ("ChapterRepository.get_by_id", lambda db: ChapterRepository(db).get_by_id(chapter_id, project_id, user_id)),
+        ("ChapterRepository.get_version",
+         lambda db: ChapterRepository(db).get_version(chapter_id, project_id, user_id)),
+        ("ChapterRepository.list_outline", lambda db: ChapterRepository(db).list_outline(project_id)),
+        ("ChapterRepository.list_page (after cursor)",
+         lambda db: ChapterRepository(db).list_page(project_id, 20, after_id=chapter_id)),
+        ("ChapterRepository.update", lambda db: ChapterRepository(db).update(
+            ChapterRepository(db).get_by_id(chapter_id, project_id, user_id), auto_commit=False,
+            content="<p>Baru</p>")),
+        ("ChapterRepository.delete", lambda db: ChapterRepository(db).delete(
+            ChapterRepository(db).get_by_id(chapter_id, project_id, user_id), auto_commit=False)),
+        ("RevisionRepository.list_for_chapter",
+         lambda db: RevisionRepository(db).list_for_chapter(chapter_id, limit=50)),
+        ("RevisionRepository.get_text", lambda db: RevisionRepository(db).get_text(chapter_id, 1)),
+        ("RevisionRepository.record", lambda db: RevisionRepository(db).record(
+            ChapterRepository(db).get_by_id(chapter_id, project_id, user_id))),
+        ("SearchRepository.search", lambda db: SearchRepository(db).search(user_id, "hujan")),
+        ("SearchRepository.search (project)", lambda db: SearchRepository(db).search(
+            user_id, "hujan", project_id=project_id)),
+        ("UserSettingsRepository.get_for_user", lambda db: UserSettingsRepository(db).get_for_user(user_id)),
+        ("UserSettingsRepository.get_custom_prompts",
+         lambda db: UserSettingsRepository(db).get_custom_prompts(user_id)),
+        ("AuthService.get_user_by_id", lambda db: AuthService(db).get_user_by_id(user_id)),
+        ("AuthService.get_user_by_email", lambda db: AuthService(db).get_user_by_email(f"user{user_id}@example.com")),
+        ("AuthService.get_user_by_username", lambda db: AuthService(db).get_user_by_username(f"user{user_id}")),
+    ]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    migrate()
+    seed(args.users)
+    print(f"Seeded {args.users} users, {args.users * PROJECTS_PER_USER} projects, "
+          f"{args.users * PROJECTS_PER_USER * CHAPTERS_PER_PROJECT} chapters")
+
+    recorder = StatementRecorder()
+    failures = 0
+    for name, case in build_cases(args.users):
+        db = SessionLocal()
+        try:
+            statements = recorder.capture(lambda: (case(db), db.flush()))
+        finally:
+            db.rollback()
+            db.close()
+
+        scans = []
+        for statement, parameters in statements:
+            plan = explain(statement, parameters)
+            scans.extend(full_scans(plan))
+            if args.verbose:
+                print(f"  {' '.join(statement.split())[:120]}")
+                for step in plan:
+                    print(f"    {step}")
+
+        status = "FAIL" if scans else "ok"
+        print(f"[{status:>4}] {name} ({len(statements)} statements)")
+        for scan in scans:
+            print(f"         full scan: {scan}")
+        failures += bool(scans)
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -65,6 +65,7 @@ function MainContent({
   activeProject,
   activeChapter,
   onUpdateChapter,
+  onFlushChapter,
 }) {
   if (currentView === VIEWS.SETTINGS) {
     return (
@@ -77,7 +78,7 @@ function MainContent({
   if (activeProject && activeChapter) {
     return (
       <EditorErrorBoundary>
-        <Editor chapter={activeChapter} onUpdate={onUpdateChapter} />
+        <Editor chapter={activeChapter} onUpdate={onUpdateChapter} onFlush={onFlushChapter} />
       </EditorErrorBoundary>
     );
   }
@@ -194,6 +195,7 @@ export default function App() {
           activeProject={projectManager.activeProject}
           activeChapter={projectManager.activeChapter}
           onUpdateChapter={projectManager.updateChapterContent}
+          onFlushChapter={projectManager.flushChapterContent}
         />
       </div>
 
@@ -18,10 +18,12 @@ import ContinuationPanel from './ContinuationPanel';
 import { LiveReviewExtension } from '../../extensions/LiveReviewExtension';
 import { useContinuation, useImprovement, useTitleSuggestion, useLiveReview } from '../../hooks';
 import { AVAILABLE_MODELS, DEFAULT_MODEL } from '../../constants/styles';
+import { plainTextCursorOffset } from '../../utils/textOps';
 
-export default function Editor({ chapter, onUpdate }) {
+export default function Editor({ chapter, onUpdate, onFlush }) {
   const [selectedModel, setSelectedModel] = useState(DEFAULT_MODEL);
-  const lastChapterIdRef = useRef(null);
+  // Chapter and version shown in the editor
+  const lastChapterRef = useRef({ id: null, version: null });
 
   // Custom hooks for AI features
   const continuation = useContinuation();
@@ -60,11 +62,13 @@ export default function Editor({ chapter, onUpdate }) {
   useEffect(() => {
     if (!editor) return;
 
-    // Only update content when switching to a different chapter
-    const chapterChanged = chapter?.id !== lastChapterIdRef.current;
+    // Only update content when switching to a different chapter, or when
+    // a newer version was loaded (e.g. after a save conflict)
+    const last = lastChapterRef.current;
+    const chapterChanged = chapter?.id !== last.id || chapter?.version !== last.version;
 
     if (chapterChanged) {
-      lastChapterIdRef.current = chapter?.id;
+      lastChapterRef.current = { id: chapter?.id, version: chapter?.version };
       const newContent = chapter?.content || '';
       const currentContent = editor.getHTML();
 
@@ -73,12 +77,20 @@ export default function Editor({ chapter, onUpdate }) {
         editor.commands.setContent(newContent);
       }
     }
-  }, [editor, chapter?.id, chapter?.content]);
+  }, [editor, chapter?.id, chapter?.version, chapter?.content]);
+
+  // The saved chapter and cursor position the server continues from
+  const continuationSource = () => ({
+    projectId: chapter?.project_id,
+    chapterId: chapter?.id,
+    cursorOffset: plainTextCursorOffset(editor),
+    flush: onFlush,
+  });
 
   // Event handlers that wrap hook methods with editor context
   const handleGenerateSuggestion = () => {
     if (editor) {
-      continuation.generateSuggestion(editor.getText(), selectedModel);
+      continuation.generateSuggestion(editor.getText(), selectedModel, continuationSource());
     }
   };
 
@@ -88,7 +100,7 @@ export default function Editor({ chapter, onUpdate }) {
 
   const handleRegenerateSuggestion = () => {
     if (editor) {
-      continuation.regenerateSuggestion(editor.getText(), selectedModel);
+      continuation.regenerateSuggestion(editor.getText(), selectedModel, continuationSource());
     }
   };
 
@@ -13,6 +13,8 @@ import useErrorHandler from '../hooks/useErrorHandler';
 const ProjectContext = createContext();
 
 const SAVE_DEBOUNCE_MS = 1000;
+// The project tree only shows these; skips serializing the rest
+const PROJECT_LIST_PARAMS = { fields: 'id,title,chapter_count', limit: 200 };
 
 export function ProjectProvider({ children, isAuthenticated }) {
   const [projects, setProjects] = useState([]);
@@ -49,8 +51,7 @@ export function ProjectProvider({ children, isAuthenticated }) {
     setLoading(true);
     setError(null);
     try {
-      const response = await projectsAPI.list();
-      setProjects(response.data);
+      setProjects(await projectsAPI.listAll(PROJECT_LIST_PARAMS));
     } catch (err) {
       console.error('Error loading projects:', err);
       setError('Failed to load projects');
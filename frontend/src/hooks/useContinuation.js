@@ -2,7 +2,9 @@
  * Custom hook for AI text continuation functionality.
  *
  * Manages state and logic for generating AI-powered text continuations
- * based on the current editor content.
+ * based on the current editor content. When the chapter is known, only
+ * its IDs and the cursor position are sent and the server reads the
+ * context from the saved chapter.
  */
 
 import { useState } from 'react';
@@ -16,7 +18,9 @@ export default function useContinuation() {
   const [paragraphCount, setParagraphCount] = useState(1);
   const [briefIdea, setBriefIdea] = useState('');
 
-  const generateSuggestion = async (text, selectedModel) => {
+  // source: { projectId, chapterId, cursorOffset, flush } of the chapter
+  // being edited; without it the text itself is sent as context
+  const generateSuggestion = async (text, selectedModel, source) => {
     if (!text || text.trim().length < 50) {
       setError('Please write at least 50 characters before generating suggestions.');
       return;
@@ -27,12 +31,23 @@ export default function useContinuation() {
     setSuggestion(null);
 
     try {
-      const response = await aiAPI.continue(text, {
+      const options = {
         writingStyle,
         paragraphCount,
         briefIdea: briefIdea.trim() || undefined,
         model: selectedModel
-      });
+      };
+      let response;
+      if (source?.projectId && source?.chapterId) {
+        // The server must see the latest edits before reading the chapter
+        await source.flush?.();
+        response = await aiAPI.continueChapter(source.projectId, source.chapterId, {
+          ...options,
+          cursorOffset: source.cursorOffset,
+        });
+      } else {
+        response = await aiAPI.continue(text, options);
+      }
       setSuggestion(response.data.continuation);
     } catch (err) {
       console.error('Error generating suggestion:', err);
@@ -57,8 +72,8 @@ export default function useContinuation() {
     setSuggestion(null);
   };
 
-  const regenerateSuggestion = (text, selectedModel) => {
-    generateSuggestion(text, selectedModel);
+  const regenerateSuggestion = (text, selectedModel, source) => {
+    generateSuggestion(text, selectedModel, source);
   };
 
   return {
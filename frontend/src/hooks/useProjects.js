@@ -7,12 +7,15 @@
 
 import { useState, useEffect, useCallback, useRef } from 'react';
 import { projectsAPI, chaptersAPI } from '../services/api';
+import { buildTextOps } from '../utils/textOps';
 import useErrorHandler from './useErrorHandler';
 import { useNotifications } from '../contexts/NotificationContext';
 
 const SAVE_DEBOUNCE_MS = 1000;
 const DEFAULT_CHAPTER_TITLE = 'Chapter 1';
 const DEFAULT_CHAPTER_ORDER = 0;
+// The project tree only shows these; skips serializing the rest
+const PROJECT_LIST_PARAMS = { fields: 'id,title,chapter_count', limit: 200 };
 
 export default function useProjects(isAuthenticated) {
   const [projects, setProjects] = useState([]);
@@ -23,8 +26,12 @@ export default function useProjects(isAuthenticated) {
   const saveTimeoutRef = useRef(null);
   const savingRef = useRef(false);
   const pendingContentRef = useRef(null);
+  // Last content and version confirmed by the server, per chapter ID
+  const savedChaptersRef = useRef({});
+  // Chapter most recently requested, so slower responses don't override it
+  const requestedChapterRef = useRef(null);
   const { handleError } = useErrorHandler();
-  const { showSuccess } = useNotifications();
+  const { showSuccess, showWarning } = useNotifications();
 
   // Load projects when authenticated
   useEffect(() => {
@@ -51,8 +58,7 @@ export default function useProjects(isAuthenticated) {
     setLoading(true);
     setError(null);
     try {
-      const response = await projectsAPI.list();
-      setProjects(response.data);
+      setProjects(await projectsAPI.listAll(PROJECT_LIST_PARAMS));
     } catch (err) {
       const errorMessage = 'Failed to load projects';
       console.error('Error loading projects:', err);
@@ -63,18 +69,26 @@ export default function useProjects(isAuthenticated) {
     }
   };
 
+  // Fetch a chapter's content; the project outline only has titles
+  const openChapter = useCallback(async (projectId, chapter) => {
+    requestedChapterRef.current = chapter?.id ?? null;
+    if (!chapter) {
+      setActiveChapter(null);
+      return;
+    }
+    const response = await chaptersAPI.get(projectId, chapter.id);
+    if (requestedChapterRef.current === chapter.id) {
+      setActiveChapter(response.data);
+    }
+  }, []);
+
   const loadProject = useCallback(async (project) => {
     setLoading(true);
     setError(null);
     try {
-      const response = await projectsAPI.get(project.id);
+      const response = await projectsAPI.outline(project.id);
       setActiveProject(response.data);
-
-      if (response.data.chapters.length > 0) {
-        setActiveChapter(response.data.chapters[0]);
-      } else {
-        setActiveChapter(null);
-      }
+      await openChapter(project.id, response.data.chapters[0]);
     } catch (err) {
       const errorMessage = 'Failed to load project';
       console.error('Error loading project:', err);
@@ -83,7 +97,7 @@ export default function useProjects(isAuthenticated) {
     } finally {
       setLoading(false);
     }
-  }, [handleError]);
+  }, [openChapter, handleError]);
 
   const createProject = useCallback(async (data) => {
     setLoading(true);
@@ -99,6 +113,7 @@ export default function useProjects(isAuthenticated) {
       });
 
       await loadProject(response.data);
+      requestedChapterRef.current = chapterResponse.data.id;
       setActiveChapter(chapterResponse.data);
 
       showSuccess('Project created successfully');
@@ -173,8 +188,9 @@ export default function useProjects(isAuthenticated) {
       });
 
       const newChapter = response.data;
-      const projectResponse = await projectsAPI.get(activeProject.id);
+      const projectResponse = await projectsAPI.outline(activeProject.id);
       setActiveProject(projectResponse.data);
+      requestedChapterRef.current = newChapter.id;
       setActiveChapter(newChapter);
 
       showSuccess('Chapter created successfully');
@@ -190,9 +206,48 @@ export default function useProjects(isAuthenticated) {
     }
   }, [activeProject, handleError, showSuccess]);
 
-  const selectChapter = useCallback((chapter) => {
-    setActiveChapter(chapter);
-  }, []);
+  const selectChapter = useCallback(async (chapter) => {
+    if (!activeProject) return;
+
+    try {
+      await openChapter(activeProject.id, chapter);
+    } catch (err) {
+      console.error('Error loading chapter:', err);
+      handleError(err, 'Failed to load chapter');
+    }
+  }, [activeProject, openChapter, handleError]);
+
+  // Send only the edit since the last save. If the chapter changed
+  // elsewhere (version conflict), load the current version instead of
+  // overwriting it, and tell the user their edit wasn't saved
+  const saveChapterContent = async ({ projectId, chapterId, content, loaded }) => {
+    const saved = savedChaptersRef.current[chapterId];
+    const base = saved && saved.version >= loaded.version ? saved : loaded;
+    const ops = buildTextOps(base.content, content);
+    if (ops.length === 0) return;
+
+    try {
+      const response = await chaptersAPI.patch(projectId, chapterId, base.version, ops);
+      savedChaptersRef.current[chapterId] = { content, version: response.data.version };
+    } catch (err) {
+      if (err.response?.status !== 409) {
+        throw err;
+      }
+      const response = await chaptersAPI.get(projectId, chapterId);
+      savedChaptersRef.current[chapterId] = {
+        content: response.data.content || '',
+        version: response.data.version,
+      };
+      // Later edits were made on the outdated content too
+      if (pendingContentRef.current?.chapterId === chapterId) {
+        pendingContentRef.current = null;
+      }
+      if (requestedChapterRef.current === chapterId) {
+        setActiveChapter(response.data);
+      }
+      showWarning('This chapter was changed elsewhere. The latest version has been loaded; your recent edits were not saved.');
+    }
+  };
 
   const updateChapterContent = useCallback((content) => {
     if (!activeProject || !activeChapter) return;
@@ -201,7 +256,12 @@ export default function useProjects(isAuthenticated) {
     const chapterId = activeChapter.id;
 
     // Store pending content for race condition handling
-    pendingContentRef.current = { projectId, chapterId, content };
+    pendingContentRef.current = {
+      projectId,
+      chapterId,
+      content,
+      loaded: { content: activeChapter.content || '', version: activeChapter.version },
+    };
 
     if (saveTimeoutRef.current) {
       clearTimeout(saveTimeoutRef.current);
@@ -225,7 +285,7 @@ export default function useProjects(isAuthenticated) {
 
       try {
         if (pending) {
-          await chaptersAPI.update(pending.projectId, pending.chapterId, { content: pending.content });
+          await saveChapterContent(pending);
         }
       } catch (err) {
         console.error('Error updating chapter:', err);
@@ -236,6 +296,28 @@ export default function useProjects(isAuthenticated) {
     }, SAVE_DEBOUNCE_MS);
   }, [activeProject, activeChapter, handleError]);
 
+  // Save any debounced edit now, so the server has what the editor shows
+  const flushChapterContent = useCallback(async () => {
+    if (saveTimeoutRef.current) {
+      clearTimeout(saveTimeoutRef.current);
+      saveTimeoutRef.current = null;
+    }
+    while (savingRef.current) {
+      await new Promise(resolve => setTimeout(resolve, 50));
+    }
+
+    const pending = pendingContentRef.current;
+    if (!pending) return;
+
+    savingRef.current = true;
+    pendingContentRef.current = null;
+    try {
+      await saveChapterContent(pending);
+    } finally {
+      savingRef.current = false;
+    }
+  }, []);
+
   const deleteChapter = useCallback(async (chapterId) => {
     if (!activeProject) return;
 
@@ -246,12 +328,8 @@ export default function useProjects(isAuthenticated) {
       await loadProject(activeProject);
 
       if (activeChapter?.id === chapterId) {
-        const updatedProject = await projectsAPI.get(activeProject.id);
-        if (updatedProject.data.chapters.length > 0) {
-          setActiveChapter(updatedProject.data.chapters[0]);
-        } else {
-          setActiveChapter(null);
-        }
+        const updatedProject = await projectsAPI.outline(activeProject.id);
+        await openChapter(activeProject.id, updatedProject.data.chapters[0]);
       }
 
       showSuccess('Chapter deleted successfully');
@@ -264,7 +342,7 @@ export default function useProjects(isAuthenticated) {
     } finally {
       setLoading(false);
     }
-  }, [activeProject, activeChapter, loadProject, handleError, showSuccess]);
+  }, [activeProject, activeChapter, loadProject, openChapter, handleError, showSuccess]);
 
   const renameChapter = useCallback(async (chapterId, newTitle) => {
     if (!activeProject) return;
@@ -272,6 +350,8 @@ export default function useProjects(isAuthenticated) {
     setLoading(true);
     setError(null);
     try {
+      // Renaming changes the version, so save pending edits first
+      await flushChapterContent();
       await chaptersAPI.update(activeProject.id, chapterId, { title: newTitle });
       await loadProject(activeProject);
 
@@ -285,7 +365,7 @@ export default function useProjects(isAuthenticated) {
     } finally {
       setLoading(false);
     }
-  }, [activeProject, loadProject, handleError, showSuccess]);
+  }, [activeProject, loadProject, flushChapterContent, handleError, showSuccess]);
 
   const clearError = useCallback(() => {
     setError(null);
@@ -309,6 +389,7 @@ export default function useProjects(isAuthenticated) {
     createChapter,
     selectChapter,
     updateChapterContent,
+    flushChapterContent,
     deleteChapter,
     renameChapter,
 
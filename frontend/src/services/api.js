@@ -41,6 +41,14 @@ function isRetryableError(error) {
   return status >= 500 || status === 429;
 }
 
+/**
+ * Delay requested by the server's Retry-After header (seconds), in ms
+ */
+function getRetryAfterDelay(error) {
+  const retryAfter = Number(error.response?.headers?.['retry-after']);
+  return Number.isFinite(retryAfter) && retryAfter >= 0 ? retryAfter * 1000 : null;
+}
+
 /**
  * Sleep for specified milliseconds
  */
@@ -75,11 +83,17 @@ api.interceptors.response.use(
     }
 
     // Check if we should retry
+    // Don't hold the request open when the server asks for a long wait
+    const retryAfter = getRetryAfterDelay(error);
+    if (retryAfter !== null && retryAfter > MAX_RETRY_DELAY) {
+      return Promise.reject(error);
+    }
+
     if (config && isRetryableError(error) && config.retryCount < MAX_RETRIES) {
       config.retryCount += 1;
 
-      // Calculate delay with exponential backoff
-      const delay = getRetryDelay(config.retryCount - 1);
+      // Use the server's Retry-After, else exponential backoff
+      const delay = retryAfter ?? getRetryDelay(config.retryCount - 1);
 
       // Log retry attempt
       console.log(
@@ -108,8 +122,21 @@ export const authAPI = {
 
 // Projects
 export const projectsAPI = {
-  list: () => api.get('/projects'),
+  // params: { limit, cursor, fields }; returns { items, next_cursor, limit }
+  list: (params = {}) => api.get('/projects', { params }),
+  // Follows next_cursor until every page is loaded; resolves to the items
+  listAll: async (params = {}) => {
+    const items = [];
+    let cursor = null;
+    do {
+      const response = await api.get('/projects', { params: { ...params, cursor } });
+      items.push(...response.data.items);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return items;
+  },
   get: (id) => api.get(`/projects/${id}`),
+  outline: (id) => api.get(`/projects/${id}/outline`),
   create: (data) => api.post('/projects', data),
   update: (id, data) => api.put(`/projects/${id}`, data),
   delete: (id) => api.delete(`/projects/${id}`),
@@ -117,10 +144,73 @@ export const projectsAPI = {
 
 // Chapters
 export const chaptersAPI = {
+  list: (projectId, params = {}) => api.get(`/projects/${projectId}/chapters`, { params }),
   create: (projectId, data) => api.post(`/projects/${projectId}/chapters`, data),
   get: (projectId, chapterId) => api.get(`/projects/${projectId}/chapters/${chapterId}`),
   update: (projectId, chapterId, data) => api.put(`/projects/${projectId}/chapters/${chapterId}`, data),
+  patch: (projectId, chapterId, baseVersion, ops) => api.patch(`/projects/${projectId}/chapters/${chapterId}`, {
+    base_version: baseVersion,
+    ops,
+  }),
   delete: (projectId, chapterId) => api.delete(`/projects/${projectId}/chapters/${chapterId}`),
+  // mutations: [{ id, order?, title?, delete?, version? }], applied in one transaction
+  batch: (projectId, mutations) => api.post(`/projects/${projectId}/chapters/batch`, { mutations }),
+};
+
+// Chapter revisions
+export const revisionsAPI = {
+  list: (projectId, chapterId, params = {}) =>
+    api.get(`/projects/${projectId}/chapters/${chapterId}/revisions`, { params }),
+  get: (projectId, chapterId, revision) =>
+    api.get(`/projects/${projectId}/chapters/${chapterId}/revisions/${revision}`),
+  diff: (projectId, chapterId, revision, against) =>
+    api.get(`/projects/${projectId}/chapters/${chapterId}/revisions/${revision}/diff`, {
+      params: against ? { against } : {},
+    }),
+};
+
+// Manuscript export (format: markdown, docx or epub)
+export const exportAPI = {
+  download: (projectId, format = 'markdown') =>
+    api.get(`/projects/${projectId}/export`, { params: { format }, responseType: 'blob' }),
+  createJob: (projectId, format = 'markdown') =>
+    api.post(`/projects/${projectId}/export/jobs`, null, { params: { format } }),
+};
+
+// Manuscript import (.txt, .md or .docx), split into chapters at headings
+export const importAPI = {
+  upload: (projectId, file) => {
+    const form = new FormData();
+    form.append('file', file);
+    return api.post(`/projects/${projectId}/import`, form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
+  createJob: (projectId, file) => {
+    const form = new FormData();
+    form.append('file', file);
+    return api.post(`/projects/${projectId}/import/jobs`, form, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+  },
+};
+
+// Background jobs
+export const jobsAPI = {
+  get: (jobId) => api.get(`/jobs/${jobId}`),
+  download: (jobId) => api.get(`/jobs/${jobId}/download`, { responseType: 'blob' }),
+};
+
+// Search
+export const searchAPI = {
+  search: (query, options = {}) => api.get('/search', {
+    params: {
+      q: query,
+      project_id: options.projectId,
+      limit: options.limit || 20,
+      offset: options.offset || 0,
+    },
+  }).then(res => res.data),
 };
 
 // AI
@@ -134,6 +224,19 @@ export const aiAPI = {
     brief_idea: options.briefIdea || '',
     model: options.model || 'openai/gpt-oss-120b',
   }),
+  // Continue a saved chapter; the server reads the context before the cursor
+  continueChapter: (projectId, chapterId, options = {}) => api.post('/ai/continue', {
+    project_id: projectId,
+    chapter_id: chapterId,
+    cursor_offset: options.cursorOffset,
+    context_lines: options.contextLines || 20,
+    max_tokens: options.maxTokens || 10000,
+    temperature: options.temperature || 0.7,
+    writing_style: options.writingStyle || 'puitis',
+    paragraph_count: options.paragraphCount || 1,
+    brief_idea: options.briefIdea || '',
+    model: options.model || 'openai/gpt-oss-120b',
+  }),
   improve: (text, instruction, options = {}) => api.post('/ai/improve', {
     text,
     instruction: instruction || 'Tolong poles teks berikut agar lebih hidup, jelas, dan memiliki gaya bahasa yang menarik serta alami untuk dibaca, tanpa mengubah inti cerita atau suasana emosinya.',
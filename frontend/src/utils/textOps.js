@@ -0,0 +1,92 @@
+/**
+ * Text edit operations for incremental chapter saves.
+ *
+ * Builds the retain/insert/delete operations accepted by
+ * PATCH /projects/{id}/chapters/{id}. The server counts offsets in
+ * Unicode code points, while JavaScript strings index UTF-16 code units,
+ * so lengths are converted before they are sent. Cursor positions sent
+ * with AI requests are measured the same way.
+ */
+
+function isHighSurrogate(code) {
+  return code >= 0xd800 && code <= 0xdbff;
+}
+
+function isLowSurrogate(code) {
+  return code >= 0xdc00 && code <= 0xdfff;
+}
+
+/**
+ * Count code points in a string without allocating an array
+ */
+function codePointLength(text) {
+  let length = text.length;
+  for (let i = 0; i < text.length; i++) {
+    if (isLowSurrogate(text.charCodeAt(i))) {
+      length -= 1;
+    }
+  }
+  return length;
+}
+
+/**
+ * Build the operations that turn `previous` into `next`.
+ *
+ * Uses the common prefix and suffix, so an autosave carries only the
+ * changed span between them.
+ */
+export function buildTextOps(previous, next) {
+  const maxPrefix = Math.min(previous.length, next.length);
+  let prefix = 0;
+  while (prefix < maxPrefix && previous.charCodeAt(prefix) === next.charCodeAt(prefix)) {
+    prefix += 1;
+  }
+  // Don't split a surrogate pair
+  if (prefix > 0 && isHighSurrogate(previous.charCodeAt(prefix - 1))) {
+    prefix -= 1;
+  }
+
+  const maxSuffix = Math.min(previous.length, next.length) - prefix;
+  let suffix = 0;
+  while (
+    suffix < maxSuffix &&
+    previous.charCodeAt(previous.length - 1 - suffix) === next.charCodeAt(next.length - 1 - suffix)
+  ) {
+    suffix += 1;
+  }
+  if (suffix > 0 && isLowSurrogate(previous.charCodeAt(previous.length - suffix))) {
+    suffix -= 1;
+  }
+
+  const ops = [];
+  const retained = codePointLength(previous.slice(0, prefix));
+  const deleted = codePointLength(previous.slice(prefix, previous.length - suffix));
+  const inserted = next.slice(prefix, next.length - suffix);
+
+  if (retained > 0) ops.push({ retain: retained });
+  if (deleted > 0) ops.push({ delete: deleted });
+  if (inserted.length > 0) ops.push({ insert: inserted });
+  return ops;
+}
+
+/**
+ * Cursor position in the chapter's plain text, as the server extracts it.
+ *
+ * The server keeps one line per block, trims each line and drops blank
+ * ones, and counts code points; the editor's own text is measured the
+ * same way up to the start of the selection.
+ */
+export function plainTextCursorOffset(editor) {
+  const { from } = editor.state.selection;
+  const lines = editor.state.doc.textBetween(0, from, '\n', '\n').split('\n');
+  const current = lines.pop().trimStart();
+
+  let offset = 0;
+  for (const line of lines) {
+    const trimmed = line.trim();
+    if (trimmed) {
+      offset += codePointLength(trimmed) + 1;
+    }
+  }
+  return offset + codePointLength(current);
+}